@@ -0,0 +1,606 @@
+"""Benchmark curves computed directly from the optimization histories.
+
+The functions compute the data behind estimagic's profile_plot, deviation_plot and
+convergence_plot with NumPy, without building a Plotly figure. They follow the
+conventions of estimagic.benchmarking.process_benchmark_results, i.e. the criterion
+values are normalized by the distance between the start and the solution value, and
+the histories are cut off at the first evaluation that fulfills the stopping criterion.
+
+Each curve function returns a dictionary that maps the names of the algorithms to
+dictionaries with keys "x" and "y", which can be passed to plot_benchmark.
+
+"""
+from statistics import NormalDist
+
+import numpy as np
+from tranquilo_dev.benchmarks.replications import get_replication
+
+
+RUNTIME_MEASURES = ("n_evaluations", "n_batches", "walltime")
+
+# Number of points of the time grid of the deviation curves with runtime measure
+# "walltime". The integer runtime measures use one grid point per runtime.
+N_WALLTIME_GRID_POINTS = 250
+
+
+def get_profile_curves(
+    problems,
+    results,
+    *,
+    runtime_measure="n_evaluations",
+    normalize_runtime=False,
+    stopping_criterion="y",
+    x_precision=1e-4,
+    y_precision=1e-4,
+):
+    """Compute the performance or data profiles of the algorithms.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        results (dict): Benchmark results. Keys are tuples of the form (problem,
+            algorithm).
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+        normalize_runtime (bool): If True, the runtime of each algorithm is divided by
+            the runtime of the fastest algorithm on the same problem.
+        stopping_criterion (str): "x_and_y", "x_or_y", "x" or "y".
+        x_precision (float): Precision for the normalized parameter distance.
+        y_precision (float): Precision for the normalized criterion value.
+
+    Returns:
+        dict: Keys are the algorithms, values are dictionaries with keys "x" (the
+            runtime budget) and "y" (the share of solved problems).
+
+    """
+    _check_runtime_measure(runtime_measure, allowed=RUNTIME_MEASURES)
+    processed = process_benchmark_results(
+        problems,
+        results,
+        stopping_criterion=stopping_criterion,
+        x_precision=x_precision,
+        y_precision=y_precision,
+    )
+    return get_profile_curves_from_histories(
+        processed, runtime_measure=runtime_measure, normalize_runtime=normalize_runtime
+    )
+
+
+def get_deviation_curves(
+    problems,
+    results,
+    *,
+    runtime_measure="n_evaluations",
+    distance_measure="criterion",
+    monotone=True,
+):
+    """Compute the average normalized distance to the optimum of the algorithms.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        results (dict): Benchmark results. Keys are tuples of the form (problem,
+            algorithm).
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime". The
+            walltime is measured in seconds since the start of each optimization.
+        distance_measure (str): "criterion" or "parameter_distance".
+        monotone (bool): If True, the best distance found so far is used.
+
+    Returns:
+        dict: Keys are the algorithms, values are dictionaries with keys "x" (the
+            runtime budget) and "y" (the average distance over the problems).
+
+    """
+    _check_runtime_measure(runtime_measure, allowed=RUNTIME_MEASURES)
+    processed = process_benchmark_results(
+        problems,
+        results,
+        stopping_criterion="y",
+        x_precision=1e-6,
+        y_precision=1e-6,
+        parameter_distance=distance_measure == "parameter_distance",
+    )
+    return get_deviation_curves_from_histories(
+        processed,
+        runtime_measure=runtime_measure,
+        distance_measure=distance_measure,
+        monotone=monotone,
+    )
+
+
+def get_convergence_curves(
+    problems,
+    results,
+    *,
+    problem=None,
+    distance_measure="criterion",
+    monotone=True,
+    normalize_distance=True,
+    runtime_measure="n_evaluations",
+    stopping_criterion="y",
+    x_precision=1e-4,
+    y_precision=1e-4,
+):
+    """Compute the convergence of the algorithms on a single problem.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        results (dict): Benchmark results. Keys are tuples of the form (problem,
+            algorithm).
+        problem (str): Name of the problem. If None, the last problem of the results
+            is used.
+        distance_measure (str): "criterion" or "parameter_distance".
+        monotone (bool): If True, the best distance found so far is used.
+        normalize_distance (bool): If True, the distance is divided by the distance
+            between the start values and the solution.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+        stopping_criterion (str): "x_and_y", "x_or_y", "x" or "y".
+        x_precision (float): Precision for the normalized parameter distance.
+        y_precision (float): Precision for the normalized criterion value.
+
+    Returns:
+        dict: Keys are the algorithms, values are dictionaries with keys "x" (the
+            runtime) and "y" (the distance to the optimum).
+
+    """
+    _check_runtime_measure(runtime_measure, allowed=RUNTIME_MEASURES)
+    if problem is None:
+        problem = list(results)[-1][0]
+
+    processed = process_benchmark_results(
+        problems,
+        {key: results[key] for key in results if key[0] == problem},
+        stopping_criterion=stopping_criterion,
+        x_precision=x_precision,
+        y_precision=y_precision,
+        parameter_distance=distance_measure == "parameter_distance",
+    )
+    return get_convergence_curves_from_histories(
+        processed,
+        distance_measure=distance_measure,
+        monotone=monotone,
+        normalize_distance=normalize_distance,
+        runtime_measure=runtime_measure,
+    )
+
+
+def get_profile_curves_from_histories(
+    processed, runtime_measure="n_evaluations", normalize_runtime=False
+):
+    """Compute the profiles from processed histories.
+
+    Args:
+        processed (dict): Processed histories as returned by process_benchmark_results.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+        normalize_runtime (bool): See get_profile_curves.
+
+    Returns:
+        dict: See get_profile_curves.
+
+    """
+    problem_names, algorithms = _get_names(processed)
+    algorithms = sorted(algorithms)
+
+    # Problems an algorithm did not solve, or did not run on, need an infinite runtime
+    solution_times = np.full((len(problem_names), len(algorithms)), np.inf)
+    is_converged = np.zeros_like(solution_times, dtype=bool)
+    for (problem, algo), (history, converged) in processed.items():
+        i, j = problem_names.index(problem), algorithms.index(algo)
+        solution_times[i, j] = history[runtime_measure].max()
+        is_converged[i, j] = converged
+    solution_times[~is_converged] = np.inf
+
+    if normalize_runtime:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            solution_times = solution_times / solution_times.min(axis=1, keepdims=True)
+        solution_times[~is_converged] = np.inf
+
+    is_float = normalize_runtime or runtime_measure == "walltime"
+    alphas = _get_alpha_grid(
+        solution_times, is_float=is_float or not is_converged.all()
+    )
+
+    # The share of problems with a solution time of at most alpha is the position of
+    # alpha in the sorted solution times. NaNs are sorted to the end and never count.
+    sorted_times = np.sort(solution_times, axis=0)
+    n_problems = len(problem_names)
+    return {
+        algo: {
+            "x": alphas,
+            "y": np.searchsorted(sorted_times[:, j], alphas, side="right") / n_problems,
+        }
+        for j, algo in enumerate(algorithms)
+    }
+
+
+def get_deviation_curves_from_histories(
+    processed,
+    runtime_measure="n_evaluations",
+    distance_measure="criterion",
+    monotone=True,
+):
+    """Compute the deviation curves from processed histories.
+
+    Args:
+        processed (dict): Processed histories as returned by process_benchmark_results
+            with a y_precision of 1e-6.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+        distance_measure (str): "criterion" or "parameter_distance".
+        monotone (bool): If True, the best distance found so far is used.
+
+    Returns:
+        dict: See get_deviation_curves.
+
+    """
+    _check_runtime_measure(runtime_measure, allowed=RUNTIME_MEASURES)
+    outcome = _get_outcome_name(distance_measure, monotone, normalize_distance=True)
+    problem_names, algorithms = _get_names(processed)
+
+    runtimes = [history[runtime_measure] for history, _ in processed.values()]
+    start = min(runtime.min() for runtime in runtimes)
+    if runtime_measure == "walltime":
+        stop = max(runtime.max() for runtime in runtimes)
+        grid = np.linspace(start, stop, N_WALLTIME_GRID_POINTS)
+    else:
+        stop = max(runtime.max() for runtime in runtimes) + 1
+        grid = np.arange(start, stop)
+
+    # Best value per runtime of each (problem, algorithm) pair on a common grid. An
+    # evaluation at a walltime between two grid points counts at the next grid point.
+    values = np.full((len(problem_names), len(algorithms), len(grid)), np.nan)
+    for (problem, algo), (history, _) in processed.items():
+        i, j = problem_names.index(problem), algorithms.index(algo)
+        if runtime_measure == "walltime":
+            positions = np.searchsorted(grid, history[runtime_measure], side="left")
+        else:
+            positions = history[runtime_measure] - start
+        np.fmin.at(values[i, j], positions, history[outcome])
+
+    # Runtimes without evaluations take the value of the previous runtime. For the
+    # integer runtime measures, this is a forward fill of the stacked values as in
+    # estimagic, which carries the last value of a pair forward to the end of the grid.
+    # The walltimes of the pairs start at different grid points, hence each pair is
+    # filled separately, and the grid points before its first evaluation take the value
+    # of the first evaluation.
+    if runtime_measure == "walltime":
+        values = _fill_along_last_axis(values)
+    else:
+        values = _forward_fill(values.ravel()).reshape(values.shape)
+    average = _nanmean(values, axis=0)
+
+    return {
+        algo: {"x": grid, "y": average[algorithms.index(algo)]}
+        for algo in sorted(algorithms)
+    }
+
+
+def get_convergence_curves_from_histories(
+    processed,
+    problem=None,
+    distance_measure="criterion",
+    monotone=True,
+    normalize_distance=True,
+    runtime_measure="n_evaluations",
+):
+    """Compute the convergence curves of a single problem from processed histories.
+
+    Args:
+        processed (dict): Processed histories as returned by process_benchmark_results.
+        problem (str): Name of the problem. If None, the last problem is used.
+        distance_measure (str): "criterion" or "parameter_distance".
+        monotone (bool): If True, the best distance found so far is used.
+        normalize_distance (bool): See get_convergence_curves.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+
+    Returns:
+        dict: See get_convergence_curves.
+
+    """
+    if problem is None:
+        problem = list(processed)[-1][0]
+    processed = {key: value for key, value in processed.items() if key[0] == problem}
+
+    outcome = _get_outcome_name(distance_measure, monotone, normalize_distance)
+
+    curves = {}
+    for (_, algo), (history, _) in processed.items():
+        x, y = history[runtime_measure], history[outcome]
+        if runtime_measure == "n_batches":
+            x, positions = np.unique(x, return_inverse=True)
+            y = _group_min(y, positions, n_groups=len(x))
+        curves[algo] = {"x": x, "y": y}
+
+    if runtime_measure == "n_batches":
+        curves = {algo: curves[algo] for algo in sorted(curves)}
+    return curves
+
+
+def get_curves_with_confidence_bands(
+    curve_func, processed, confidence_level=0.95, **curve_kwargs
+):
+    """Compute curves over all replications with confidence bands across replications.
+
+    The curves are computed on the problems of all replications, which is the average
+    of the curves of the single replications for profiles and deviation curves. The
+    confidence bands are based on the standard error of the curves of the single
+    replications, which are evaluated on the grid of the pooled curves.
+
+    Args:
+        curve_func (callable): get_profile_curves_from_histories or
+            get_deviation_curves_from_histories.
+        processed (dict): Processed histories as returned by process_benchmark_results.
+        confidence_level (float): Confidence level of the bands.
+        **curve_kwargs: Keyword arguments for curve_func.
+
+    Returns:
+        dict: Keys are the algorithms, values are dictionaries with keys "x", "y",
+            and, if there is more than one replication, "lower" and "upper".
+
+    """
+    curves = curve_func(processed, **curve_kwargs)
+
+    replications = {}
+    for (problem, algo), value in processed.items():
+        replication = get_replication(problem)
+        replications.setdefault(replication, {})[(problem, algo)] = value
+    if len(replications) < 2:
+        return curves
+
+    # A profile is zero to the left of its first runtime budget, while the deviation
+    # curves of all replications start at the same runtime.
+    left = 0.0 if curve_func is get_profile_curves_from_histories else None
+    per_replication = [
+        curve_func(group, **curve_kwargs) for group in replications.values()
+    ]
+    z = NormalDist().inv_cdf((1 + confidence_level) / 2)
+
+    out = {}
+    for algo, line in curves.items():
+        values = np.array(
+            [
+                _evaluate_step_function(rep[algo]["x"], rep[algo]["y"], line["x"], left)
+                for rep in per_replication
+                if algo in rep
+            ]
+        )
+        half_width = z * np.std(values, axis=0, ddof=1) / np.sqrt(len(values))
+        out[algo] = {
+            **line,
+            "lower": line["y"] - half_width,
+            "upper": line["y"] + half_width,
+        }
+    return out
+
+
+def process_benchmark_results(
+    problems,
+    results,
+    stopping_criterion="y",
+    x_precision=1e-4,
+    y_precision=1e-4,
+    parameter_distance=False,
+):
+    """Compute the normalized histories of all benchmark results.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        results (dict): Benchmark results. Keys are tuples of the form (problem,
+            algorithm).
+        stopping_criterion (str): "x_and_y", "x_or_y", "x", "y" or None. If None, the
+            histories are not cut off.
+        x_precision (float): Precision for the normalized parameter distance.
+        y_precision (float): Precision for the normalized criterion value.
+        parameter_distance (bool): Whether to compute the distances to the optimal
+            parameters. They are always computed if the stopping criterion needs them.
+
+    Returns:
+        dict: Keys are tuples of the form (problem, algorithm), values are tuples of
+            the form (history, is_converged). The history is a dictionary of arrays,
+            cut off at the first evaluation that fulfills the stopping criterion.
+
+    """
+    parameter_distance = parameter_distance or "x" in (stopping_criterion or "")
+    return {
+        (problem, algo): process_one_result(
+            problem=problems[problem],
+            result=result,
+            stopping_criterion=stopping_criterion,
+            x_precision=x_precision,
+            y_precision=y_precision,
+            parameter_distance=parameter_distance,
+        )
+        for (problem, algo), result in results.items()
+    }
+
+
+def process_one_result(
+    problem,
+    result,
+    stopping_criterion="y",
+    x_precision=1e-4,
+    y_precision=1e-4,
+    parameter_distance=False,
+):
+    """Compute the normalized history of a single benchmark result.
+
+    Args:
+        problem (dict): The benchmark problem.
+        result (dict): The benchmark result of one algorithm on the problem.
+        stopping_criterion (str): "x_and_y", "x_or_y", "x", "y" or None.
+        x_precision (float): Precision for the normalized parameter distance.
+        y_precision (float): Precision for the normalized criterion value.
+        parameter_distance (bool): Whether to compute the distances to the optimal
+            parameters.
+
+    Returns:
+        tuple: The history, i.e. a dictionary of arrays, and a bool that is True if the
+            stopping criterion was fulfilled.
+
+    """
+    solution_value = problem["solution"]["value"]
+    start_value = problem["start_criterion"]
+
+    criterion = np.asarray(result["criterion_history"], dtype=np.float64)
+    monotone_criterion = np.minimum.accumulate(criterion)
+    scale = start_value - solution_value
+
+    history = {
+        "n_evaluations": np.arange(len(criterion)),
+        "n_batches": np.asarray(result["batches_history"]),
+        "walltime": np.asarray(result["time_history"]),
+        "criterion": criterion,
+        "criterion_normalized": (criterion - solution_value) / scale,
+        "monotone_criterion": monotone_criterion,
+        "monotone_criterion_normalized": (monotone_criterion - solution_value) / scale,
+    }
+    if parameter_distance:
+        history.update(_get_parameter_distances(problem, result["params_history"]))
+
+    if stopping_criterion is None:
+        return history, False
+
+    is_converged_y, y_idx = _check_convergence(
+        history["criterion_normalized"], y_precision
+    )
+    if "x" in stopping_criterion:
+        is_converged_x, x_idx = _check_convergence(
+            history["parameter_distance_normalized"], x_precision
+        )
+    else:
+        is_converged_x, x_idx = False, None
+
+    is_converged, solution_idx = {
+        "x": (is_converged_x, x_idx),
+        "y": (is_converged_y, y_idx),
+        "x_and_y": (is_converged_x and is_converged_y, _max_or_none(x_idx, y_idx)),
+        "x_or_y": (is_converged_x or is_converged_y, _min_or_none(x_idx, y_idx)),
+    }[stopping_criterion]
+
+    if is_converged:
+        history = {key: value[: solution_idx + 1] for key, value in history.items()}
+
+    return history, is_converged
+
+
+def _get_parameter_distances(problem, params_history):
+    params_history = np.asarray(params_history, dtype=np.float64)
+    solution = problem["solution"].get("params")
+    start = problem["inputs"]["params"]
+
+    if solution is None or not np.isfinite(solution).all():
+        nans = np.full(len(params_history), np.nan)
+        distance = monotone_distance = nans
+        normalized = monotone_normalized = nans
+    else:
+        needed_step = np.linalg.norm(solution - start)
+        distance = np.linalg.norm(params_history - solution, axis=1)
+        monotone_distance = np.minimum.accumulate(distance)
+        normalized = distance / needed_step
+        monotone_normalized = monotone_distance / needed_step
+
+    return {
+        "parameter_distance": distance,
+        "monotone_parameter_distance": monotone_distance,
+        "parameter_distance_normalized": normalized,
+        "monotone_parameter_distance_normalized": monotone_normalized,
+    }
+
+
+def _check_convergence(values, threshold):
+    is_below = values <= threshold
+    if is_below.any():
+        return True, int(np.argmax(is_below))
+    return False, None
+
+
+def _max_or_none(x, y):
+    return None if x is None or y is None else max(x, y)
+
+
+def _min_or_none(x, y):
+    candidates = [idx for idx in (x, y) if idx is not None]
+    return min(candidates) if candidates else None
+
+
+def _get_alpha_grid(solution_times, is_float):
+    """Get the runtime budgets at which the profiles are evaluated.
+
+    The grid contains the points where a profile switches, a point to the right of the
+    last switch and the midpoints between them.
+
+    """
+    switch_points = np.unique(solution_times)
+    if is_float:
+        switch_points = switch_points + 1e-10
+    switch_points = switch_points[np.isfinite(switch_points)]
+    if len(switch_points) == 0:
+        return switch_points
+
+    extended = np.append(switch_points, switch_points[-1] * 1.05)
+    mid_points = (extended[:-1] + extended[1:]) / 2
+    return np.sort(np.append(extended, mid_points))
+
+
+def _evaluate_step_function(x_data, y_data, x, left=None):
+    """Evaluate a right-continuous step function at x.
+
+    Args:
+        x_data (np.ndarray): Sorted points at which the function switches.
+        y_data (np.ndarray): Values of the function from each switch point on.
+        x (np.ndarray): Points at which the function is evaluated.
+        left (float): Value to the left of the first switch point. If None, the first
+            value is used.
+
+    """
+    y_data = np.asarray(y_data, dtype=np.float64)
+    if len(y_data) == 0:
+        return np.full(len(x), np.nan if left is None else left)
+    left = y_data[0] if left is None else left
+    positions = np.searchsorted(x_data, x, side="right") - 1
+    return np.where(positions >= 0, y_data[np.maximum(positions, 0)], left)
+
+
+def _get_names(processed):
+    """Get the problems and algorithms in the order of their first appearance."""
+    problem_names = list(dict.fromkeys(problem for problem, _ in processed))
+    algorithms = list(dict.fromkeys(algo for _, algo in processed))
+    return problem_names, algorithms
+
+
+def _get_outcome_name(distance_measure, monotone, normalize_distance):
+    prefix = "monotone_" if monotone else ""
+    suffix = "_normalized" if normalize_distance else ""
+    return f"{prefix}{distance_measure}{suffix}"
+
+
+def _check_runtime_measure(runtime_measure, allowed):
+    if runtime_measure not in allowed:
+        raise ValueError(
+            f"runtime_measure must be one of {allowed}. You specified "
+            f"{runtime_measure}."
+        )
+
+
+def _forward_fill(values):
+    is_valid = ~np.isnan(values)
+    positions = np.where(is_valid, np.arange(len(values)), 0)
+    return values[np.maximum.accumulate(positions)]
+
+
+def _fill_along_last_axis(values):
+    """Forward fill along the last axis and fill leading NaNs with the first value."""
+    is_valid = ~np.isnan(values)
+    positions = np.where(is_valid, np.arange(values.shape[-1]), 0)
+    positions = np.maximum.accumulate(positions, axis=-1)
+    first = np.argmax(is_valid, axis=-1)[..., np.newaxis]
+    positions = np.where(np.logical_or.accumulate(is_valid, axis=-1), positions, first)
+    return np.take_along_axis(values, positions, axis=-1)
+
+
+def _nanmean(values, axis):
+    is_valid = ~np.isnan(values)
+    with np.errstate(invalid="ignore"):
+        return np.where(is_valid, values, 0).sum(axis=axis) / is_valid.sum(axis=axis)
+
+
+def _group_min(values, positions, n_groups):
+    out = np.full(n_groups, np.nan)
+    np.fmin.at(out, positions, values)
+    return out
@@ -1,9 +1,31 @@
-from collections import ChainMap
+import hashlib
+import json
+import os
+import pickle
+from functools import partial
+from pathlib import Path
 from typing import NamedTuple
 
 import estimagic as em
 import numpy as np
+import pandas as pd
+from estimagic import batch_evaluators
 from pybaum import tree_update
+from tranquilo_dev.benchmarks.expensive_criterion import add_criterion_cost
+from tranquilo_dev.benchmarks.noise import add_common_random_noise
+from tranquilo_dev.benchmarks.replications import REPLICATION_SEPARATOR
+
+# Increase this number whenever the sampling of new start vectors changes, such that
+# outdated entries in the problem cache are not used anymore.
+CACHE_VERSION = 4
+
+# Errors that signal that the criterion is not well-defined at a candidate. Other errors
+# are bugs and are raised.
+NUMERICAL_ERRORS = (
+    ArithmeticError,
+    ValueError,
+    np.linalg.LinAlgError,
+)
 
 
 class SampleOptions(NamedTuple):
@@ -18,6 +40,11 @@ def get_extended_benchmark_problems(
     n_additional_draws=0,
     sample_options=None,
     seed=None,
+    cache_dir=None,
+    n_cores=1,
+    criterion_cost=None,
+    common_random_numbers=False,
+    n_replications=1,
 ):
     """Get extended benchmark problems.
 
@@ -30,7 +57,25 @@ def get_extended_benchmark_problems(
             behavior is governed by the argument 'sample_kwargs'.
         sample_options (dict): Dictionary containing arguments that govern the sampling
             behavior. See class `SampleOptions`.
-        seed (int): Seed that is passed to the numpy random number generator.
+        seed (int): Seed from which an independent random number stream is derived
+            for each problem. The new start vectors of a problem therefore only depend
+            on the seed and the name of the problem.
+        cache_dir (str or pathlib.Path): Directory in which the newly drawn start
+            vectors are cached. The cache entries are keyed by a hash of all arguments
+            and the estimagic version, such that a warm cache skips the sampling and
+            all criterion evaluations that go along with it. If None, no cache is used.
+        n_cores (int): Number of processes over which the sampling of new start
+            vectors is distributed. The result does not depend on the number of cores.
+        criterion_cost (dict): Synthetic cost of each criterion evaluation, see
+            CriterionCost in expensive_criterion.py. The new start vectors are sampled
+            with the original criterion. If None, the criterion is not modified.
+        common_random_numbers (bool): If True, the additive noise that is specified in
+            benchmark_kwargs is drawn from common random numbers, see noise.py, instead
+            of estimagic's random number generator. The new start vectors are sampled
+            with the noise-free criterion.
+        n_replications (int): Number of replications of noisy problems. Each further
+            replication r adds a copy of each problem with independent noise, whose
+            name has the suffix "__rep_{r}". Ignored for noise-free problems.
 
     Returns:
         dict: Dictionary of benchmark problems.
@@ -38,120 +83,334 @@ def get_extended_benchmark_problems(
     """
     # Process kwargs that are passed to em.get_benchmark_problems and get base problems
     benchmark_kwargs = {} if benchmark_kwargs is None else benchmark_kwargs
+    if common_random_numbers:
+        benchmark_kwargs, noise_options = _split_noise_options(benchmark_kwargs)
+    else:
+        noise_options = None
     problems = em.get_benchmark_problems(**benchmark_kwargs)
 
     # Process kwargs that are used to for the random sampling
     if isinstance(sample_options, dict):
-        sample_options = SampleOptions()._replace(**sample_options)
+        sample_options = SampleOptions(**sample_options)._asdict()
     else:
         sample_options = SampleOptions()._asdict()
 
-    # Sample new problems
-    if n_additional_draws > 0:
-        new_problems = _sample_new_problems(
+    if n_additional_draws == 0:
+        return _finalize_problems(
+            problems,
+            benchmark_kwargs=benchmark_kwargs,
+            noise_options=noise_options,
+            criterion_cost=criterion_cost,
+            n_replications=n_replications,
+        )
+
+    # Sample new start vectors or retrieve them from the cache
+    if cache_dir is None:
+        new_start_vectors = None
+    else:
+        cache_key = _get_cache_key(
+            benchmark_kwargs=benchmark_kwargs,
+            n_additional_draws=n_additional_draws,
+            sample_options=sample_options,
+            seed=seed,
+        )
+        cache_path = Path(cache_dir) / f"{cache_key}.pkl"
+        new_start_vectors = _read_cache(cache_path)
+
+    if new_start_vectors is None:
+        new_start_vectors = _sample_new_start_vectors(
             problems=problems,
             n_draws=n_additional_draws,
             seed=seed,
             sample_kwargs=sample_options,
+            n_cores=n_cores,
         )
+        if cache_dir is not None:
+            _write_cache(cache_path, new_start_vectors)
+
+    new_problems = _get_new_problems(problems, new_start_vectors)
+
+    return _finalize_problems(
+        {**problems, **new_problems},
+        benchmark_kwargs=benchmark_kwargs,
+        noise_options=noise_options,
+        criterion_cost=criterion_cost,
+        n_replications=n_replications,
+    )
+
+
+def get_problems_fingerprint(
+    benchmark_kwargs=None,
+    n_additional_draws=0,
+    sample_options=None,
+    seed=None,
+    criterion_cost=None,
+    common_random_numbers=False,
+    n_replications=1,
+):
+    """Hash all arguments that determine the extended benchmark problems.
+
+    The arguments are those of get_extended_benchmark_problems, except for the ones
+    that do not change the problems, i.e. cache_dir and n_cores. The fingerprint
+    changes whenever the cache key of the start vectors or the noise, the replications
+    or the criterion cost that are added to the problems change.
+
+    Returns:
+        str: The fingerprint of the problems.
+
+    """
+    benchmark_kwargs = {} if benchmark_kwargs is None else benchmark_kwargs
+    if isinstance(sample_options, dict):
+        sample_options = SampleOptions(**sample_options)._asdict()
     else:
-        new_problems = {}
+        sample_options = SampleOptions()._asdict()
 
-    return {**problems, **new_problems}
+    config = {
+        "cache_key": _get_cache_key(
+            benchmark_kwargs=benchmark_kwargs,
+            n_additional_draws=n_additional_draws,
+            sample_options=sample_options,
+            seed=seed,
+        ),
+        "criterion_cost": criterion_cost,
+        "common_random_numbers": common_random_numbers,
+        "n_replications": n_replications,
+    }
+    serialized = json.dumps(config, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:32]
 
 
-def _sample_new_problems(
-    problems: dict,
-    n_draws: int,
-    seed: int,
-    sample_kwargs: dict[str, float],
-) -> dict:
-    rng = np.random.default_rng(seed)
+def _split_noise_options(benchmark_kwargs):
+    """Split the additive noise options from the kwargs of em.get_benchmark_problems.
 
-    list_of_new_problems = []
+    Returns:
+        tuple: The kwargs for noise-free problems and the kwargs for
+            add_common_random_noise, or None if the problems are noise-free.
+
+    """
+    benchmark_kwargs = dict(benchmark_kwargs)
+    if benchmark_kwargs.get("multiplicative_noise", False):
+        raise ValueError(
+            "Common random numbers are only implemented for additive noise."
+        )
+    additive_noise = benchmark_kwargs.pop("additive_noise", False)
+    options = benchmark_kwargs.pop("additive_noise_options", None) or {}
+    seed = benchmark_kwargs.pop("seed", None)
+    if not additive_noise:
+        return benchmark_kwargs, None
+
+    options = {"distribution": "normal", "std": 0.01, "mean": 0, **options}
+    if options["distribution"] != "normal" or options.get("correlation", 0) != 0:
+        raise ValueError(
+            "Common random numbers are only implemented for uncorrelated normal noise."
+        )
+    noise_options = {
+        "std": options["std"],
+        "mean": options["mean"],
+        "seed": 0 if seed is None else seed,
+    }
+    return benchmark_kwargs, noise_options
 
-    for problem_name, problem in problems.items():
 
-        _new_problems = _generate_new_problems(
-            problem_name=problem_name,
-            problem=problem,
-            n_draws=n_draws,
-            sample_kwargs=sample_kwargs,
-            rng=rng,
+def _finalize_problems(
+    problems, benchmark_kwargs, noise_options, criterion_cost, n_replications
+):
+    """Add replications, common random noise and the criterion cost to problems."""
+    if n_replications > 1:
+        problems = _add_replications(
+            problems,
+            benchmark_kwargs=benchmark_kwargs,
+            is_noisy=noise_options is not None,
+            n_replications=n_replications,
         )
+    if noise_options is not None:
+        problems = add_common_random_noise(problems, **noise_options)
+    if criterion_cost is not None:
+        problems = add_criterion_cost(problems, criterion_cost)
+    return problems
 
-        list_of_new_problems.append(_new_problems)
 
-    # Merge list of dictionaries into one dictionary and return
-    return dict(ChainMap(*list_of_new_problems))
+def _add_replications(problems, benchmark_kwargs, is_noisy, n_replications):
+    """Add copies of noisy problems with independent noise.
 
+    With common random numbers, the noise of a copy differs because it depends on the
+    name of the problem. Otherwise, the criterion of each copy is taken from problems
+    that are created with a different seed.
 
-def _generate_new_problems(
-    problem_name: str,
-    problem: dict,
-    n_draws: int,
-    sample_kwargs: dict[str, float],
-    rng: np.random.Generator,
-) -> dict:
-    new_start_vectors = _draw_new_start_vectors(
-        problem_name=problem_name,
-        problem=problem,
-        n_draws=n_draws,
-        rng=rng,
-        **sample_kwargs,
+    """
+    uses_estimagic_noise = benchmark_kwargs.get("additive_noise", False) or (
+        benchmark_kwargs.get("multiplicative_noise", False)
     )
+    if not (is_noisy or uses_estimagic_noise):
+        return problems
+
+    out = dict(problems)
+    for replication in range(1, n_replications):
+        if uses_estimagic_noise:
+            seed = benchmark_kwargs.get("seed") or 0
+            reseeded = em.get_benchmark_problems(
+                **{**benchmark_kwargs, "seed": seed + replication}
+            )
+        for name, problem in problems.items():
+            if uses_estimagic_noise:
+                base_name = name.split("__draw_")[0]
+                criterion = reseeded[base_name]["inputs"]["criterion"]
+                problem = tree_update(problem, {"inputs": {"criterion": criterion}})
+            out[f"{name}{REPLICATION_SEPARATOR}{replication}"] = problem
+    return out
+
+
+def _get_cache_key(benchmark_kwargs, n_additional_draws, sample_options, seed):
+    """Hash all arguments that determine the newly drawn start vectors."""
+    config = {
+        "benchmark_kwargs": benchmark_kwargs,
+        "n_additional_draws": n_additional_draws,
+        "sample_options": sample_options,
+        "seed": seed,
+        "estimagic_version": em.__version__,
+        "cache_version": CACHE_VERSION,
+    }
+    serialized = json.dumps(config, sort_keys=True, default=repr)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:32]
+
+
+def _read_cache(path):
+    """Read a cache entry. Missing, truncated and unreadable entries are misses.
+
+    An entry that was written with another version of numpy, pandas or estimagic can
+    fail to unpickle with a variety of errors. The start vectors are then sampled again
+    and the entry is overwritten.
 
-    new_problems = {}
-    for k, new_start_vector in enumerate(new_start_vectors):
-        new_problem = _get_problem_with_new_start_vector(problem, new_start_vector)
-        new_name = f"{problem_name}__draw_{k}"
-        new_problems[new_name] = new_problem
+    """
+    try:
+        return pd.read_pickle(path)
+    except (
+        FileNotFoundError,
+        EOFError,
+        ImportError,
+        AttributeError,
+        TypeError,
+        ValueError,
+        pickle.UnpicklingError,
+    ):
+        return None
+
+
+def _write_cache(path, new_start_vectors):
+    # Write to a temporary file first and rename it afterwards, such that a concurrent
+    # reader never sees a partially written cache entry.
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+    pd.to_pickle(new_start_vectors, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def _get_new_problems(problems, new_start_vectors):
+    """Create the new problems from the base problems and the new start vectors.
 
+    Args:
+        problems (dict): Dictionary of base benchmark problems.
+        new_start_vectors (dict): Dictionary with the names of the base problems as
+            keys and lists of new start vectors as values.
+
+    Returns:
+        dict: Dictionary of new benchmark problems.
+
+    """
+    new_problems = {}
+    for problem_name, start_vectors in new_start_vectors.items():
+        for k, new_start_vector in enumerate(start_vectors):
+            new_problem = _get_problem_with_new_start_vector(
+                problems[problem_name], new_start_vector
+            )
+            new_problems[f"{problem_name}__draw_{k}"] = new_problem
     return new_problems
 
 
-def _draw_new_start_vectors(
-    problem_name: str,
-    problem: dict,
+def _sample_new_start_vectors(
+    problems: dict,
     n_draws: int,
-    rng: np.random.Generator,
-    minimal_radius: float,
-    percentage_deviation_radius: float,
-) -> list[np.ndarray]:
-    new_start_vectors = []
+    seed: int,
+    sample_kwargs: dict[str, float],
+    n_cores: int,
+) -> dict[str, list[np.ndarray]]:
+    # The problems are distributed over the cores. Only if there are more cores than
+    # problems, the candidates of each problem are evaluated in parallel as well.
+    n_outer_cores = max(1, min(n_cores, len(problems)))
+    arguments = [
+        {
+            "problem_name": problem_name,
+            "problem": problem,
+            "n_draws": n_draws,
+            "rng": _get_problem_rng(seed, problem_name=problem_name),
+            "n_cores": max(1, n_cores // n_outer_cores),
+            **sample_kwargs,
+        }
+        for problem_name, problem in problems.items()
+    ]
+
+    new_start_vectors = batch_evaluators.joblib_batch_evaluator(
+        func=_draw_new_start_vectors,
+        arguments=arguments,
+        n_cores=n_outer_cores,
+        error_handling="raise",
+        unpack_symbol="**",
+    )
 
-    for _ in range(n_draws):
+    return dict(zip(problems, new_start_vectors))
 
-        new_start_vector = _draw_single_new_start_vector(
-            problem_name=problem_name,
-            problem=problem,
-            rng=rng,
-            percentage_deviation_radius=percentage_deviation_radius,
-            minimal_radius=minimal_radius,
-        )
-        new_start_vectors.append(new_start_vector)
 
-    return new_start_vectors
+def _get_problem_rng(seed, problem_name):
+    """Get a random number generator that is independent for each problem.
+
+    The stream is derived from the seed and a stable hash of the problem name, such
+    that it does neither depend on the order of the problems nor on the other problems
+    in the set.
+
+    """
+    # The full digest is used as spawn key, split into 32 bit words, such that distinct
+    # names do not share a stream.
+    name_hash = hashlib.sha256(problem_name.encode()).digest()
+    spawn_key = tuple(
+        int.from_bytes(name_hash[i : i + 4], byteorder="little")
+        for i in range(0, len(name_hash), 4)
+    )
+    seed_sequence = np.random.SeedSequence(entropy=seed, spawn_key=spawn_key)
+    return np.random.default_rng(seed_sequence)
 
 
-def _draw_single_new_start_vector(
+def _draw_new_start_vectors(
     problem_name: str,
     problem: dict,
+    n_draws: int,
     rng: np.random.Generator,
-    percentage_deviation_radius: float,
     minimal_radius: float,
-) -> np.ndarray:
-    """Draw a new start vector for a given problem.
+    percentage_deviation_radius: float,
+    max_radius_reductions: int = 50,
+    n_cores: int = 1,
+) -> list[np.ndarray]:
+    """Draw new start vectors for a given problem.
+
+    The candidates are drawn uniformly from a box around the original start vector.
+    For each radius level, a whole block of candidates is drawn at once; one for each
+    start vector that is still missing. The block is evaluated as a batch. Candidates
+    at which the criterion function is not well-defined are discarded, and the missing
+    start vectors are drawn again from a box with half the radius. The start vectors
+    are the same as if the candidates were drawn and evaluated one by one.
 
     Args:
         problem_name (str): The name of the problem.
         problem (dict): The problem dictionary.
+        n_draws (int): Number of new start vectors.
         rng (np.random.Generator): A random number generator
-        percentage_deviation_radius (float): The percentage deviation from x.
         minimal_radius (float): The minimal radius in each direction.
+        percentage_deviation_radius (float): The percentage deviation from x.
+        max_radius_reductions (int): Maximum number of times the radius is halved.
+        n_cores (int): Number of processes over which the block of candidates is
+            evaluated.
 
     Returns:
-        np.ndarray: The new start vector.
+        list[np.ndarray]: The new start vectors.
 
     """
     x = problem["inputs"]["params"]
@@ -163,27 +422,29 @@ def _draw_single_new_start_vector(
         minimal_radius=minimal_radius,
     )
 
-    success = False
+    new_start_vectors = []
 
-    for _ in range(50):
-        candidate = rng.uniform(low=x - radius, high=x + radius)
+    for _ in range(max_radius_reductions):
+        n_missing = n_draws - len(new_start_vectors)
+        candidates = rng.uniform(
+            low=x - radius, high=x + radius, size=(n_missing, len(x))
+        )
+        is_valid = _is_criterion_finite(
+            criterion, candidates=candidates, n_cores=n_cores
+        )
+        new_start_vectors.extend(candidates[is_valid])
 
-        # Verify that the criterion function is well-defined at the candidate x-value,
-        # and otherwise reduce the radius by half.
-        try:
-            _evaluate_criterion_and_assert_finite(criterion, params=candidate)
-        except Exception:
-            radius /= 2
-        else:
-            success = True
+        if len(new_start_vectors) == n_draws:
             break
 
-    if not success:
+        radius = radius / 2
+
+    else:
         raise RuntimeError(
             f"Could not find a valid new starting vector for {problem_name}."
         )
 
-    return candidate
+    return new_start_vectors
 
 
 def _calculate_radius(
@@ -214,7 +475,33 @@ def _get_problem_with_new_start_vector(
     return tree_update(old_problem, update_dict)
 
 
-def _evaluate_criterion_and_assert_finite(criterion, params):
-    _value = criterion(params)
+def _is_criterion_finite(criterion, candidates, n_cores=1):
+    """Check whether the criterion function is well-defined at each candidate.
+
+    Args:
+        criterion (callable): The criterion function.
+        candidates (np.ndarray): 2d array where each row is a parameter vector.
+        n_cores (int): Number of processes over which the candidates are evaluated.
+
+    Returns:
+        np.ndarray: 1d boolean array that is True for candidates at which the criterion
+            function can be evaluated and returns a finite value.
+
+    """
+    is_finite = batch_evaluators.joblib_batch_evaluator(
+        func=partial(_is_finite_at, criterion),
+        arguments=list(candidates),
+        n_cores=n_cores,
+        error_handling="raise",
+    )
+    return np.array(is_finite, dtype=bool).reshape(len(candidates))
+
+
+def _is_finite_at(criterion, params):
+    try:
+        with np.errstate(all="ignore"):
+            _value = criterion(params)
+    except NUMERICAL_ERRORS:
+        return False
     value = _value["value"] if isinstance(_value, dict) else _value
-    assert np.isfinite(value)
+    return bool(np.all(np.isfinite(value)))
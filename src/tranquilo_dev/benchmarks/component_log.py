@@ -0,0 +1,113 @@
+"""Append-only binary log of the time tranquilo spends in its components.
+
+While profile_tranquilo_components is active, the sampler, the model fitter and the
+subsolver of each tranquilo run are wrapped by TimedComponent, which appends one record
+per call to a log file. A record consists of three float64 values:
+
+- component: the index of the component in COMPONENTS.
+- t_start: time.perf_counter() at the start of the call.
+- t_end: time.perf_counter() at the end of the call.
+
+The timestamps are comparable to those of the history log, see history_log.
+
+"""
+import contextlib
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+COMPONENTS = ["sampling", "model_fit", "subsolver"]
+
+# Names of the components in the internal arguments of tranquilo
+_TRANQUILO_COMPONENTS = {
+    "sample_points": "sampling",
+    "fit_model": "model_fit",
+    "solve_subproblem": "subsolver",
+}
+
+
+class TimedComponent:
+    """Component of tranquilo that appends the time of each call to a log.
+
+    Args:
+        func (callable): The component, e.g. the sampler.
+        component (str): Name of the component. One of COMPONENTS.
+        path (str or pathlib.Path): Path of the log file.
+
+    """
+
+    def __init__(self, func, component, path):
+        self.func = func
+        self.component = component
+        self.path = Path(path)
+        self._file = None
+
+    def __call__(self, *args, **kwargs):
+        t_start = time.perf_counter()
+        out = self.func(*args, **kwargs)
+        t_end = time.perf_counter()
+
+        record = np.array([COMPONENTS.index(self.component), t_start, t_end])
+        if self._file is None:
+            self._file = open(self.path, "ab", buffering=0)  # noqa: SIM115
+        self._file.write(record.astype(np.float64).tobytes())
+        return out
+
+    def __getstate__(self):
+        return {**self.__dict__, "_file": None}
+
+    def __del__(self):
+        if self._file is not None:
+            self._file.close()
+
+
+@contextlib.contextmanager
+def profile_tranquilo_components(path):
+    """Log the time of the components of all tranquilo runs in the context.
+
+    Args:
+        path (str or pathlib.Path): Path of the log file.
+
+    """
+    import tranquilo.tranquilo
+
+    process_arguments = tranquilo.tranquilo.process_arguments
+
+    def _process_arguments(*args, **kwargs):
+        out = process_arguments(*args, **kwargs)
+        for key, component in _TRANQUILO_COMPONENTS.items():
+            out[key] = TimedComponent(out[key], component=component, path=path)
+        return out
+
+    tranquilo.tranquilo.process_arguments = _process_arguments
+    try:
+        yield
+    finally:
+        tranquilo.tranquilo.process_arguments = process_arguments
+
+
+def read_component_log(path):
+    """Read the records of a component log.
+
+    Args:
+        path (str or pathlib.Path): Path of the log file.
+
+    Returns:
+        dict: Keys are the entries of COMPONENTS. Values are dicts with the arrays
+            "t_start" and "t_end" of the calls of the component. None if the log does
+            not exist, e.g. because the optimizer is not tranquilo.
+
+    """
+    if not Path(path).exists():
+        return None
+    records = np.fromfile(path, dtype=np.float64).reshape(-1, 3)
+    out = {}
+    for i, component in enumerate(COMPONENTS):
+        is_component = records[:, 0] == i
+        out[component] = {
+            "t_start": records[is_component, 1],
+            "t_end": records[is_component, 2],
+        }
+    return out
@@ -0,0 +1,89 @@
+"""Benchmark problems with a synthetic cost per criterion evaluation.
+
+The criteria of the benchmark problems take microseconds, such that the wall time of a
+benchmark run mostly measures the overhead of the optimizer. To measure the speedup of
+evaluating batches in parallel, the criterion is wrapped such that each evaluation takes
+at least a fixed number of seconds. The cost is either spent sleeping, which does not
+occupy a core, or spinning, which keeps one core busy like an expensive simulation.
+
+"""
+import time
+from typing import NamedTuple
+
+
+class CriterionCost(NamedTuple):
+    """Synthetic cost of a criterion evaluation.
+
+    Attributes:
+        seconds (float): Minimal duration of an evaluation in seconds.
+        mode (str): "sleep" or "spin".
+
+    """
+
+    seconds: float = 0.01
+    mode: str = "sleep"
+
+
+class ExpensiveCriterion:
+    """Criterion function whose evaluations take at least a fixed time.
+
+    The time of the original criterion counts towards the cost. The wrapper is
+    picklable if the criterion is picklable.
+
+    Args:
+        criterion (callable): The criterion function of the benchmark problem.
+        cost (CriterionCost): The synthetic cost of an evaluation.
+
+    """
+
+    def __init__(self, criterion, cost):
+        if cost.mode not in ("sleep", "spin"):
+            raise ValueError(
+                f"mode must be 'sleep' or 'spin'. You specified {cost.mode}."
+            )
+        self.criterion = criterion
+        self.cost = cost
+
+    def __call__(self, params):
+        deadline = time.perf_counter() + self.cost.seconds
+        out = self.criterion(params)
+        if self.cost.mode == "sleep":
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+        else:
+            while time.perf_counter() < deadline:
+                pass
+        return out
+
+
+def add_criterion_cost(problems, cost):
+    """Add a synthetic cost to the criterion of benchmark problems.
+
+    Only the criterion that is passed to the optimizer is wrapped. The noise-free
+    criterion, which is evaluated when the results of noisy problems are processed,
+    stays cheap.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        cost (CriterionCost or dict): The synthetic cost of an evaluation. A dict is
+            converted to CriterionCost.
+
+    Returns:
+        dict: Dictionary of benchmark problems with expensive criteria.
+
+    """
+    if isinstance(cost, dict):
+        cost = CriterionCost(**cost)
+
+    out = {}
+    for name, problem in problems.items():
+        inputs = problem["inputs"]
+        out[name] = {
+            **problem,
+            "inputs": {
+                **inputs,
+                "criterion": ExpensiveCriterion(inputs["criterion"], cost),
+            },
+        }
+    return out
@@ -0,0 +1,184 @@
+"""Append-only binary log of the criterion evaluations of a benchmark run.
+
+The criterion of a benchmark problem is wrapped by LoggingCriterion, which appends one
+fixed-width record per evaluation to a log file as soon as the evaluation is finished.
+A record consists of n_params + 3 float64 values:
+
+- t_start: time.perf_counter() at the start of the evaluation.
+- t_end: time.perf_counter() at the end of the evaluation.
+- value: the scalar criterion value that the optimizer received.
+- params: the flat parameter vector.
+
+Records are written with a single unbuffered write to a file opened in append mode,
+such that evaluations in several processes, e.g. of a batch, do not interleave.
+
+"""
+import time
+from pathlib import Path
+
+import numpy as np
+
+
+N_META_COLUMNS = 3
+
+
+class LoggingCriterion:
+    """Criterion function that appends each evaluation to a history log.
+
+    The wrapper is picklable if the criterion is picklable. Each process opens the log
+    file on its first evaluation.
+
+    Args:
+        criterion (callable): The criterion function of the benchmark problem.
+        path (str or pathlib.Path): Path of the log file.
+
+    """
+
+    def __init__(self, criterion, path):
+        self.criterion = criterion
+        self.path = Path(path)
+        self._file = None
+
+    def __call__(self, params):
+        t_start = time.perf_counter()
+        out = self.criterion(params)
+        t_end = time.perf_counter()
+
+        record = np.concatenate(
+            [[t_start, t_end, _get_scalar_value(out)], np.ravel(params)]
+        )
+        if self._file is None:
+            self._file = open(self.path, "ab", buffering=0)  # noqa: SIM115
+        self._file.write(record.astype(np.float64).tobytes())
+        return out
+
+    def __getstate__(self):
+        return {"criterion": self.criterion, "path": self.path, "_file": None}
+
+    def __del__(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def read_history_log(path, n_params):
+    """Read the records of a history log.
+
+    Args:
+        path (str or pathlib.Path): Path of the log file.
+        n_params (int): Number of parameters of the problem.
+
+    Returns:
+        dict: Read-only arrays "t_start", "t_end", "value" and "params", which are
+            backed by a memory map of the log. The records are sorted by t_start.
+
+    """
+    width = n_params + N_META_COLUMNS
+    if Path(path).stat().st_size == 0:
+        records = np.empty((0, width))
+    else:
+        records = np.memmap(path, dtype=np.float64, mode="r").reshape(-1, width)
+
+    # Evaluations of a batch in several processes are written in the order in which
+    # they finish.
+    if not np.all(np.diff(records[:, 0]) >= 0):
+        records = records[np.argsort(records[:, 0], kind="stable")]
+
+    return {
+        "t_start": records[:, 0],
+        "t_end": records[:, 1],
+        "value": records[:, 2],
+        "params": records[:, N_META_COLUMNS:],
+    }
+
+
+def _get_scalar_value(out):
+    if isinstance(out, dict):
+        out = out["value"]
+    out = np.asarray(out, dtype=np.float64)
+    return float(out @ out) if out.ndim == 1 else float(out)
+
+
+def assemble_benchmark_result(log, problem, history):
+    """Assemble the result of a benchmark run from its history log.
+
+    The criterion values are processed as in em.run_benchmark, i.e. for noisy problems
+    the noise-free criterion is evaluated at the logged parameters, and the values are
+    clipped at the solution value.
+
+    Args:
+        log (dict): History log as returned by read_history_log.
+        problem (dict): The benchmark problem.
+        history (dict): History of the optimizer with the entries "params" and
+            "batches". The batches are taken from the history, because the log does
+            not know which evaluations form a batch. The params are used to check that
+            the log rows line up with the history.
+
+    Returns:
+        dict: Benchmark result in the format of em.run_benchmark, without the entry
+            "solution".
+
+    """
+    # estimagic evaluates the criterion at the start parameters before the optimizer
+    # runs. These evaluations are logged but are not part of the history.
+    batches_history = np.asarray(history["batches"])
+    n_evals = len(batches_history)
+    n_skipped = len(log["value"]) - n_evals
+    if n_skipped < 0:
+        raise ValueError(
+            f"The history log has {len(log['value'])} records, but the history of the "
+            f"optimizer has {n_evals} entries."
+        )
+
+    t_start = log["t_start"][n_skipped:]
+    params_history = log["params"][n_skipped:]
+    _check_params_line_up(params_history, history["params"], batches_history)
+
+    if problem["noisy"]:
+        criterion_history = np.array(
+            [
+                _get_scalar_value(problem["noise_free_criterion"](params))
+                for params in params_history
+            ]
+        )
+    else:
+        criterion_history = np.array(log["value"][n_skipped:])
+    criterion_history = np.clip(criterion_history, problem["solution"]["value"], np.inf)
+
+    return {
+        "params_history": params_history,
+        "criterion_history": criterion_history,
+        "time_history": t_start - t_start[0] if n_evals else t_start,
+        "batches_history": np.asarray(batches_history),
+    }
+
+
+def _check_params_line_up(log_params, history_params, batches_history):
+    """Check that the log rows are the evaluations in the history of the optimizer.
+
+    Evaluations of a batch in several processes are logged in the order in which they
+    start, which can differ from their order in the history. Hence, the params are
+    compared after sorting the evaluations within each batch.
+
+    """
+    history_params = np.array([np.ravel(params) for params in history_params])
+    history_params = history_params.reshape(len(batches_history), -1)
+    if history_params.shape != log_params.shape:
+        raise ValueError(
+            f"The history log has params of shape {log_params.shape}, but the history "
+            f"of the optimizer has params of shape {history_params.shape}."
+        )
+
+    log_order = _sort_within_batches(log_params, batches_history)
+    history_order = _sort_within_batches(history_params, batches_history)
+    mismatch = np.any(log_params[log_order] != history_params[history_order], axis=1)
+    if mismatch.any():
+        batch = batches_history[history_order][np.argmax(mismatch)]
+        raise ValueError(
+            "The records of the history log do not line up with the history of the "
+            f"optimizer. The params of batch {batch} differ."
+        )
+
+
+def _sort_within_batches(params, batches):
+    # np.lexsort sorts by the last key first
+    return np.lexsort((*params.T[::-1], batches))
@@ -0,0 +1,179 @@
+"""Additive noise with common random numbers across scenarios.
+
+estimagic draws the noise of a noisy benchmark problem from a random number generator
+in the order of the evaluations. Two optimizers that evaluate the same parameters
+therefore see different noise, and many replications are needed before differences
+between them show up.
+
+Here, the noise of an evaluation is a deterministic function of the problem, the seed,
+the parameters and a replicate index. The replicate index counts how often the same
+parameters were evaluated before, such that repeated evaluations of a point, e.g. by
+DFO-LS with noise_n_evals_per_point, see independent noise. All optimizers that
+evaluate the same parameters the same number of times see the same noise.
+
+The noise is computed by hashing the bits of the parameters with the SplitMix64 mixing
+function and transforming the hashes to standard normal draws with the Box-Muller
+transform. All steps are vectorized over batches of parameters.
+
+"""
+import hashlib
+
+import numpy as np
+
+
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+_MIX_1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX_2 = np.uint64(0x94D049BB133111EB)
+
+
+def splitmix64(x):
+    """Apply the SplitMix64 finalizer to an array of unsigned 64 bit integers."""
+    x = np.asarray(x, dtype=np.uint64)
+    with np.errstate(over="ignore"):
+        z = x + GOLDEN_GAMMA
+        z = (z ^ (z >> np.uint64(30))) * _MIX_1
+        z = (z ^ (z >> np.uint64(27))) * _MIX_2
+        return z ^ (z >> np.uint64(31))
+
+
+def get_problem_key(problem_name, seed):
+    """Get a 64 bit key of a problem and a seed."""
+    digest = hashlib.sha256(f"{problem_name}:{seed}".encode()).digest()
+    return np.uint64(int.from_bytes(digest[:8], "little"))
+
+
+def hash_params(params, key):
+    """Hash the bits of a batch of parameter vectors.
+
+    Args:
+        params (np.ndarray): Array of shape (n_evals, n_params).
+        key (np.uint64): Key of the problem, see get_problem_key.
+
+    Returns:
+        np.ndarray: Array of n_evals hashes.
+
+    """
+    # Adding zero maps -0.0 to 0.0, such that both have the same bits
+    params = np.ascontiguousarray(np.atleast_2d(params), dtype=np.float64) + 0.0
+    bits = params.view(np.uint64)
+    hashes = np.full(len(bits), key, dtype=np.uint64)
+    for j in range(bits.shape[1]):
+        hashes = splitmix64(hashes ^ bits[:, j])
+    return hashes
+
+
+def draw_standard_normal(hashes, replicates, size):
+    """Draw standard normal noise from the hashes of evaluations.
+
+    Args:
+        hashes (np.ndarray): Array of n_evals hashes, see hash_params.
+        replicates (np.ndarray): Array of n_evals replicate indices.
+        size (int): Number of draws per evaluation, e.g. the number of residuals.
+
+    Returns:
+        np.ndarray: Array of shape (n_evals, size).
+
+    """
+    seeds = splitmix64(hashes ^ splitmix64(np.asarray(replicates, dtype=np.uint64)))
+    counters = np.arange(2 * size, dtype=np.uint64) * GOLDEN_GAMMA
+    with np.errstate(over="ignore"):
+        bits = splitmix64(seeds[:, None] + counters[None, :])
+    # Uniform draws in the open interval (0, 1) from the upper 53 bits
+    uniform = ((bits >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0**-53
+    u1, u2 = uniform[:, :size], uniform[:, size:]
+    return np.sqrt(-2 * np.log(u1)) * np.cos(2 * np.pi * u2)
+
+
+class CommonRandomNoiseCriterion:
+    """Criterion function with additive noise from common random numbers.
+
+    The output has the same format as the criterion of estimagic's noisy benchmark
+    problems, i.e. least-squares problems return a dictionary with the entries
+    "root_contributions" and "value".
+
+    The replicate indices are counted per process. Batches that are evaluated in
+    several processes can therefore see the same noise if they contain the same
+    parameters more than once.
+
+    Args:
+        criterion (callable): The noise-free criterion of the benchmark problem.
+        key (np.uint64): Key of the problem, see get_problem_key.
+        std (float): Standard deviation of the noise.
+        mean (float): Mean of the noise.
+
+    """
+
+    def __init__(self, criterion, key, std, mean=0.0):
+        self.criterion = criterion
+        self.key = np.uint64(key)
+        self.std = std
+        self.mean = mean
+        self._counts = {}
+
+    def __call__(self, params):
+        return self.evaluate_batch(np.atleast_2d(params))[0]
+
+    def evaluate_batch(self, params):
+        """Evaluate the noisy criterion at a batch of parameter vectors.
+
+        Args:
+            params (np.ndarray): Array of shape (n_evals, n_params).
+
+        Returns:
+            list: The noisy criterion values.
+
+        """
+        params = np.atleast_2d(params)
+        hashes = hash_params(params, key=self.key)
+        replicates = np.array([self._next_replicate(h) for h in hashes.tolist()])
+
+        values = [np.asarray(self.criterion(x), dtype=np.float64) for x in params]
+        size = values[0].size if values else 0
+        noise = self.mean + self.std * draw_standard_normal(hashes, replicates, size)
+
+        out = []
+        for value, eps in zip(values, noise):
+            if value.ndim == 1:
+                noisy = value + eps
+                out.append({"root_contributions": noisy, "value": noisy @ noisy})
+            else:
+                out.append(float(value + eps[0]))
+        return out
+
+    def _next_replicate(self, params_hash):
+        replicate = self._counts.get(params_hash, 0)
+        self._counts[params_hash] = replicate + 1
+        return replicate
+
+    def __getstate__(self):
+        return {**self.__dict__, "_counts": {}}
+
+
+def add_common_random_noise(problems, std, mean=0.0, seed=0):
+    """Replace the criterion of benchmark problems by one with common random noise.
+
+    Args:
+        problems (dict): Dictionary of noise-free benchmark problems.
+        std (float): Standard deviation of the additive noise.
+        mean (float): Mean of the additive noise.
+        seed (int): Seed of the noise. The noise of a problem depends on the seed and
+            the name of the problem.
+
+    Returns:
+        dict: Dictionary of noisy benchmark problems.
+
+    """
+    out = {}
+    for name, problem in problems.items():
+        criterion = CommonRandomNoiseCriterion(
+            problem["noise_free_criterion"],
+            key=get_problem_key(name, seed),
+            std=std,
+            mean=mean,
+        )
+        out[name] = {
+            **problem,
+            "inputs": {**problem["inputs"], "criterion": criterion},
+            "noisy": True,
+        }
+    return out
@@ -0,0 +1,179 @@
+"""Split the wall time of benchmark runs into criterion time and optimizer overhead.
+
+The history logs record time.perf_counter() at the start and end of each criterion
+evaluation, see history_log. On Linux, perf_counter is a system-wide monotonic clock,
+such that the timestamps of evaluations in different worker processes are comparable.
+
+The wall time of a run is the time between the start of the first and the end of the
+last evaluation of the optimizer. Evaluations that estimagic runs before the optimizer
+starts, e.g. at the start parameters, are not part of the run. The criterion time is
+the time in which at least one evaluation was running, i.e. evaluations of a batch that
+run in parallel are counted once. The rest is the overhead of the optimizer.
+
+For tranquilo, the overhead is split further into the time spent in sampling, model
+fitting and the subsolver, see component_log. The remaining overhead, e.g. deciding on
+the acceptance of a candidate, is reported as other overhead.
+
+"""
+import numpy as np
+import pandas as pd
+from tranquilo_dev.benchmarks.component_log import COMPONENTS
+from tranquilo_dev.benchmarks.component_log import read_component_log
+from tranquilo_dev.benchmarks.history_log import read_history_log
+from tranquilo_dev.benchmarks.result_store import read_groups
+from tranquilo_dev.benchmarks.runner import get_component_log_path
+from tranquilo_dev.benchmarks.runner import get_history_log_path
+
+
+COMPONENT_COLUMNS = [f"{component}_time" for component in COMPONENTS]
+
+OVERHEAD_COLUMNS = [
+    "n_evaluations",
+    "wall_time",
+    "criterion_time",
+    "overhead_time",
+    *COMPONENT_COLUMNS,
+    "other_overhead_time",
+    "overhead_share",
+    "overhead_per_evaluation",
+]
+
+
+def compute_overhead(log, components=None):
+    """Compute the wall time, criterion time and overhead of a history log.
+
+    Args:
+        log (dict): History log as returned by read_history_log, restricted to the
+            evaluations of the optimizer.
+        components (dict): Component log as returned by read_component_log. Calls
+            outside of the wall time are not counted. Default None, i.e. the times of
+            the components are unknown.
+
+    Returns:
+        dict: The entries of OVERHEAD_COLUMNS. Times are in seconds.
+
+    """
+    t_start = np.asarray(log["t_start"])
+    t_end = np.asarray(log["t_end"])
+    n_evals = len(t_start)
+
+    if n_evals == 0:
+        wall_time = criterion_time = 0.0
+    else:
+        wall_time = float(t_end.max() - t_start.min())
+        criterion_time = _get_union_length(t_start, t_end)
+    overhead_time = max(0.0, wall_time - criterion_time)
+
+    if components is None:
+        component_times = dict.fromkeys(COMPONENT_COLUMNS, np.nan)
+        other_overhead_time = np.nan
+    else:
+        lower, upper = (t_start.min(), t_end.max()) if n_evals else (0.0, 0.0)
+        component_times = {
+            f"{component}_time": _get_union_length(
+                np.clip(times["t_start"], lower, upper),
+                np.clip(times["t_end"], lower, upper),
+            )
+            for component, times in components.items()
+        }
+        other_overhead_time = max(0.0, overhead_time - sum(component_times.values()))
+
+    return {
+        "n_evaluations": n_evals,
+        "wall_time": wall_time,
+        "criterion_time": criterion_time,
+        "overhead_time": overhead_time,
+        **component_times,
+        "other_overhead_time": other_overhead_time,
+        "overhead_share": overhead_time / wall_time if wall_time > 0 else np.nan,
+        "overhead_per_evaluation": overhead_time / n_evals if n_evals else np.nan,
+    }
+
+
+def get_overhead_table(paths, problems, name):
+    """Get the overhead of each problem of a benchmark case.
+
+    Args:
+        paths (dict): Keys are problem names, values are the paths of the results of
+            the single problems. The history and component logs are stored next to
+            them.
+        problems (dict): Dictionary of benchmark problems.
+        name (str): Name of the optimizer configuration.
+
+    Returns:
+        pandas.DataFrame: The columns OVERHEAD_COLUMNS, indexed by problem.
+
+    """
+    rows = {}
+    for problem, path in paths.items():
+        log = read_history_log(
+            get_history_log_path(path, name),
+            n_params=problems[problem]["inputs"]["params"].size,
+        )
+        # The evaluations before the optimizer starts are logged but are not part of
+        # the history of the result, see assemble_benchmark_result.
+        _, n_evals, _ = read_groups(path)[(problem, name)]
+        n_skipped = len(log["t_start"]) - n_evals
+        log = {key: value[max(n_skipped, 0) :] for key, value in log.items()}
+
+        components = read_component_log(get_component_log_path(path, name))
+        rows[problem] = compute_overhead(log, components=components)
+
+    table = pd.DataFrame.from_dict(rows, orient="index", columns=OVERHEAD_COLUMNS)
+    table.index.name = "problem"
+    return table
+
+
+def summarize_overhead_tables(tables):
+    """Summarize the overhead tables of several benchmark cases.
+
+    Args:
+        tables (dict): Keys are the names of the benchmark cases, values are tables as
+            returned by get_overhead_table.
+
+    Returns:
+        pandas.DataFrame: One row per benchmark case with the total number of
+            evaluations and the total times over all problems, including the times of
+            the components, the share of the overhead in the total wall time, and the
+            mean and median overhead per evaluation over the problems.
+
+    """
+    rows = {}
+    for name, table in tables.items():
+        totals = table[["n_evaluations", "wall_time", "criterion_time"]].sum()
+        overhead_time = table["overhead_time"].sum()
+        # The component times are unknown if the optimizer is not tranquilo
+        component_totals = table[[*COMPONENT_COLUMNS, "other_overhead_time"]].sum(
+            min_count=1
+        )
+        rows[name] = {
+            "n_problems": len(table),
+            **totals.to_dict(),
+            "overhead_time": overhead_time,
+            **component_totals.to_dict(),
+            "overhead_share": overhead_time / totals["wall_time"]
+            if totals["wall_time"] > 0
+            else np.nan,
+            "mean_overhead_per_evaluation": table["overhead_per_evaluation"].mean(),
+            "median_overhead_per_evaluation": table["overhead_per_evaluation"].median(),
+        }
+
+    summary = pd.DataFrame.from_dict(rows, orient="index")
+    summary.index.name = "case"
+    return summary
+
+
+def _get_union_length(t_start, t_end):
+    if len(t_start) == 0:
+        return 0.0
+    order = np.argsort(t_start, kind="stable")
+    t_start, t_end = t_start[order], t_end[order]
+    # An interval starts a new connected component if it starts after all previous
+    # intervals ended.
+    running_end = np.maximum.accumulate(t_end)
+    is_new = np.concatenate([[True], t_start[1:] > running_end[:-1]])
+    component = np.cumsum(is_new) - 1
+    starts = t_start[is_new]
+    ends = np.full(len(starts), -np.inf)
+    np.maximum.at(ends, component, t_end)
+    return float(np.sum(ends - starts))
@@ -0,0 +1,95 @@
+"""Process-wide registry of the benchmark problem sets.
+
+The task modules of the benchmarks and the plots need the same problem sets over and
+over again during the collection of the tasks. The registry builds each problem set
+only once per process and hands out read-only views on it.
+
+"""
+from collections.abc import Mapping
+from functools import lru_cache
+
+from tranquilo_dev.config import get_benchmark_problem_info
+from tranquilo_dev.config import OPTIONS
+from tranquilo_dev.config import PROBLEM_CACHE
+from tranquilo_dev.config import PROBLEM_SETS
+
+
+class ProblemSet(Mapping):
+    """Read-only view on the benchmark problems of a problem set.
+
+    The view can be passed to em.run_benchmark and the estimagic plotting functions
+    like a dictionary of problems. Copying or pickling the view does not copy the
+    problems. Instead, the problem set is retrieved from the registry of the process
+    that receives the copy.
+
+    """
+
+    def __init__(self, name, problems):
+        self._name = name
+        self._problems = problems
+
+    @property
+    def name(self):
+        return self._name
+
+    def __getitem__(self, key):
+        return self._problems[key]
+
+    def __iter__(self):
+        return iter(self._problems)
+
+    def __len__(self):
+        return len(self._problems)
+
+    def __repr__(self):
+        return f"ProblemSet(name={self._name!r}, n_problems={len(self)})"
+
+    def __reduce__(self):
+        return get_problem_set, (self._name,)
+
+
+@lru_cache(maxsize=None)
+def get_problem_set(problem_name):
+    """Get the benchmark problems of a problem set.
+
+    Args:
+        problem_name (str): Name of the problem set. Must be a key of PROBLEM_SETS.
+
+    Returns:
+        ProblemSet: Read-only view on the benchmark problems.
+
+    """
+    # estimagic is only imported once a problem set is needed
+    from tranquilo_dev.benchmarks.benchmark_problems import (
+        get_extended_benchmark_problems,
+    )
+
+    problems = get_extended_benchmark_problems(
+        benchmark_kwargs=PROBLEM_SETS[problem_name],
+        **get_benchmark_problem_info(problem_name),
+        cache_dir=PROBLEM_CACHE,
+        n_cores=OPTIONS.sampling_n_cores,
+    )
+    return ProblemSet(problem_name, problems)
+
+
+@lru_cache(maxsize=None)
+def get_problem_set_fingerprint(problem_name):
+    """Get a fingerprint of the benchmark problems of a problem set.
+
+    The fingerprint is computed from the configuration of the problem set, without
+    building the problems. It changes whenever the problems change.
+
+    Args:
+        problem_name (str): Name of the problem set. Must be a key of PROBLEM_SETS.
+
+    Returns:
+        str: The fingerprint of the problem set.
+
+    """
+    from tranquilo_dev.benchmarks.benchmark_problems import get_problems_fingerprint
+
+    return get_problems_fingerprint(
+        benchmark_kwargs=PROBLEM_SETS[problem_name],
+        **get_benchmark_problem_info(problem_name),
+    )
@@ -0,0 +1,276 @@
+"""Progress of running benchmarks.
+
+All benchmark runners append events to a progress file with one JSON object per line.
+The events are:
+
+- plan: A benchmark case is started. Has the entries "n_problems", "n_completed", i.e.
+  the number of problems for which a checkpoint exists, and "n_workers".
+- start: A worker starts a problem. Has the entries "problem", "logs", i.e. the paths
+  of the history logs of the problem, and "n_params".
+- finish: A worker finished a problem. Has the entries "problem" and "n_evals".
+- error: A problem failed or was interrupted. Has the entries "problem" and "error".
+
+Each event also has the entries "event", "case", "time" and "pid". The file is never
+truncated. A plan event starts a new run of a benchmark case, hence only the events of
+a case after its last plan are summarized.
+
+The progress can be watched while the benchmarks are running with
+
+    $ python -m tranquilo_dev.benchmarks.progress [path]
+
+which shows the evaluations per second, the completed problems per benchmark case, the
+utilization of the workers and the estimated remaining time.
+
+"""
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+
+from tranquilo_dev.benchmarks.history_log import N_META_COLUMNS
+from tranquilo_dev.config import PROGRESS_LOG
+
+
+# Window over which the current number of evaluations per second is measured
+THROUGHPUT_WINDOW = 60
+
+
+class ProgressLog:
+    """Append progress events of a benchmark case to a progress file.
+
+    The object is picklable and can be passed to worker processes.
+
+    Args:
+        path (str or pathlib.Path): Path of the progress file.
+        case (str): Name of the benchmark case, i.e. "{problem_name}_{scenario_name}".
+
+    """
+
+    def __init__(self, path, case):
+        self.path = Path(path)
+        self.case = case
+
+    def emit(self, event, **fields):
+        record = {
+            "event": event,
+            "case": self.case,
+            "time": time.time(),
+            "pid": os.getpid(),
+            **fields,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A single write of a line to a file in append mode is not interleaved with
+        # the writes of other processes.
+        with open(self.path, "a") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+
+
+def read_progress(path):
+    """Read the events of a progress file.
+
+    Args:
+        path (str or pathlib.Path): Path of the progress file.
+
+    Returns:
+        list: List of events. A partially written last line is ignored.
+
+    """
+    events = []
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    events.append(json.loads(line))
+                except json.JSONDecodeError:
+                    break
+    except FileNotFoundError:
+        pass
+    return events
+
+
+def summarize_progress(events, now=None):
+    """Summarize the progress of the benchmarks.
+
+    Args:
+        events (list): Events as returned by read_progress.
+        now (float): Current time. Defaults to time.time().
+
+    Returns:
+        dict: Summary with the entries "cases", "workers", "n_evals",
+            "evals_per_second", "n_running", "n_workers" and "eta".
+
+    """
+    now = time.time() if now is None else now
+    events = _get_events_of_last_runs(events)
+
+    cases = {}
+    running = {}
+    durations = []
+    busy = {}
+    n_finished_evals = 0
+    finished_evals_in_window = 0
+
+    for event in events:
+        case = cases.setdefault(
+            event["case"],
+            {
+                "n_problems": 0,
+                "n_completed": 0,
+                "n_failed": 0,
+                "n_running": 0,
+                "n_workers": 1,
+            },
+        )
+        # A problem runs at most once at a time per case. A new start of a problem
+        # replaces a start whose worker was killed without emitting an event.
+        key = (event["case"], event.get("problem"))
+        if event["event"] == "plan":
+            case["n_problems"] = event["n_problems"]
+            case["n_completed"] = event["n_completed"]
+            case["n_workers"] = event["n_workers"]
+        elif event["event"] == "start":
+            running[key] = event
+        elif event["event"] == "finish":
+            start = running.pop(key, None)
+            case["n_completed"] += 1
+            n_finished_evals += event["n_evals"]
+            if start is not None:
+                duration = event["time"] - start["time"]
+                durations.append(duration)
+                busy[event["pid"]] = busy.get(event["pid"], 0) + duration
+                if event["time"] >= now - THROUGHPUT_WINDOW:
+                    share = min(1, THROUGHPUT_WINDOW / max(duration, 1e-12))
+                    finished_evals_in_window += share * event["n_evals"]
+        elif event["event"] == "error":
+            start = running.pop(key, None)
+            case["n_failed"] += 1
+            if start is not None:
+                duration = event["time"] - start["time"]
+                busy[event["pid"]] = busy.get(event["pid"], 0) + duration
+
+    n_running_evals = 0
+    workers = {}
+    for (case_name, problem), event in running.items():
+        pid = event["pid"]
+        cases[case_name]["n_running"] += 1
+        n_evals = _count_logged_evaluations(event["logs"], event["n_params"])
+        n_running_evals += n_evals
+        elapsed = now - event["time"]
+        busy[pid] = busy.get(pid, 0) + elapsed
+        workers[pid] = {"case": case_name, "problem": problem, "elapsed": elapsed}
+
+    start_time = min((event["time"] for event in events), default=now)
+    wall = max(now - start_time, 1e-12)
+    utilization = {pid: busy_time / wall for pid, busy_time in busy.items()}
+
+    # Evaluations of running problems are attributed to the window if the problem was
+    # started within the window, and proportionally otherwise.
+    running_evals_in_window = 0
+    for event in running.values():
+        elapsed = max(now - event["time"], 1e-12)
+        n_evals = _count_logged_evaluations(event["logs"], event["n_params"])
+        running_evals_in_window += n_evals * min(1, THROUGHPUT_WINDOW / elapsed)
+    window = min(THROUGHPUT_WINDOW, wall)
+    evals_per_second = (finished_evals_in_window + running_evals_in_window) / window
+
+    # Fine-grained tasks run single problems and do not emit a plan
+    n_remaining = sum(
+        max(0, case["n_problems"] - case["n_completed"] - case["n_failed"])
+        for case in cases.values()
+    )
+    n_workers = max(
+        len(utilization), max((c["n_workers"] for c in cases.values()), default=1)
+    )
+    if durations:
+        average_duration = sum(durations) / len(durations)
+        eta = n_remaining * average_duration / n_workers
+    else:
+        eta = None
+
+    return {
+        "cases": cases,
+        "workers": workers,
+        "utilization": utilization,
+        "n_evals": n_finished_evals + n_running_evals,
+        "evals_per_second": evals_per_second,
+        "n_running": len(running),
+        "n_workers": n_workers,
+        "eta": eta,
+    }
+
+
+def format_summary(summary):
+    """Format a progress summary as text for a terminal."""
+    eta = "unknown" if summary["eta"] is None else _format_duration(summary["eta"])
+    lines = [
+        f"Evaluations: {summary['n_evals']:,} ({summary['evals_per_second']:.1f}/s)",
+        f"Running problems: {summary['n_running']} on {summary['n_workers']} workers",
+        f"ETA: {eta}",
+        "",
+        f"{'Case':<50} {'Completed':>12} {'Running':>8} {'Failed':>8}",
+    ]
+    for name, case in sorted(summary["cases"].items()):
+        completed = f"{case['n_completed']}/{case['n_problems']}"
+        lines.append(
+            f"{name:<50} {completed:>12} {case['n_running']:>8} {case['n_failed']:>8}"
+        )
+
+    lines += ["", f"{'Worker':>8} {'Utilization':>12}  Current problem"]
+    for pid, utilization in sorted(summary["utilization"].items()):
+        worker = summary["workers"].get(pid)
+        if worker:
+            elapsed = _format_duration(worker["elapsed"])
+            current = f"{worker['case']}/{worker['problem']} ({elapsed})"
+        else:
+            current = "idle"
+        lines.append(f"{pid:>8} {utilization:>12.0%}  {current}")
+    return "\n".join(lines)
+
+
+def _get_events_of_last_runs(events):
+    """Drop the events of each case that precede its last plan event."""
+    last_plan = {
+        event["case"]: i for i, event in enumerate(events) if event["event"] == "plan"
+    }
+    return [
+        event for i, event in enumerate(events) if i >= last_plan.get(event["case"], 0)
+    ]
+
+
+def _count_logged_evaluations(logs, n_params):
+    record_size = 8 * (n_params + N_META_COLUMNS)
+    n_evals = 0
+    for log in logs:
+        try:
+            n_evals += os.path.getsize(log) // record_size
+        except OSError:
+            pass
+    return n_evals
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Show the progress of benchmarks.")
+    parser.add_argument("path", nargs="?", default=PROGRESS_LOG, type=Path)
+    parser.add_argument("--interval", type=float, default=2.0)
+    parser.add_argument("--once", action="store_true", help="Print once and exit.")
+    args = parser.parse_args()
+
+    while True:
+        text = format_summary(summarize_progress(read_progress(args.path)))
+        if args.once:
+            print(text)  # noqa: T201
+            break
+        # Clear the terminal and move the cursor to the top left corner
+        print("\033[2J\033[H" + text, flush=True)  # noqa: T201
+        time.sleep(args.interval)
+
+
+if __name__ == "__main__":
+    main()
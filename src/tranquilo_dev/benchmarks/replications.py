@@ -0,0 +1,13 @@
+"""Naming of the noise replications of benchmark problems.
+
+Replications of a noisy problem are additional problems whose name has the suffix
+"{REPLICATION_SEPARATOR}{replication}". The first replication has no suffix.
+
+"""
+REPLICATION_SEPARATOR = "__rep_"
+
+
+def get_replication(problem_name):
+    """Get the replication of a problem from its name."""
+    _, separator, replication = problem_name.rpartition(REPLICATION_SEPARATOR)
+    return int(replication) if separator else 0
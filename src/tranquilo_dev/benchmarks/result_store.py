@@ -0,0 +1,248 @@
+"""Columnar storage of benchmark results.
+
+The results of em.run_benchmark are stored as an Arrow IPC (Feather) file with one row
+per (problem, algorithm, evaluation). The columns are:
+
+- problem (str): Name of the problem.
+- algorithm (str): Name of the optimizer configuration.
+- evaluation (int): Index of the criterion evaluation.
+- criterion (float): Criterion value.
+- params (list[float]): Flat parameter vector.
+- walltime (float): Time since the start of the optimization.
+- batch (int): Index of the batch of the criterion evaluation.
+
+The start and length of the rows and the number of parameters of each (problem,
+algorithm) pair are stored in the schema metadata, such that single histories can be
+read without scanning the file, and empty histories keep the shape of their params.
+The "solution" entry of the results, i.e. the full OptimizeResult, is not stored.
+
+"""
+import json
+from collections.abc import Mapping
+
+import numpy as np
+import pyarrow as pa
+from pyarrow import feather
+
+
+# Mapping from column names to the keys of a single benchmark result
+HISTORY_COLUMNS = {
+    "criterion": "criterion_history",
+    "params": "params_history",
+    "walltime": "time_history",
+    "batch": "batches_history",
+}
+
+SCHEMA = pa.schema(
+    [
+        ("problem", pa.dictionary(pa.int32(), pa.string())),
+        ("algorithm", pa.dictionary(pa.int32(), pa.string())),
+        ("evaluation", pa.int64()),
+        ("criterion", pa.float64()),
+        ("params", pa.list_(pa.float64())),
+        ("walltime", pa.float64()),
+        ("batch", pa.int64()),
+    ]
+)
+
+
+def write_benchmark_results(results, path):
+    """Write benchmark results to a columnar file.
+
+    Args:
+        results (dict): Benchmark results as returned by em.run_benchmark. Keys are
+            tuples of the form (problem, algorithm).
+        path (str or pathlib.Path): Path of the Arrow IPC file.
+
+    """
+    table = _results_to_table(results)
+    feather.write_feather(table, path, compression="uncompressed")
+
+
+def read_benchmark_results(path, columns=None):
+    """Read benchmark results from a columnar file.
+
+    Args:
+        path (str or pathlib.Path): Path of the Arrow IPC file.
+        columns (list): Subset of the history columns, i.e. of "criterion", "params",
+            "walltime" and "batch", that are read. If None, all columns are read.
+
+    Returns:
+        dict: Benchmark results in the format of em.run_benchmark, without the entry
+            "solution". Keys are tuples of the form (problem, algorithm).
+
+    """
+    return dict(LazyBenchmarkResults([path], columns=columns))
+
+
+def rename_algorithms(path, new_path, names):
+    """Write a copy of stored benchmark results with renamed algorithms.
+
+    Only the dictionary of the algorithm column and the row positions in the schema
+    metadata change. The histories are copied without being converted.
+
+    Args:
+        path (str or pathlib.Path): Path of the Arrow IPC file.
+        new_path (str or pathlib.Path): Path of the renamed copy.
+        names (dict): Mapping from old to new algorithm names. Algorithms that are
+            not in the mapping keep their name.
+
+    """
+    table = feather.read_table(path, memory_map=True)
+
+    chunks = []
+    for chunk in table.column("algorithm").chunks:
+        dictionary = [names.get(name, name) for name in chunk.dictionary.to_pylist()]
+        chunks.append(
+            pa.DictionaryArray.from_arrays(
+                indices=chunk.indices, dictionary=pa.array(dictionary, type=pa.string())
+            )
+        )
+    index = table.schema.get_field_index("algorithm")
+    table = table.set_column(index, "algorithm", pa.chunked_array(chunks))
+
+    groups = [
+        [problem, names.get(algo, algo), start, length, n_params]
+        for (problem, algo), (start, length, n_params) in read_groups(path).items()
+    ]
+    table = table.replace_schema_metadata({"groups": json.dumps(groups)})
+    feather.write_feather(table, new_path, compression="uncompressed")
+
+
+class LazyBenchmarkResults(Mapping):
+    """Lazy view on the benchmark results stored in one or more columnar files.
+
+    Only the row positions of the (problem, algorithm) pairs are read on construction.
+    The files are memory-mapped when they are first accessed, and the histories of a
+    pair are read-only arrays that point into the memory map. Hence, a history is only
+    loaded into memory when a computation touches it.
+
+    Args:
+        paths (list): Paths of the Arrow IPC files.
+        columns (list): Subset of the history columns, i.e. of "criterion", "params",
+            "walltime" and "batch", that are read. If None, all columns are read.
+
+    """
+
+    def __init__(self, paths, columns=None):
+        self._columns = list(HISTORY_COLUMNS) if columns is None else list(columns)
+        self._positions = {}
+        for path in paths:
+            for key, (start, length, n_params) in read_groups(path).items():
+                self._positions[key] = (path, start, length, n_params)
+        self._tables = {}
+
+    def __getitem__(self, key):
+        path, start, length, n_params = self._positions[key]
+        table = self._get_table(path).slice(start, length)
+        return _get_history(table, columns=self._columns, n_params=n_params)
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+    def _get_table(self, path):
+        if path not in self._tables:
+            self._tables[path] = feather.read_table(
+                path, columns=self._columns, memory_map=True
+            )
+        return self._tables[path]
+
+
+def read_groups(path):
+    """Read the row positions of all (problem, algorithm) pairs.
+
+    Args:
+        path (str or pathlib.Path): Path of the Arrow IPC file.
+
+    Returns:
+        dict: Keys are tuples of the form (problem, algorithm), values are tuples of
+            the form (start, length, n_params). n_params is None for files that were
+            written before the number of parameters was stored.
+
+    """
+    with pa.memory_map(str(path)) as source:
+        schema = pa.ipc.open_file(source).schema
+    groups = json.loads(schema.metadata[b"groups"])
+    return {
+        (problem, algo): (start, length, n_params[0] if n_params else None)
+        for problem, algo, start, length, *n_params in groups
+    }
+
+
+def _results_to_table(results):
+    keys = list(results)
+    histories = [_get_flat_history(results[key]) for key in keys]
+    lengths = np.array([len(h["criterion"]) for h in histories], dtype=np.int64)
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]]).astype(int)
+
+    n_params = [h["params"].shape[1] for h in histories]
+    params_lengths = np.repeat(np.array(n_params, dtype=np.int64), lengths)
+    params_offsets = np.concatenate([[0], np.cumsum(params_lengths)])
+
+    table = pa.table(
+        {
+            "problem": _get_dictionary_array([k[0] for k in keys], lengths),
+            "algorithm": _get_dictionary_array([k[1] for k in keys], lengths),
+            "evaluation": _concatenate([np.arange(n) for n in lengths], np.int64),
+            "criterion": _concatenate([h["criterion"] for h in histories]),
+            "params": pa.ListArray.from_arrays(
+                pa.array(params_offsets, type=pa.int32()),
+                pa.array(_concatenate([h["params"].ravel() for h in histories])),
+            ),
+            "walltime": _concatenate([h["walltime"] for h in histories]),
+            "batch": _concatenate([h["batch"] for h in histories], np.int64),
+        },
+        schema=SCHEMA,
+    )
+
+    groups = [
+        [*key, int(start), int(length), int(n)]
+        for key, start, length, n in zip(keys, starts, lengths, n_params)
+    ]
+    return table.replace_schema_metadata({"groups": json.dumps(groups)})
+
+
+def _get_flat_history(result):
+    criterion = np.asarray(result["criterion_history"], dtype=np.float64)
+    n_evals = len(criterion)
+    # A two-dimensional params history, e.g. from a history log, knows the number of
+    # parameters even if it has no rows.
+    params = np.asarray(result["params_history"], dtype=np.float64)
+    if params.ndim != 2:
+        params = params.reshape(n_evals, -1 if n_evals else 0)
+    return {
+        "criterion": criterion,
+        "params": params,
+        "walltime": np.asarray(result["time_history"], dtype=np.float64),
+        "batch": np.asarray(result["batches_history"], dtype=np.int64),
+    }
+
+
+def _concatenate(arrays, dtype=np.float64):
+    """Concatenate arrays, which also works for an empty list of arrays."""
+    return np.concatenate([np.empty(0, dtype=dtype), *arrays]).astype(dtype)
+
+
+def _get_dictionary_array(names, lengths):
+    """Create a dictionary encoded string column with names[i] repeated lengths[i]."""
+    dictionary, codes = np.unique(names, return_inverse=True)
+    return pa.DictionaryArray.from_arrays(
+        indices=np.repeat(codes, lengths).astype(np.int32),
+        dictionary=pa.array(dictionary.tolist(), type=pa.string()),
+    )
+
+
+def _get_history(table, columns, n_params):
+    history = {}
+    for name in columns:
+        column = table.column(name)
+        if name == "params":
+            values = column.combine_chunks().flatten().to_numpy()
+            shape = (table.num_rows, -1 if n_params is None else n_params)
+            history["params_history"] = values.reshape(shape)
+        else:
+            history[HISTORY_COLUMNS[name]] = column.to_numpy()
+    return history
@@ -0,0 +1,314 @@
+"""Run benchmarks with a checkpoint for each problem.
+
+em.run_benchmark returns the results of all problems at once. Here, each problem is
+run separately and its result is persisted as soon as it is finished. On a rerun, the
+problems for which a checkpoint exists are skipped.
+
+"""
+import copy
+import hashlib
+import json
+import traceback
+from pathlib import Path
+
+import estimagic as em
+from estimagic import batch_evaluators
+from estimagic.benchmarking.run_benchmark import _get_optimization_arguments_and_keys
+from estimagic.benchmarking.run_benchmark import _process_one_result
+from estimagic.benchmarking.run_benchmark import _process_optimize_options
+from tranquilo_dev.benchmarks.component_log import profile_tranquilo_components
+from tranquilo_dev.benchmarks.history_log import assemble_benchmark_result
+from tranquilo_dev.benchmarks.history_log import LoggingCriterion
+from tranquilo_dev.benchmarks.history_log import read_history_log
+from tranquilo_dev.benchmarks.result_store import LazyBenchmarkResults
+from tranquilo_dev.benchmarks.result_store import write_benchmark_results
+from tranquilo_dev.config import OPTIONS
+from tranquilo_dev.config import serialize_callable
+
+
+def run_benchmark_with_checkpoints(
+    problems,
+    optimize_options,
+    checkpoint_dir,
+    *,
+    problems_fingerprint=None,
+    progress=None,
+    **benchmark_kwargs,
+):
+    """Run a benchmark and store a checkpoint for each problem.
+
+    The number of problems that are run in parallel is given by OPTIONS.get_n_cores
+    for the number of cores of a single optimization, see get_cores_per_optimization.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        optimize_options (dict): Dictionary that maps names of optimizer configurations
+            to keyword arguments for the minimization. See em.run_benchmark.
+        checkpoint_dir (str or pathlib.Path): Directory in which the checkpoints are
+            stored. Checkpoints are only reused if the optimize options, the benchmark
+            kwargs and the problems fingerprint did not change.
+        problems_fingerprint (str): Fingerprint of the problems, see
+            get_problem_set_fingerprint. Default None, i.e. the checkpoints are not
+            invalidated if the problems change.
+        progress (ProgressLog): Progress log of the benchmark case. Default None.
+        **benchmark_kwargs: Further keyword arguments for em.run_benchmark, e.g.
+            max_criterion_evaluations or error_handling.
+
+    Returns:
+        LazyBenchmarkResults: Benchmark results of all problems.
+
+    """
+    paths = get_checkpoint_paths(
+        problems,
+        optimize_options=optimize_options,
+        checkpoint_dir=checkpoint_dir,
+        benchmark_kwargs=benchmark_kwargs,
+        problems_fingerprint=problems_fingerprint,
+    )
+
+    arguments = [
+        {
+            "problem_name": name,
+            "problem": problems[name],
+            "optimize_options": optimize_options,
+            "path": path,
+            "progress": progress,
+            **benchmark_kwargs,
+        }
+        for name, path in paths.items()
+        if not path.exists()
+    ]
+
+    n_workers = OPTIONS.get_n_cores(get_cores_per_optimization(optimize_options))
+    if progress is not None:
+        progress.emit(
+            "plan",
+            n_problems=len(paths),
+            n_completed=len(paths) - len(arguments),
+            n_workers=n_workers,
+        )
+
+    batch_evaluators.joblib_batch_evaluator(
+        func=run_single_problem,
+        arguments=arguments,
+        n_cores=n_workers,
+        error_handling="raise",
+        unpack_symbol="**",
+    )
+
+    return LazyBenchmarkResults(paths.values())
+
+
+def get_cores_per_optimization(optimize_options):
+    """Get the number of cores that a single optimization occupies.
+
+    Optimizers that evaluate the criterion in parallel, e.g. tranquilo with a batch_size
+    larger than one, use as many cores as their n_cores algo option. The batch is
+    evaluated serially if the option is not set.
+
+    Args:
+        optimize_options (dict): Dictionary that maps names of optimizer configurations
+            to keyword arguments for the minimization. See em.run_benchmark.
+
+    Returns:
+        int: Maximum number of cores over all optimizer configurations.
+
+    """
+    n_cores = [
+        options.get("algo_options", {}).get("n_cores", 1)
+        for options in optimize_options.values()
+        if isinstance(options, dict)
+    ]
+    return max([1, *n_cores])
+
+
+def get_checkpoint_paths(
+    problems,
+    optimize_options,
+    checkpoint_dir,
+    benchmark_kwargs,
+    problems_fingerprint=None,
+):
+    """Get the paths of the checkpoints of all problems.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        optimize_options (dict): Dictionary that maps names of optimizer configurations
+            to keyword arguments for the minimization. See em.run_benchmark.
+        checkpoint_dir (str or pathlib.Path): Directory in which the checkpoints are
+            stored.
+        benchmark_kwargs (dict): Further keyword arguments for em.run_benchmark.
+        problems_fingerprint (str): Fingerprint of the problems, see
+            get_problem_set_fingerprint. Default None.
+
+    Returns:
+        dict: Keys are the problem names and values the paths of the checkpoints.
+
+    """
+    key = _get_checkpoint_key(
+        optimize_options,
+        benchmark_kwargs=benchmark_kwargs,
+        problems_fingerprint=problems_fingerprint,
+    )
+    checkpoint_dir = Path(checkpoint_dir) / key
+    checkpoint_dir.mkdir(parents=True, exist_ok=True)
+    return {name: checkpoint_dir / f"{name}.arrow" for name in problems}
+
+
+def run_single_problem(
+    problem_name, problem, optimize_options, path, progress=None, **benchmark_kwargs
+):
+    """Run a benchmark on a single problem and write the result to a columnar file.
+
+    The criterion evaluations of each optimizer configuration are streamed into an
+    append-only history log next to the result, see history_log. The optimization is
+    run with em.minimize, and the result is assembled from the log and the batches of
+    the optimizer's history, see assemble_benchmark_result. Unlike em.run_benchmark,
+    no processed copy of the history is built in memory. Note that em.minimize still
+    keeps its own history until the optimization is finished. The time tranquilo
+    spends in its components is logged as well, see component_log.
+
+    Args:
+        problem_name (str): Name of the problem.
+        problem (dict): The benchmark problem.
+        optimize_options (dict): Dictionary that maps names of optimizer configurations
+            to keyword arguments for the minimization. See em.run_benchmark.
+        path (pathlib.Path): Path of the Arrow IPC file.
+        progress (ProgressLog): Progress log of the benchmark case. Default None.
+        **benchmark_kwargs: Further keyword arguments for em.run_benchmark.
+
+    """
+    n_params = problem["inputs"]["params"].size
+    log_paths = {name: get_history_log_path(path, name) for name in optimize_options}
+    component_log_paths = {
+        name: get_component_log_path(path, name) for name in optimize_options
+    }
+    for log_path in [*log_paths.values(), *component_log_paths.values()]:
+        log_path.unlink(missing_ok=True)
+    if progress is not None:
+        progress.emit(
+            "start",
+            problem=problem_name,
+            logs=[str(log_path) for log_path in log_paths.values()],
+            n_params=n_params,
+        )
+
+    # A failed or interrupted problem emits an error event, such that it is not shown
+    # as running in the progress view.
+    try:
+        results = {}
+        for name, options in optimize_options.items():
+            log_path = log_paths[name]
+            # Each optimizer configuration gets a fresh copy of the criterion, such
+            # that stateful criteria, e.g. noisy ones, do not depend on the previous
+            # runs.
+            criterion = copy.deepcopy(problem["inputs"]["criterion"])
+            logged_problem = {
+                **problem,
+                "inputs": {
+                    **problem["inputs"],
+                    "criterion": LoggingCriterion(criterion, log_path),
+                },
+            }
+
+            with profile_tranquilo_components(component_log_paths[name]):
+                history = _minimize(logged_problem, name, options, **benchmark_kwargs)
+
+            if isinstance(history, str):
+                # Replace a failed optimization by the start values, as em.run_benchmark
+                # does.
+                result = _process_one_result(history, problem=problem)
+            else:
+                log = read_history_log(log_path, n_params=n_params)
+                result = assemble_benchmark_result(
+                    log, problem=problem, history=history
+                )
+            results[(problem_name, name)] = result
+
+        # Write to a temporary file first and rename it afterwards, such that a crash
+        # while writing does not leave a corrupt checkpoint behind.
+        tmp_path = path.with_suffix(".tmp")
+        write_benchmark_results(results, tmp_path)
+        tmp_path.replace(path)
+    except BaseException as error:
+        if progress is not None:
+            progress.emit("error", problem=problem_name, error=repr(error))
+        raise
+
+    if progress is not None:
+        n_evals = sum(len(result["criterion_history"]) for result in results.values())
+        progress.emit("finish", problem=problem_name, n_evals=n_evals)
+
+
+def _minimize(
+    problem,
+    name,
+    options,
+    *,
+    error_handling="continue",
+    max_criterion_evaluations=1_000,
+    disable_convergence=True,
+    **kwargs,  # noqa: U100
+):
+    """Run one optimization with the options that em.run_benchmark would use.
+
+    Returns:
+        dict or str: The entries "params" and "batches" of the history of the
+            optimizer. If the optimization failed and error_handling is "continue", the
+            traceback of the error.
+
+    """
+    opt_options = _process_optimize_options(
+        {name: options},
+        max_evals=max_criterion_evaluations,
+        disable_convergence=disable_convergence,
+    )
+    (minimize_kwargs,), _ = _get_optimization_arguments_and_keys(
+        {name: problem}, opt_options
+    )
+    try:
+        res = em.minimize(**minimize_kwargs)
+    except Exception:
+        if error_handling == "raise":
+            raise
+        return traceback.format_exc()
+    return {"params": res.history["params"], "batches": res.history["batches"]}
+
+
+def get_history_log_path(path, name):
+    """Get the path of the history log of an optimizer configuration.
+
+    Args:
+        path (pathlib.Path): Path of the result of the problem.
+        name (str): Name of the optimizer configuration.
+
+    Returns:
+        pathlib.Path: Path of the history log.
+
+    """
+    return path.with_name(f"{path.stem}.{name}.log")
+
+
+def get_component_log_path(path, name):
+    """Get the path of the component log of an optimizer configuration.
+
+    Args:
+        path (pathlib.Path): Path of the result of the problem.
+        name (str): Name of the optimizer configuration.
+
+    Returns:
+        pathlib.Path: Path of the component log.
+
+    """
+    return path.with_name(f"{path.stem}.{name}.components.log")
+
+
+def _get_checkpoint_key(optimize_options, benchmark_kwargs, problems_fingerprint):
+    config = {
+        "optimize_options": optimize_options,
+        "benchmark_kwargs": benchmark_kwargs,
+        "problems_fingerprint": problems_fingerprint,
+        "estimagic_version": em.__version__,
+    }
+    serialized = json.dumps(config, sort_keys=True, default=serialize_callable)
+    return hashlib.sha256(serialized.encode()).hexdigest()[:16]
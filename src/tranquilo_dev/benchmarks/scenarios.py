@@ -0,0 +1,82 @@
+"""Keyword arguments for em.run_benchmark of each benchmark case.
+
+A benchmark case is a tuple of the form (problem_name, scenario_name). The scenarios
+are either the optimizers of the competition, or tranquilo variants whose names follow
+the pattern "{algorithm}_{variant}", where algorithm is "tranquilo" or "tranquilo_ls",
+and variant is a key of TRANQUILO_VARIANTS, e.g. "default", "experimental",
+"parallel_{batch_size}", "experimental_parallel_{batch_size}" or
+"multicore_parallel_{batch_size}".
+
+"""
+from copy import deepcopy
+
+from tranquilo_dev.config import COMPETITION
+from tranquilo_dev.config import get_max_criterion_evaluations
+from tranquilo_dev.config import get_max_iterations
+from tranquilo_dev.config import get_tranquilo_version
+from tranquilo_dev.config import TRANQUILO_BASE_OPTIONS
+from tranquilo_dev.config import TRANQUILO_VARIANTS
+
+
+def get_benchmark_kwargs(problem_name, scenario_name):
+    """Get the keyword arguments for em.run_benchmark of a benchmark case.
+
+    Args:
+        problem_name (str): Name of the problem set.
+        scenario_name (str): Name of the scenario.
+
+    Returns:
+        dict: Keyword arguments for em.run_benchmark, except for the problems and the
+            number of cores.
+
+    """
+    if scenario_name in COMPETITION:
+        out = _get_competition_kwargs(problem_name, scenario_name)
+    elif scenario_name.startswith("tranquilo"):
+        out = _get_tranquilo_kwargs(problem_name, scenario_name)
+    else:
+        raise ValueError(f"Unknown scenario: {scenario_name}.")
+    return out
+
+
+def _get_competition_kwargs(problem_name, scenario_name):
+    noisy = "noisy" in problem_name
+    return {
+        "optimize_options": {scenario_name: COMPETITION[scenario_name]},
+        "max_criterion_evaluations": get_max_criterion_evaluations(noisy=noisy),
+        "disable_convergence": True,
+    }
+
+
+def _get_tranquilo_kwargs(problem_name, scenario_name):
+    functype = "ls" if scenario_name.startswith("tranquilo_ls_") else "scalar"
+    algorithm = get_tranquilo_version(functype)
+
+    variant = scenario_name.removeprefix(f"{algorithm}_")
+    if variant not in TRANQUILO_VARIANTS:
+        raise ValueError(f"Unknown tranquilo variant: {variant}.")
+    variant_options = TRANQUILO_VARIANTS[variant]
+
+    # Parallel scenarios are only run on the noise-free problem sets
+    parallel = variant_options.get("batch_size", 1) > 1
+    noisy = "noisy" in problem_name and not parallel
+    max_iterations = get_max_iterations(noisy=noisy, functype=functype)
+    max_evals = get_max_criterion_evaluations(noisy=noisy)
+
+    optimize_options = deepcopy(TRANQUILO_BASE_OPTIONS)
+    optimize_options["algorithm"] = algorithm
+    optimize_options["algo_options"] = {
+        **optimize_options["algo_options"],
+        "stopping_max_iterations": max_iterations,
+        "stopping_max_criterion_evaluations": max_evals,
+        **variant_options,
+    }
+    if noisy:
+        optimize_options["algo_options"]["noisy"] = True
+
+    return {
+        "optimize_options": {scenario_name: optimize_options},
+        "max_criterion_evaluations": max_evals,
+        "disable_convergence": False,
+        "error_handling": "raise",
+    }
@@ -0,0 +1,154 @@
+"""Run all benchmark cases on a single process pool.
+
+Instead of one process pool per benchmark task, the problems of all benchmark cases are
+flattened into a single queue of jobs that is processed by one long-lived process pool.
+Idle workers take the next job from the queue, such that a slow problem only blocks a
+single worker, and the machine is not oversubscribed by several pools.
+
+The jobs are ordered by their runtime in previous runs, longest first. Jobs without a
+recorded runtime are started first. The result of each job is stored as a checkpoint,
+such that an interrupted run can be resumed.
+
+"""
+import json
+import time
+from concurrent.futures import as_completed
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set_fingerprint
+from tranquilo_dev.benchmarks.progress import ProgressLog
+from tranquilo_dev.benchmarks.result_store import LazyBenchmarkResults
+from tranquilo_dev.benchmarks.result_store import write_benchmark_results
+from tranquilo_dev.benchmarks.runner import get_checkpoint_paths
+from tranquilo_dev.benchmarks.runner import get_cores_per_optimization
+from tranquilo_dev.benchmarks.runner import run_single_problem
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.config import OPTIONS
+
+
+def run_benchmark_cases(
+    cases, paths, checkpoint_dir, runtimes_path, progress_path=None
+):
+    """Run benchmark cases on a single process pool.
+
+    The number of processes in the pool is given by OPTIONS.get_n_cores for the
+    largest number of cores of a single optimization. If a job fails, the queued jobs
+    are cancelled, and the error is raised once the running jobs have finished and the
+    runtimes of all finished jobs are saved.
+
+    Args:
+        cases (list): List of benchmark cases, i.e. tuples of the form (problem_name,
+            scenario_name).
+        paths (dict): Dictionary that maps the name of a case, i.e.
+            "{problem_name}_{scenario_name}", to the path of its results.
+        checkpoint_dir (pathlib.Path): Directory in which the results of the single
+            problems are stored.
+        runtimes_path (pathlib.Path): Path of a JSON file with the runtimes of the
+            single problems in previous runs. The file is updated after each job.
+        progress_path (pathlib.Path): Path of the progress log. Default None, i.e. no
+            progress is logged.
+
+    """
+    runtimes = _read_runtimes(runtimes_path)
+
+    jobs = []
+    checkpoints = {}
+    plans = {}
+    cores_per_optimization = 1
+    for problem_name, scenario_name in cases:
+        name = f"{problem_name}_{scenario_name}"
+        problems = get_problem_set(problem_name)
+
+        benchmark_kwargs = get_benchmark_kwargs(problem_name, scenario_name)
+        optimize_options = benchmark_kwargs.pop("optimize_options")
+        cores_per_optimization = max(
+            cores_per_optimization, get_cores_per_optimization(optimize_options)
+        )
+
+        checkpoints[name] = get_checkpoint_paths(
+            problems,
+            optimize_options=optimize_options,
+            checkpoint_dir=Path(checkpoint_dir) / name,
+            benchmark_kwargs=benchmark_kwargs,
+            problems_fingerprint=get_problem_set_fingerprint(problem_name),
+        )
+
+        progress = None if progress_path is None else ProgressLog(progress_path, name)
+        n_jobs = len(jobs)
+        for benchmark_problem, path in checkpoints[name].items():
+            if not path.exists():
+                job = {
+                    "job_id": f"{name}/{benchmark_problem}",
+                    "problem_name": benchmark_problem,
+                    "problem": problems[benchmark_problem],
+                    "optimize_options": optimize_options,
+                    "path": path,
+                    "progress": progress,
+                    **benchmark_kwargs,
+                }
+                jobs.append(job)
+        n_problems = len(checkpoints[name])
+        plans[name] = (progress, n_problems, n_problems - (len(jobs) - n_jobs))
+
+    jobs = sorted(
+        jobs, key=lambda job: runtimes.get(job["job_id"], np.inf), reverse=True
+    )
+
+    max_workers = OPTIONS.get_n_cores(cores_per_optimization)
+    for progress, n_problems, n_completed in plans.values():
+        if progress is not None:
+            progress.emit(
+                "plan",
+                n_problems=n_problems,
+                n_completed=n_completed,
+                n_workers=max_workers,
+            )
+
+    error = None
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(_run_job, **job) for job in jobs]
+        for future in as_completed(futures):
+            try:
+                job_id, runtime = future.result()
+            except Exception as e:
+                # Do not start the queued jobs. The running jobs finish when the pool
+                # is shut down.
+                error = e
+                executor.shutdown(wait=False, cancel_futures=True)
+                break
+            runtimes[job_id] = runtime
+            _write_runtimes(runtimes_path, runtimes)
+
+    if error is not None:
+        # Save the runtimes of the jobs that finished after the failed one
+        for future in futures:
+            if future.done() and not future.cancelled() and not future.exception():
+                job_id, runtime = future.result()
+                runtimes[job_id] = runtime
+        _write_runtimes(runtimes_path, runtimes)
+        raise error
+
+    # Scatter the results of the single problems back into the benchmark cases
+    for name, path in paths.items():
+        results = LazyBenchmarkResults(checkpoints[name].values())
+        write_benchmark_results(results, path)
+
+
+def _run_job(job_id, **kwargs):
+    start = time.perf_counter()
+    run_single_problem(**kwargs)
+    return job_id, time.perf_counter() - start
+
+
+def _read_runtimes(path):
+    try:
+        return json.loads(Path(path).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+def _write_runtimes(path, runtimes):
+    Path(path).write_text(json.dumps(runtimes, indent=4, sort_keys=True))
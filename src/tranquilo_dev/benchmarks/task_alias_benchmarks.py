@@ -0,0 +1,21 @@
+import pytask
+from tranquilo_dev.config import BENCHMARK_ALIASES
+from tranquilo_dev.config import BLD
+
+
+OUT = BLD / "benchmarks"
+
+# Benchmark cases whose scenario has the same options as another scenario on the same
+# problem set are not run. Instead, the results of the other scenario are copied and the
+# algorithm is renamed to the scenario of the case.
+for (problem_name, scenario_name), (_, run_scenario_name) in BENCHMARK_ALIASES.items():
+
+    name = f"{problem_name}_{scenario_name}"
+
+    @pytask.mark.depends_on(OUT / f"{problem_name}_{run_scenario_name}.arrow")
+    @pytask.mark.produces(OUT / f"{name}.arrow")
+    @pytask.mark.task(id=name, kwargs={"names": {run_scenario_name: scenario_name}})
+    def task_alias_benchmark(depends_on, produces, names):
+        from tranquilo_dev.benchmarks.result_store import rename_algorithms
+
+        rename_algorithms(depends_on, produces, names=names)
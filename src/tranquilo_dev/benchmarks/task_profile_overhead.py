@@ -0,0 +1,90 @@
+"""Profile the overhead of tranquilo relative to the time spent in the criterion.
+
+The overhead is computed from the history and component logs that the benchmark
+runners write next to the results of each problem, see overhead.py. The tasks are only
+created if the option PROFILE_OVERHEAD is set.
+
+"""
+import pytask
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set_fingerprint
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.config import BLD
+from tranquilo_dev.config import OPTIONS
+from tranquilo_dev.config import TRANQUILO_CASES
+
+
+OUT = BLD / "benchmarks"
+CHECKPOINTS = OUT / "checkpoints"
+PIECES = OUT / "pieces"
+OVERHEAD = BLD / "overhead"
+
+CASES = list(dict.fromkeys(TRANQUILO_CASES)) if OPTIONS.PROFILE_OVERHEAD else []
+
+
+def get_result_paths(problem_name, scenario_name, problems):
+    """Get the paths of the results of the single problems of a benchmark case.
+
+    Args:
+        problem_name (str): Name of the problem set.
+        scenario_name (str): Name of the scenario.
+        problems (dict): Dictionary of benchmark problems.
+
+    Returns:
+        dict: Keys are the problem names and values the paths of the results.
+
+    """
+    from tranquilo_dev.benchmarks.runner import get_checkpoint_paths
+
+    name = f"{problem_name}_{scenario_name}"
+    if OPTIONS.FINE_GRAINED_TASKS and not OPTIONS.GLOBAL_SCHEDULER:
+        paths = {problem: PIECES / name / f"{problem}.arrow" for problem in problems}
+    else:
+        benchmark_kwargs = get_benchmark_kwargs(problem_name, scenario_name)
+        paths = get_checkpoint_paths(
+            problems,
+            optimize_options=benchmark_kwargs.pop("optimize_options"),
+            checkpoint_dir=CHECKPOINTS / name,
+            benchmark_kwargs=benchmark_kwargs,
+            problems_fingerprint=get_problem_set_fingerprint(problem_name),
+        )
+    return paths
+
+
+for problem_name, scenario_name in CASES:
+
+    name = f"{problem_name}_{scenario_name}"
+
+    @pytask.mark.depends_on(OUT / f"{name}.arrow")
+    @pytask.mark.produces(OVERHEAD / f"{name}.csv")
+    @pytask.mark.task(id=name)
+    def task_profile_overhead(
+        produces, problem_name=problem_name, scenario_name=scenario_name
+    ):
+        from tranquilo_dev.benchmarks.overhead import get_overhead_table
+
+        problems = get_problem_set(problem_name)
+        paths = get_result_paths(problem_name, scenario_name, problems)
+        table = get_overhead_table(paths, problems=problems, name=scenario_name)
+        table.to_csv(produces)
+
+
+if CASES:
+
+    @pytask.mark.depends_on(
+        {
+            f"{problem_name}_{scenario_name}": OVERHEAD
+            / f"{problem_name}_{scenario_name}.csv"
+            for problem_name, scenario_name in CASES
+        }
+    )
+    @pytask.mark.produces(OVERHEAD / "overhead.csv")
+    def task_summarize_overhead(depends_on, produces):
+        import pandas as pd
+        from tranquilo_dev.benchmarks.overhead import summarize_overhead_tables
+
+        tables = {
+            name: pd.read_csv(path, index_col="problem")
+            for name, path in depends_on.items()
+        }
+        summarize_overhead_tables(tables).to_csv(produces)
@@ -0,0 +1,116 @@
+"""Run the benchmark cases.
+
+The keyword arguments of each benchmark case, i.e. the optimizer configurations of the
+competition in COMPETITION or of a variant of tranquilo in TRANQUILO_VARIANTS, are
+built by get_benchmark_kwargs. All cases therefore share the tasks below, as well as the
+checkpoints and the history logs with the global scheduler, see scheduler.py.
+
+"""
+import pytask
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set_fingerprint
+from tranquilo_dev.benchmarks.progress import ProgressLog
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.config import BENCHMARK_CASES
+from tranquilo_dev.config import BLD
+from tranquilo_dev.config import OPTIONS
+from tranquilo_dev.config import PROGRESS_LOG
+
+
+OUT = BLD / "benchmarks"
+CHECKPOINTS = OUT / "checkpoints"
+PIECES = OUT / "pieces"
+RUNTIMES = OUT / "runtimes.json"
+
+# With the global scheduler, a single task runs all benchmark cases on one process pool.
+# Otherwise, each benchmark case gets its own tasks below.
+if OPTIONS.GLOBAL_SCHEDULER:
+
+    products = {
+        f"{problem_name}_{scenario_name}": OUT / f"{problem_name}_{scenario_name}.arrow"
+        for problem_name, scenario_name in BENCHMARK_CASES
+    }
+
+    # The runtimes of the problems are read to order the jobs of the next run.
+    @pytask.mark.produces({"results": products, "runtimes": RUNTIMES})
+    def task_run_benchmarks_on_global_scheduler(produces, cases=BENCHMARK_CASES):
+        from tranquilo_dev.benchmarks.scheduler import run_benchmark_cases
+
+        run_benchmark_cases(
+            cases=cases,
+            paths=produces["results"],
+            checkpoint_dir=CHECKPOINTS,
+            runtimes_path=produces["runtimes"],
+            progress_path=PROGRESS_LOG,
+        )
+
+
+CASES = [] if OPTIONS.GLOBAL_SCHEDULER else BENCHMARK_CASES
+
+for problem_name, scenario_name in CASES:
+
+    name = f"{problem_name}_{scenario_name}"
+    benchmark_kwargs = get_benchmark_kwargs(problem_name, scenario_name)
+
+    # The runner, estimagic and the problems are only loaded when the tasks run, except
+    # for the problem names that the fine-grained tasks need during the collection.
+    if OPTIONS.FINE_GRAINED_TASKS:
+
+        problems = get_problem_set(problem_name)
+
+        pieces = {}
+        for benchmark_problem in problems:
+            pieces[benchmark_problem] = PIECES / name / f"{benchmark_problem}.arrow"
+
+            @pytask.mark.produces(pieces[benchmark_problem])
+            @pytask.mark.task(id=f"{name}-{benchmark_problem}")
+            def task_run_benchmark_problem(
+                produces,
+                benchmark_problem=benchmark_problem,
+                problem=problems[benchmark_problem],
+                benchmark_kwargs=benchmark_kwargs,
+                progress=ProgressLog(PROGRESS_LOG, name),
+            ):
+                from tranquilo_dev.benchmarks.runner import run_single_problem
+
+                run_single_problem(
+                    problem_name=benchmark_problem,
+                    problem=problem,
+                    path=produces,
+                    progress=progress,
+                    **benchmark_kwargs,
+                )
+
+        @pytask.mark.depends_on(pieces)
+        @pytask.mark.produces(OUT / f"{name}.arrow")
+        @pytask.mark.task(id=name)
+        def task_merge_benchmark(depends_on, produces):
+            from tranquilo_dev.benchmarks.result_store import LazyBenchmarkResults
+            from tranquilo_dev.benchmarks.result_store import write_benchmark_results
+
+            results = LazyBenchmarkResults(depends_on.values())
+            write_benchmark_results(results, produces)
+
+    else:
+
+        @pytask.mark.produces(OUT / f"{name}.arrow")
+        @pytask.mark.task(id=name)
+        def task_run_benchmark(
+            produces,
+            problem_name=problem_name,
+            benchmark_kwargs=benchmark_kwargs,
+            progress=ProgressLog(PROGRESS_LOG, name),
+            checkpoint_dir=CHECKPOINTS / name,
+        ):
+            from tranquilo_dev.benchmarks.result_store import write_benchmark_results
+            from tranquilo_dev.benchmarks.runner import run_benchmark_with_checkpoints
+
+            res = run_benchmark_with_checkpoints(
+                problems=get_problem_set(problem_name),
+                problems_fingerprint=get_problem_set_fingerprint(problem_name),
+                checkpoint_dir=checkpoint_dir,
+                progress=progress,
+                **benchmark_kwargs,
+            )
+
+            write_benchmark_results(res, produces)
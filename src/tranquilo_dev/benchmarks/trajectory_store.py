@@ -0,0 +1,145 @@
+"""Persistent storage of the normalized criterion trajectories of benchmark results.
+
+The benchmark plots only need the normalized criterion values of each (problem,
+algorithm) pair, cut off at the first evaluation that solves the problem. These
+trajectories are computed once per problem set, scenario, y_tol and runtime measure,
+and are stored in an uncompressed .npz file with the arrays:
+
+- problem (str): Name of the problem of each trajectory.
+- algorithm (str): Name of the algorithm of each trajectory.
+- offsets (int): Start of each trajectory in the concatenated arrays below. The last
+  entry is the total length.
+- runtime (int or float): The runtime measure of each evaluation.
+- criterion_normalized (float): The normalized criterion values.
+- monotone_criterion_normalized (float): The best normalized criterion value so far.
+- first_solve_index (int): Index of the first evaluation with a normalized criterion
+  value of at most y_tol, or -1 if the problem was not solved.
+
+"""
+import numpy as np
+from tranquilo_dev.benchmarks.analytics import process_benchmark_results
+
+
+TRAJECTORY_COLUMNS = ("criterion_normalized", "monotone_criterion_normalized")
+
+# The precision with which the curve functions cut off the histories by default
+DEFAULT_Y_TOL = {
+    "profile_plot": 1e-4,
+    "deviation_plot": 1e-6,
+    "convergence_plot": 1e-4,
+}
+
+
+def split_plot_kwargs(plot_type, plot_kwargs):
+    """Split the plot options into the trajectory options and the curve options.
+
+    Args:
+        plot_type (str): "profile_plot", "deviation_plot" or "convergence_plot".
+        plot_kwargs (dict): Keyword arguments of the plot, e.g. from PLOT_CONFIG.
+
+    Returns:
+        tuple: The y_tol, the runtime measure and the remaining keyword arguments for
+            the curve functions that work on processed histories.
+
+    """
+    curve_kwargs = dict(plot_kwargs)
+    stopping_criterion = curve_kwargs.pop("stopping_criterion", "y")
+    if stopping_criterion != "y":
+        raise ValueError(
+            "Trajectories only support the stopping criterion 'y'. You specified "
+            f"{stopping_criterion}."
+        )
+    y_tol = curve_kwargs.pop("y_precision", DEFAULT_Y_TOL[plot_type])
+    runtime_measure = curve_kwargs.get("runtime_measure", "n_evaluations")
+    return y_tol, runtime_measure, curve_kwargs
+
+
+def get_trajectory_file_name(y_tol, runtime_measure):
+    return f"{runtime_measure}_y_tol_{y_tol:g}.npz"
+
+
+def compute_trajectories(problems, results, y_tol, runtime_measure):
+    """Compute the normalized criterion trajectories of benchmark results.
+
+    Args:
+        problems (dict): Dictionary of benchmark problems.
+        results (dict): Benchmark results. Keys are tuples of the form (problem,
+            algorithm).
+        y_tol (float): Precision for the normalized criterion value.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+
+    Returns:
+        dict: Processed histories in the format of process_benchmark_results, which
+            only contain the runtime measure and the normalized criterion values.
+
+    """
+    processed = process_benchmark_results(
+        problems, results, stopping_criterion="y", y_precision=y_tol
+    )
+    return {
+        key: (
+            {name: history[name] for name in (runtime_measure, *TRAJECTORY_COLUMNS)},
+            is_converged,
+        )
+        for key, (history, is_converged) in processed.items()
+    }
+
+
+def write_trajectories(trajectories, path, runtime_measure):
+    """Write trajectories to an .npz file.
+
+    Args:
+        trajectories (dict): Trajectories as returned by compute_trajectories.
+        path (str or pathlib.Path): Path of the .npz file.
+        runtime_measure (str): "n_evaluations", "n_batches" or "walltime".
+
+    """
+    histories = [history for history, _ in trajectories.values()]
+    lengths = [len(history[runtime_measure]) for history in histories]
+    first_solve_index = [
+        length - 1 if is_converged else -1
+        for length, (_, is_converged) in zip(lengths, trajectories.values())
+    ]
+    arrays = {
+        "problem": np.array([problem for problem, _ in trajectories], dtype=str),
+        "algorithm": np.array([algo for _, algo in trajectories], dtype=str),
+        "offsets": np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64),
+        "runtime": _concatenate([h[runtime_measure] for h in histories]),
+        "first_solve_index": np.array(first_solve_index, dtype=np.int64),
+    }
+    for name in TRAJECTORY_COLUMNS:
+        arrays[name] = _concatenate([h[name] for h in histories])
+
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+
+
+def read_trajectories(paths, runtime_measure):
+    """Read trajectories from one or more .npz files.
+
+    Args:
+        paths (list): Paths of the .npz files.
+        runtime_measure (str): The runtime measure of the trajectories.
+
+    Returns:
+        dict: Processed histories in the format of process_benchmark_results.
+
+    """
+    out = {}
+    for path in paths:
+        with np.load(path) as data:
+            arrays = {name: data[name] for name in data.files}
+
+        offsets = arrays["offsets"]
+        for i, key in enumerate(zip(arrays["problem"], arrays["algorithm"])):
+            rows = slice(offsets[i], offsets[i + 1])
+            history = {runtime_measure: arrays["runtime"][rows]}
+            for name in TRAJECTORY_COLUMNS:
+                history[name] = arrays[name][rows]
+            is_converged = bool(arrays["first_solve_index"][i] >= 0)
+            out[tuple(map(str, key))] = (history, is_converged)
+    return out
+
+
+def _concatenate(arrays):
+    return np.concatenate(arrays) if arrays else np.array([])
@@ -10,12 +10,29 @@ COMPETITION: This is a dictionary that defines the optimizer configurations agai
 which we want to compare tranquilo. The keys are the names of the optimizer
 configurations, the values are dictionaries with keyword arguments for the minimization.
 
+TRANQUILO_VARIANTS: This is a dictionary that defines the variants of tranquilo. The
+scenario of a variant is called "{algorithm}_{variant}", where algorithm is "tranquilo"
+or "tranquilo_ls". The values are updates of the algo_options of
+TRANQUILO_BASE_OPTIONS.
+
 PLOT_CONFIG: This is a dictionary that defines which problem-optimizer combinations are
 plotted against each other. Only combinations that are used in some plot will actually
 run.
 
+BENCHMARK_CASES: This is a list of the (problem set, scenario) pairs that are run.
+Pairs whose scenario has the same options as another scenario on the same problem set
+are not run. They are keys of BENCHMARK_ALIASES and reuse the results of the other pair.
+
+PLOT_CONFIG, BENCHMARK_CASES and the other lists of cases are built when they are first
+accessed, such that importing this module stays cheap.
+
 """
-import socket
+
+import hashlib
+import json
+import math
+import os
+from functools import lru_cache
 from pathlib import Path
 from typing import NamedTuple
 
@@ -26,6 +43,8 @@ SRC = Path(__file__).parent.resolve()
 ROOT = SRC.joinpath("..", "..").resolve()
 BLD = ROOT.joinpath("bld").resolve()
 PUBLIC = BLD.joinpath("public").resolve()
+PROBLEM_CACHE = BLD.joinpath("problem_cache").resolve()
+PROGRESS_LOG = BLD.joinpath("benchmarks", "progress.jsonl").resolve()
 
 
 # ======================================================================================
@@ -37,6 +56,9 @@ class ProjectOptions(NamedTuple):
     The options are:
         - RUN_DETERMINISTIC (bool): Whether to run the deterministic benchmarks.
         - RUN_NOISY (bool): Whether to run the noisy benchmarks.
+        - RUN_EXPENSIVE (bool): Whether to run the benchmarks with a synthetic cost per
+        criterion evaluation, which measure the wall time speedup of evaluating batches
+        on several cores. See EXPENSIVE_CRITERION_COST.
 
         - RUN_PUBLICATION_CASES (bool): Whether to run the benchmarks required for the
         publication figures.
@@ -45,6 +67,13 @@ class ProjectOptions(NamedTuple):
 
         - DETERMINISTIC_Y_TOL (float): The tolerance for the deterministic benchmarks.
         - NOISY_Y_TOL (float): The tolerance for the noisy benchmarks.
+        - COMMON_RANDOM_NUMBERS (bool): Whether the noise of the noisy problem sets is
+        a deterministic function of the problem, the parameters and the number of
+        previous evaluations at these parameters, such that all scenarios see the same
+        noise. Otherwise, the noise is drawn by estimagic in evaluation order.
+        - N_NOISE_REPLICATIONS (int): Number of independent noise replications of the
+        noisy problem sets. The replications are run as additional problems, and the
+        profile and deviation plots show confidence bands across them.
 
         - PLOT_TYPES (tuple): The plot types that are being created. Must be an iterable
         with entries from {"profile_plot", "convergence_plot", "deviation_plot"}.
@@ -52,6 +81,29 @@ class ProjectOptions(NamedTuple):
         - PROBLEM_SETS (tuple): The problem sets that are being used. Must be an
         iterable with entries from {"more_wild", "cartis_roberts"}.
 
+        - FINE_GRAINED_TASKS (bool): Whether to create one benchmark task per problem
+        and scenario, plus a task that merges the results of a scenario. Otherwise, one
+        task runs all problems of a scenario.
+        - GLOBAL_SCHEDULER (bool): Whether to run all benchmark cases in a single task
+        that distributes the problems of all cases over one process pool. Takes
+        precedence over FINE_GRAINED_TASKS.
+
+        - BATCH_RENDERING (bool): Whether to render all benchmark figures of a plot type
+        in a single task. Otherwise, one task renders each figure.
+
+        - PROFILE_OVERHEAD (bool): Whether to create a table per tranquilo benchmark
+        case that splits the wall time into the time spent in the criterion and the
+        overhead of the optimizer, i.e. sampling, model fitting, the subsolver and the
+        rest, and a summary table over all cases.
+
+        - N_CORES (int): Number of cores that are used. If None, the number of cores is
+        detected automatically, see get_available_cores.
+        - SAMPLING_N_CORES (int): Number of cores over which the sampling of new start
+        vectors of a problem set is distributed. If None, all cores of the project are
+        used, see N_CORES. The sampled start vectors are cached, see PROBLEM_CACHE. The
+        benchmark runners build the problem sets before they start their workers, hence
+        the workers only read the cache.
+
     """
 
     # Do not alter the default values of this class for development purposes. Instead
@@ -59,29 +111,99 @@ class ProjectOptions(NamedTuple):
 
     RUN_DETERMINISTIC: bool = True
     RUN_NOISY: bool = True
+    RUN_EXPENSIVE: bool = False
 
     RUN_PUBLICATION_CASES: bool = True
     RUN_DEVELOPMENT_CASES: bool = True
 
     DETERMINISTIC_Y_TOL: float = 1e-3
     NOISY_Y_TOL: float = 0.01
+    COMMON_RANDOM_NUMBERS: bool = False
+    N_NOISE_REPLICATIONS: int = 1
 
     PLOT_TYPES: tuple[str] = ("profile_plot", "convergence_plot", "deviation_plot")
     PROBLEM_SETS: tuple[str] = ("more_wild", "cartis_roberts")
 
-    N_CORES_DEFAULT: int = 1
+    FINE_GRAINED_TASKS: bool = False
+    GLOBAL_SCHEDULER: bool = False
+
+    BATCH_RENDERING: bool = False
+
+    PROFILE_OVERHEAD: bool = False
+
+    N_CORES: int | None = None
+    SAMPLING_N_CORES: int | None = None
 
     @property
     def n_cores(self):
-        """Set the number of cores depending on the hostname."""
-        hostnames_to_requested_cores = {
-            # Tim's thinkpad
-            "thinky": 16,
-            # Janos' thinkpad
-            "IZA-LAP479": 10,
-        }
-        hostname = socket.gethostname()
-        return hostnames_to_requested_cores.get(hostname, self.N_CORES_DEFAULT)
+        """Number of cores that are available to the project."""
+        return self.get_n_cores()
+
+    @property
+    def sampling_n_cores(self):
+        """Number of cores over which new start vectors are sampled."""
+        return self.n_cores if self.SAMPLING_N_CORES is None else self.SAMPLING_N_CORES
+
+    def get_n_cores(self, cores_per_optimization=1):
+        """Get the number of optimizations that can run in parallel.
+
+        Args:
+            cores_per_optimization (int): Number of cores that a single optimization
+                occupies, e.g. the number of cores tranquilo uses to evaluate a batch.
+
+        Returns:
+            int: Number of parallel optimizations, which is at least 1.
+
+        """
+        n_cores = get_available_cores() if self.N_CORES is None else self.N_CORES
+        return max(1, n_cores // max(1, cores_per_optimization))
+
+
+def get_available_cores():
+    """Detect the number of cores that the project can use.
+
+    The environment variable TRANQUILO_DEV_N_CORES takes precedence. Otherwise, the
+    number of cores is the minimum of the cores that the process is allowed to run on
+    and the CPU quota of its cgroup, e.g. inside a container or a batch job.
+
+    Returns:
+        int: Number of available cores, which is at least 1.
+
+    """
+    env = os.environ.get("TRANQUILO_DEV_N_CORES")
+    if env:
+        return max(1, int(env))
+
+    try:
+        n_cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        # sched_getaffinity is not available on macOS and Windows
+        n_cores = os.cpu_count() or 1
+
+    quota = _get_cgroup_cpu_quota()
+    if quota is not None:
+        n_cores = min(n_cores, max(1, math.floor(quota)))
+    return max(1, n_cores)
+
+
+def _get_cgroup_cpu_quota(root=Path("/sys/fs/cgroup")):
+    """Read the CPU quota of the cgroup in cores, or None if there is no quota."""
+    # cgroup v2: "{quota} {period}" or "max {period}"
+    try:
+        quota, period = (root / "cpu.max").read_text().split()
+        return None if quota == "max" else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    # cgroup v1: the cpu controller is mounted as "cpu" or together with the cpuacct
+    # controller as "cpu,cpuacct". A quota of -1 means that there is no quota.
+    for controller in ("cpu", "cpu,cpuacct"):
+        try:
+            quota = int((root / controller / "cpu.cfs_quota_us").read_text())
+            period = int((root / controller / "cpu.cfs_period_us").read_text())
+        except (OSError, ValueError):
+            continue
+        return None if quota <= 0 or period <= 0 else quota / period
+    return None
 
 
 # Set development options HERE and not in the class above
@@ -111,6 +233,42 @@ TRANQUILO_BASE_OPTIONS = {
     },
 }
 
+# Updates of the algo_options of the experimental tranquilo scenarios, which are used to
+# compare changes of tranquilo against the default. As long as there are no updates,
+# the experimental scenarios are aliases of the default scenarios and are not run.
+TRANQUILO_EXPERIMENTAL_OPTIONS = {}
+
+TRANQUILO_BATCH_SIZES = [2, 4, 8]
+
+
+def _get_parallel_options(batch_size):
+    return {"acceptance_decider": "classic_line_search", "batch_size": batch_size}
+
+
+TRANQUILO_VARIANTS = {
+    "default": {},
+    "experimental": TRANQUILO_EXPERIMENTAL_OPTIONS,
+    **{
+        f"parallel_{batch_size}": _get_parallel_options(batch_size)
+        for batch_size in TRANQUILO_BATCH_SIZES
+    },
+    **{
+        f"experimental_parallel_{batch_size}": {
+            **TRANQUILO_EXPERIMENTAL_OPTIONS,
+            **_get_parallel_options(batch_size),
+        }
+        for batch_size in TRANQUILO_BATCH_SIZES
+    },
+    # Multicore variants evaluate each batch on batch_size cores
+    **{
+        f"multicore_parallel_{batch_size}": {
+            **_get_parallel_options(batch_size),
+            "n_cores": batch_size,
+        }
+        for batch_size in TRANQUILO_BATCH_SIZES
+    },
+}
+
 
 def get_benchmark_problem_info(problem_set):
     info = {
@@ -132,6 +290,12 @@ def get_benchmark_problem_info(problem_set):
         out = info["more_wild"]
     elif "cr" in problem_set:
         out = info["cartis_roberts"]
+
+    out = {**out, "common_random_numbers": OPTIONS.COMMON_RANDOM_NUMBERS}
+    if "noisy" in problem_set:
+        out = {**out, "n_replications": OPTIONS.N_NOISE_REPLICATIONS}
+    if problem_set.endswith("_expensive"):
+        out = {**out, "criterion_cost": EXPENSIVE_CRITERION_COST}
     return out
 
 
@@ -169,6 +333,10 @@ PROBLEM_SETS = {
         "additive_noise_options": {"distribution": "normal", "std": 1.2},
         "seed": 925408,
     },
+    "mw_expensive": {
+        "name": "more_wild",
+        "exclude": ["brown_almost_linear_medium"],
+    },
     "cr": {
         "name": "cartis_roberts",
         "exclude": _exlude_from_cartis_roberts,
@@ -182,6 +350,11 @@ PROBLEM_SETS = {
     },
 }
 
+# Synthetic cost of each criterion evaluation of the expensive problem sets, see
+# CriterionCost in benchmarks/expensive_criterion.py. Sleeping does not occupy a core,
+# such that the speedup of parallel batches can also be measured on small machines.
+EXPENSIVE_CRITERION_COST = {"seconds": 0.01, "mode": "sleep"}
+
 # ======================================================================================
 # Define competition. These are the optimizers against which tranquilo is compared.
 # ======================================================================================
@@ -275,7 +448,6 @@ _deterministic_plots = {
                 "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
         "ls_benchmark": {
             "scenarios": [
@@ -287,7 +459,6 @@ _deterministic_plots = {
                 "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
         "parallel_benchmark": {
             "scenarios": [
@@ -304,9 +475,27 @@ _deterministic_plots = {
                 "normalize_runtime": True,
                 "runtime_measure": "n_batches",
             },
-            "convergence_plot_options": {"n_cols": 6, "runtime_measure": "n_batches"},
+            "convergence_plot_options": {"runtime_measure": "n_batches"},
             "deviation_plot_options": {"runtime_measure": "n_batches"},
         },
+        "parallel_walltime_benchmark": {
+            "scenarios": [
+                "tranquilo_ls_parallel_2",
+                "tranquilo_ls_parallel_4",
+                "tranquilo_ls_parallel_8",
+                "tranquilo_ls_experimental_parallel_2",
+                "tranquilo_ls_experimental_parallel_4",
+                "tranquilo_ls_experimental_parallel_8",
+                "dfols",
+            ],
+            "profile_plot_options": {
+                "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
+                "normalize_runtime": True,
+                "runtime_measure": "walltime",
+            },
+            "convergence_plot_options": {"runtime_measure": "walltime"},
+            "deviation_plot_options": {"runtime_measure": "walltime"},
+        },
     },
     # Publication / Presentation cases
     # ==================================================================================
@@ -323,7 +512,6 @@ _deterministic_plots = {
                 "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
         "ls_benchmark": {
             "scenarios": [
@@ -335,7 +523,6 @@ _deterministic_plots = {
                 "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
         "parallel_benchmark": {
             "scenarios": [
@@ -350,9 +537,25 @@ _deterministic_plots = {
                 "normalize_runtime": True,
                 "runtime_measure": "n_batches",
             },
-            "convergence_plot_options": {"n_cols": 6, "runtime_measure": "n_batches"},
+            "convergence_plot_options": {"runtime_measure": "n_batches"},
             "deviation_plot_options": {"runtime_measure": "n_batches"},
         },
+        "parallel_walltime_benchmark": {
+            "scenarios": [
+                "tranquilo_ls_default",
+                "tranquilo_ls_parallel_2",
+                "tranquilo_ls_parallel_4",
+                "tranquilo_ls_parallel_8",
+                "dfols",
+            ],
+            "profile_plot_options": {
+                "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
+                "normalize_runtime": True,
+                "runtime_measure": "walltime",
+            },
+            "convergence_plot_options": {"runtime_measure": "walltime"},
+            "deviation_plot_options": {"runtime_measure": "walltime"},
+        },
         "scalar_vs_ls_benchmark": {
             "scenarios": [
                 "dfols",
@@ -366,7 +569,6 @@ _deterministic_plots = {
                 "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
     },
 }
@@ -387,7 +589,6 @@ _noisy_plots = {
                 "y_precision": OPTIONS.NOISY_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
         },
     },
     # Publication / Presentation cases
@@ -404,7 +605,31 @@ _noisy_plots = {
                 "y_precision": OPTIONS.NOISY_Y_TOL,
                 "normalize_runtime": True,
             },
-            "convergence_plot_options": {"n_cols": 6},
+        },
+    },
+}
+
+# Benchmarks on problems with a synthetic cost per criterion evaluation. The
+# "multicore_parallel" scenarios evaluate each batch on as many cores as the batch size.
+_expensive_plots = {
+    # Development / Experimental cases
+    # ==================================================================================
+    "development": {
+        "expensive_benchmark": {
+            "scenarios": [
+                "tranquilo_ls_default",
+                "tranquilo_ls_multicore_parallel_2",
+                "tranquilo_ls_multicore_parallel_4",
+                "tranquilo_ls_multicore_parallel_8",
+                "dfols",
+            ],
+            "profile_plot_options": {
+                "y_precision": OPTIONS.DETERMINISTIC_Y_TOL,
+                "normalize_runtime": True,
+                "runtime_measure": "walltime",
+            },
+            "convergence_plot_options": {"runtime_measure": "walltime"},
+            "deviation_plot_options": {"runtime_measure": "walltime"},
         },
     },
 }
@@ -421,6 +646,7 @@ def _add_problem_name_to_configs(plot_config, problem_name, development_or_publi
     - "development_scalar_benchmark_mw"
     - "publication_ls_benchmark_mw"
     - "development_scalar_benchmark_mw_noisy"
+    - "development_expensive_benchmark_mw_expensive"
     - ...
 
     """
@@ -442,53 +668,169 @@ def _get_problem_name(problem_set, noisy):
 
 # Collect all plots that we actually want to run
 # ======================================================================================
-PLOT_CONFIG = {}
+@lru_cache(maxsize=None)
+def get_plot_config():
+    """Get the configurations of all plots that are created, see PLOT_CONFIG."""
+    plot_config = {}
+    for problem_set in OPTIONS.PROBLEM_SETS:
+
+        if OPTIONS.RUN_DETERMINISTIC:
+
+            if OPTIONS.RUN_PUBLICATION_CASES:
+                updated = _add_problem_name_to_configs(
+                    _deterministic_plots["publication"],
+                    problem_name=_get_problem_name(problem_set, noisy=False),
+                    development_or_publication="publication",
+                )
+                plot_config.update(updated)
+
+            if OPTIONS.RUN_DEVELOPMENT_CASES:
+                updated = _add_problem_name_to_configs(
+                    _deterministic_plots["development"],
+                    problem_name=_get_problem_name(problem_set, noisy=False),
+                    development_or_publication="development",
+                )
+                plot_config.update(updated)
+
+        if OPTIONS.RUN_NOISY:
+
+            if OPTIONS.RUN_PUBLICATION_CASES:
+                updated = _add_problem_name_to_configs(
+                    _noisy_plots["publication"],
+                    problem_name=_get_problem_name(problem_set, noisy=True),
+                    development_or_publication="publication",
+                )
+                plot_config.update(updated)
+
+            if OPTIONS.RUN_DEVELOPMENT_CASES:
+                updated = _add_problem_name_to_configs(
+                    _noisy_plots["development"],
+                    problem_name=_get_problem_name(problem_set, noisy=True),
+                    development_or_publication="development",
+                )
+                plot_config.update(updated)
+
+        expensive_name = f"{_get_problem_name(problem_set, noisy=False)}_expensive"
+        if OPTIONS.RUN_EXPENSIVE and expensive_name in PROBLEM_SETS:
+
+            if OPTIONS.RUN_DEVELOPMENT_CASES:
+                updated = _add_problem_name_to_configs(
+                    _expensive_plots["development"],
+                    problem_name=expensive_name,
+                    development_or_publication="development",
+                )
+                plot_config.update(updated)
+
+    return plot_config
 
-for problem_set in OPTIONS.PROBLEM_SETS:
 
-    if OPTIONS.RUN_DETERMINISTIC:
+# ======================================================================================
+# Benchmark cases
+# --------------------------------------------------------------------------------------
+# A benchmark case is a tuple of the form (problem_name, scenario_name). Scenarios with
+# identical keyword arguments for em.run_benchmark, e.g. "dfols_noisy_3" and
+# "nag_bobyqa_noisy_3", are only run once per problem set. BENCHMARK_CASES contains the
+# cases that are run, and BENCHMARK_ALIASES maps the other cases to the case whose
+# results are stored under their name.
+# ======================================================================================
+def serialize_callable(obj):
+    """Serialize objects that are not JSON serializable.
+
+    Functions, e.g. noise_n_evals_per_point, are identified by their import path, since
+    their repr contains a memory address that changes between runs.
+
+    """
+    if callable(obj):
+        return f"{obj.__module__}.{obj.__qualname__}"
+    return repr(obj)
+
+
+def canonicalize_benchmark_kwargs(benchmark_kwargs):
+    """Get a canonical representation of the keyword arguments of a benchmark case.
+
+    The names of the optimizer configurations are dropped, such that scenarios that
+    only differ in their name have the same representation.
+
+    Args:
+        benchmark_kwargs (dict): Keyword arguments for em.run_benchmark, see
+            get_benchmark_kwargs in benchmarks/scenarios.py.
+
+    Returns:
+        str: JSON string with sorted keys.
+
+    """
+    canonical = {
+        **benchmark_kwargs,
+        "optimize_options": list(benchmark_kwargs["optimize_options"].values()),
+    }
+    return json.dumps(canonical, sort_keys=True, default=serialize_callable)
 
-        if OPTIONS.RUN_PUBLICATION_CASES:
-            _updated_configs = _add_problem_name_to_configs(
-                _deterministic_plots["publication"],
-                problem_name=_get_problem_name(problem_set, noisy=False),
-                development_or_publication="publication",
-            )
-            PLOT_CONFIG.update(_updated_configs)
 
-        if OPTIONS.RUN_DEVELOPMENT_CASES:
-            _updated_configs = _add_problem_name_to_configs(
-                _deterministic_plots["development"],
-                problem_name=_get_problem_name(problem_set, noisy=False),
-                development_or_publication="development",
-            )
-            PLOT_CONFIG.update(_updated_configs)
+def get_benchmark_kwargs_hash(benchmark_kwargs):
+    canonical = canonicalize_benchmark_kwargs(benchmark_kwargs)
+    return hashlib.sha256(canonical.encode()).hexdigest()[:16]
 
-    if OPTIONS.RUN_NOISY:
 
-        if OPTIONS.RUN_PUBLICATION_CASES:
-            _updated_configs = _add_problem_name_to_configs(
-                _noisy_plots["publication"],
-                problem_name=_get_problem_name(problem_set, noisy=True),
-                development_or_publication="publication",
-            )
-            PLOT_CONFIG.update(_updated_configs)
+def _get_runs_of_cases(cases):
+    """Map each benchmark case to the first case with identical benchmark kwargs."""
+    # scenarios.py builds the keyword arguments from the options of this module
+    from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
 
-        if OPTIONS.RUN_DEVELOPMENT_CASES:
-            _updated_configs = _add_problem_name_to_configs(
-                _noisy_plots["development"],
-                problem_name=_get_problem_name(problem_set, noisy=True),
-                development_or_publication="development",
-            )
-            PLOT_CONFIG.update(_updated_configs)
+    runs = {}
+    out = {}
+    for problem_name, scenario_name in cases:
+        kwargs = get_benchmark_kwargs(problem_name, scenario_name)
+        key = (problem_name, get_benchmark_kwargs_hash(kwargs))
+        out[(problem_name, scenario_name)] = runs.setdefault(
+            key, (problem_name, scenario_name)
+        )
+    return out
+
+
+@lru_cache(maxsize=None)
+def get_benchmark_cases():
+    """Get the benchmark cases that are run and the aliases of the other cases.
+
+    Returns:
+        dict: Keys are "BENCHMARK_CASES", "BENCHMARK_ALIASES" and "TRANQUILO_CASES".
 
+    """
+    plotted_cases = {}
+    for info in get_plot_config().values():
+        for scenario in info["scenarios"]:
+            plotted_cases[(info["problem_name"], scenario)] = None
+
+    runs_of_cases = _get_runs_of_cases(plotted_cases)
+    cases = [case for case, run in runs_of_cases.items() if case == run]
+    return {
+        "BENCHMARK_CASES": cases,
+        "BENCHMARK_ALIASES": {
+            case: run for case, run in runs_of_cases.items() if case != run
+        },
+        "TRANQUILO_CASES": [case for case in cases if "tranquilo" in case[1]],
+    }
+
+
+# ======================================================================================
+# Lazy attributes
+# --------------------------------------------------------------------------------------
+# This module is imported by every task module. The plot configuration and the benchmark
+# cases are only built when they are first accessed, and then cached.
+# ======================================================================================
+_BENCHMARK_CASE_ATTRIBUTES = (
+    "BENCHMARK_CASES",
+    "BENCHMARK_ALIASES",
+    "TRANQUILO_CASES",
+)
 
-BENCHMARK_CASES = []
-for info in PLOT_CONFIG.values():
-    for scenario in info["scenarios"]:
-        BENCHMARK_CASES.append((info["problem_name"], scenario))
 
+def __getattr__(name):
+    if name == "PLOT_CONFIG":
+        return get_plot_config()
+    if name in _BENCHMARK_CASE_ATTRIBUTES:
+        return get_benchmark_cases()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-COMPETITION_CASES = [case for case in BENCHMARK_CASES if "tranquilo" not in case[1]]
 
-TRANQUILO_CASES = [case for case in BENCHMARK_CASES if "tranquilo" in case[1]]
+def __dir__():
+    return [*globals(), "PLOT_CONFIG", *_BENCHMARK_CASE_ATTRIBUTES]
@@ -3,6 +3,8 @@
 Most of the plotting behavior can be configured by changing some global dictionaries:
 
 - `AXIS_LABELS`: Contains the axis labels for each plot type.
+- `AXIS_LABEL_UPDATES`: Contains axis labels that differ from `AXIS_LABELS` given each
+  benchmark, e.g. for benchmarks that measure the runtime in seconds.
 - `X_RANGE`: Contains the x-axis range given each benchmark.
 - `COLORS`: Contains the colors for each line given each benchmark.
 - `LINE_WIDTH_UPDATES`: Contains the line width for each line given each benchmark.
@@ -22,6 +24,9 @@ import matplotlib.pyplot as plt
 FIGURE_WIDTH_IN_CM = 14.69785
 FIGURE_HEIGHT_IN_CM = 10.0
 
+# Opacity of the confidence bands across replications of noisy benchmarks
+CONFIDENCE_BAND_ALPHA = 0.2
+
 AXIS_LABELS = {
     "profile_plot": {
         "xlabel": "Computational budget (normalized)",
@@ -37,6 +42,27 @@ AXIS_LABELS = {
     },
 }
 
+AXIS_LABEL_UPDATES = {
+    "parallel_walltime_benchmark": {
+        "profile_plot": {"xlabel": "Wall time (normalized)"},
+        "deviation_plot": {"xlabel": "Wall time (seconds)"},
+        "convergence_plot": {"xlabel": "Wall time (seconds)"},
+    },
+    "expensive_benchmark": {
+        "profile_plot": {"xlabel": "Wall time (normalized)"},
+        "deviation_plot": {"xlabel": "Wall time (seconds)"},
+        "convergence_plot": {"xlabel": "Wall time (seconds)"},
+    },
+}
+
+
+def get_axis_labels(plot_type, plot_name):
+    return {
+        **AXIS_LABELS[plot_type],
+        **AXIS_LABEL_UPDATES.get(plot_name, {}).get(plot_type, {}),
+    }
+
+
 X_RANGE_UPDATES = {
     "profile_plot": {
         "publication": {
@@ -102,6 +128,9 @@ LABELS = {
     "tranquilo_ls_experimental_parallel_2": "Tranquilo-LS (Experimental, 2 cores)",
     "tranquilo_ls_experimental_parallel_4": "Tranquilo-LS (Experimental, 4 cores)",
     "tranquilo_ls_experimental_parallel_8": "Tranquilo-LS (Experimental, 8 cores)",
+    "tranquilo_ls_multicore_parallel_2": "Tranquilo-LS (2 parallel cores)",
+    "tranquilo_ls_multicore_parallel_4": "Tranquilo-LS (4 parallel cores)",
+    "tranquilo_ls_multicore_parallel_8": "Tranquilo-LS (8 parallel cores)",
     # DFO-LS labels
     "dfols": "DFO-LS",
     "dfols_noisy_3": "DFO-LS (3 evals)",
@@ -176,6 +205,13 @@ PARALLEL_COLOR_UPDATES = {
     "Tranquilo-LS (Experimental, 8 cores)": TABLEAU_10_COLORS["pink-30"],
 }
 
+MULTICORE_COLOR_UPDATES = {
+    "Tranquilo-LS": TABLEAU_10_COLORS["blue-75"],
+    "Tranquilo-LS (2 parallel cores)": TABLEAU_10_COLORS["blue-55"],
+    "Tranquilo-LS (4 parallel cores)": TABLEAU_10_COLORS["blue-35"],
+    "Tranquilo-LS (8 parallel cores)": TABLEAU_10_COLORS["blue-15"],
+}
+
 NOISY_COLOR_UPDATES = {
     "DFO-LS (3 evals)": TABLEAU_10_COLORS["green-25"],
     "DFO-LS (5 evals)": TABLEAU_10_COLORS["green-50"],
@@ -188,6 +224,7 @@ COLORS = {
         "scalar_benchmark": BASE_COLORS,
         "ls_benchmark": BASE_COLORS,
         "parallel_benchmark": {**BASE_COLORS, **PARALLEL_COLOR_UPDATES},
+        "parallel_walltime_benchmark": {**BASE_COLORS, **PARALLEL_COLOR_UPDATES},
         "noisy_benchmark": {**BASE_COLORS, **NOISY_COLOR_UPDATES},
         "scalar_vs_ls_benchmark": BASE_COLORS,
     },
@@ -195,8 +232,10 @@ COLORS = {
         "scalar_benchmark": BASE_COLORS,
         "ls_benchmark": BASE_COLORS,
         "parallel_benchmark": {**BASE_COLORS, **PARALLEL_COLOR_UPDATES},
+        "parallel_walltime_benchmark": {**BASE_COLORS, **PARALLEL_COLOR_UPDATES},
         "noisy_benchmark": {**BASE_COLORS, **NOISY_COLOR_UPDATES},
         "noisy_scalar_benchmark": {**BASE_COLORS, **NOISY_COLOR_UPDATES},
+        "expensive_benchmark": {**BASE_COLORS, **MULTICORE_COLOR_UPDATES},
         "scalar_vs_ls_benchmark": BASE_COLORS,
     },
 }
@@ -210,6 +249,11 @@ LINE_WIDTH_UPDATES = {
             "Tranquilo-LS (4 cores)": 1.7,
             "Tranquilo-LS (8 cores)": 1.8,
         },
+        "parallel_walltime_benchmark": {
+            "Tranquilo-LS (2 cores)": 1.6,
+            "Tranquilo-LS (4 cores)": 1.7,
+            "Tranquilo-LS (8 cores)": 1.8,
+        },
         "noisy_benchmark": {
             "DFO-LS (5 evals)": 1.6,
             "DFO-LS (10 evals)": 1.7,
@@ -225,6 +269,16 @@ LINE_WIDTH_UPDATES = {
             "Tranquilo-LS (Experimental, 4 cores)": 1.7,
             "Tranquilo-LS (Experimental, 8 cores)": 1.8,
         },
+        "parallel_walltime_benchmark": {
+            "Tranquilo-LS (Experimental, 2 cores)": 1.6,
+            "Tranquilo-LS (Experimental, 4 cores)": 1.7,
+            "Tranquilo-LS (Experimental, 8 cores)": 1.8,
+        },
+        "expensive_benchmark": {
+            "Tranquilo-LS (2 parallel cores)": 1.6,
+            "Tranquilo-LS (4 parallel cores)": 1.7,
+            "Tranquilo-LS (8 parallel cores)": 1.8,
+        },
     },
 }
 
@@ -261,6 +315,13 @@ LEGEND_LABEL_ORDER = {
             "DFO-LS",
             "Tranquilo-LS",
         ],
+        "parallel_walltime_benchmark": [
+            "Tranquilo-LS (2 cores)",
+            "Tranquilo-LS (4 cores)",
+            "Tranquilo-LS (8 cores)",
+            "DFO-LS",
+            "Tranquilo-LS",
+        ],
         "noisy_benchmark": [
             "DFO-LS (3 evals)",
             "DFO-LS (5 evals)",
@@ -296,6 +357,15 @@ LEGEND_LABEL_ORDER = {
             "Tranquilo-LS (Experimental, 8 cores)",
             "DFO-LS",
         ],
+        "parallel_walltime_benchmark": [
+            "Tranquilo-LS (2 cores)",
+            "Tranquilo-LS (4 cores)",
+            "Tranquilo-LS (8 cores)",
+            "Tranquilo-LS (Experimental, 2 cores)",
+            "Tranquilo-LS (Experimental, 4 cores)",
+            "Tranquilo-LS (Experimental, 8 cores)",
+            "DFO-LS",
+        ],
         "noisy_benchmark": [
             "DFO-LS (3 evals)",
             "DFO-LS (5 evals)",
@@ -303,6 +373,13 @@ LEGEND_LABEL_ORDER = {
             "Tranquilo-LS",
             "Tranquilo-LS (Experimental)",
         ],
+        "expensive_benchmark": [
+            "Tranquilo-LS (2 parallel cores)",
+            "Tranquilo-LS (4 parallel cores)",
+            "Tranquilo-LS (8 parallel cores)",
+            "DFO-LS",
+            "Tranquilo-LS",
+        ],
     },
 }
 
@@ -319,15 +396,18 @@ matplotlib.rcParams["font.family"] = "sans-serif"
 # ======================================================================================
 
 
-def plot_benchmark(data, plot_type, benchmark):
+def plot_benchmark(data, plot_type, benchmark, fig=None):
     """Create the base matplotlib figure.
 
     Args:
         data (dict): Dictionary containing the data to plot. Keys represent a single
-            line in the plot. The values are dictionaries with keys "x" and "y".
+            line in the plot. The values are dictionaries with keys "x" and "y", and
+            optionally "lower" and "upper", which are drawn as a confidence band.
         plot_type (str): Name of the plot to create. Must be in {"deviation_plot",
             "profile_plot", "convergence_plot"}.
         benchmark (str): Name of the benchmark.
+        fig (matplotlib.figure.Figure): A figure that is cleared and reused, e.g. when
+            many figures are rendered in a row. If None, a new figure is created.
 
     Returns:
         matplotlib.figure.Figure: The matplotlib figure.
@@ -347,9 +427,13 @@ def plot_benchmark(data, plot_type, benchmark):
     data = {LABELS[name]: line for name, line in data.items()}
 
     # Create matplotlib base figure
-    fig, ax = plt.subplots(
-        figsize=(_cm_to_inch(FIGURE_WIDTH_IN_CM), _cm_to_inch(FIGURE_HEIGHT_IN_CM))
-    )
+    figsize = (_cm_to_inch(FIGURE_WIDTH_IN_CM), _cm_to_inch(FIGURE_HEIGHT_IN_CM))
+    if fig is None:
+        fig, ax = plt.subplots(figsize=figsize)
+    else:
+        fig.clf()
+        fig.set_size_inches(figsize)
+        ax = fig.add_subplot()
     for algo_name, line in data.items():
 
         lw = get_linewidth(
@@ -365,6 +449,15 @@ def plot_benchmark(data, plot_type, benchmark):
             color=COLORS[dev_or_pub][plot_name][algo_name],
             linewidth=lw,
         )
+        if "lower" in line:
+            ax.fill_between(
+                line["x"],
+                line["lower"],
+                line["upper"],
+                color=COLORS[dev_or_pub][plot_name][algo_name],
+                alpha=CONFIDENCE_BAND_ALPHA,
+                linewidth=0,
+            )
 
     # Remove top and right border (spine)
     ax.spines[["right", "top"]].set_visible(False)
@@ -388,8 +481,9 @@ def plot_benchmark(data, plot_type, benchmark):
     )
 
     # Update axes
-    ax.set_xlabel(AXIS_LABELS[plot_type]["xlabel"], color=DARK_GRAY)
-    ax.set_ylabel(AXIS_LABELS[plot_type]["ylabel"], color=DARK_GRAY)
+    axis_labels = get_axis_labels(plot_type, plot_name)
+    ax.set_xlabel(axis_labels["xlabel"], color=DARK_GRAY)
+    ax.set_ylabel(axis_labels["ylabel"], color=DARK_GRAY)
     ax.xaxis.label.set_color(DARK_GRAY)
     ax.yaxis.label.set_color(DARK_GRAY)
     ax.set_xlim(*x_range)
@@ -399,6 +493,38 @@ def plot_benchmark(data, plot_type, benchmark):
     return fig
 
 
+def get_styling(plot_type, benchmark):
+    """Collect the styling options that determine the look of a figure.
+
+    Args:
+        plot_type (str): Name of the plot. Must be in {"deviation_plot",
+            "profile_plot", "convergence_plot"}.
+        benchmark (str): Name of the benchmark.
+
+    Returns:
+        dict: JSON serializable styling options of the figure.
+
+    """
+    dev_or_pub, problem_name, plot_name = _split_benchmark_id_in_components(benchmark)
+    return {
+        "figure_size": [FIGURE_WIDTH_IN_CM, FIGURE_HEIGHT_IN_CM],
+        "confidence_band_alpha": CONFIDENCE_BAND_ALPHA,
+        "axis_labels": get_axis_labels(plot_type, plot_name),
+        "labels": LABELS,
+        "colors": COLORS[dev_or_pub].get(plot_name, {}),
+        "line_widths": LINE_WIDTH_UPDATES[dev_or_pub].get(plot_name, {}),
+        "legend_label_order": LEGEND_LABEL_ORDER[dev_or_pub].get(plot_name),
+        "x_range": list(
+            get_xrange(
+                plot_type=plot_type,
+                development_or_publication=dev_or_pub,
+                problem_name=problem_name,
+                plot_name=plot_name,
+            )
+        ),
+    }
+
+
 def _cm_to_inch(cm):
     return cm * 0.393701
 
@@ -425,17 +551,20 @@ def _row_to_col_ordering(items, ncol):
 def _split_benchmark_id_in_components(benchmark):
     """Split the benchmark identifier into its components.
 
-    For noisy benchmark problems we remove the "_noisy" suffix of the problem set name,
-    because we treat noisy and regular problems as the same problem set.
+    For noisy and expensive benchmark problems we remove the "_noisy" and "_expensive"
+    suffix of the problem set name, because we treat them and regular problems as the
+    same problem set.
 
     Examples:
     - publication_ls_benchmark_mw => (publication, ls_benchmark, mw)
     - development_ls_benchmark_cr => (development, ls_benchmark, cr)
     - development_noisy_benchmark_mw_noisy => (development, noisy_benchmark, mw)
+    - development_expensive_benchmark_mw_expensive => (development,
+      expensive_benchmark, mw)
 
     """
     development_or_publication, _other = benchmark.split("_", 1)
-    if _other.endswith("_noisy"):
+    if _other.endswith(("_noisy", "_expensive")):
         plot_name, problem_name, _ = _other.rsplit("_", 2)
     else:
         plot_name, problem_name = _other.rsplit("_", 1)
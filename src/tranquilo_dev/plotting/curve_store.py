@@ -0,0 +1,98 @@
+"""Content-addressed storage of the curves of the benchmark figures.
+
+pytask reruns a task when the modification time of one of its dependencies changes.
+Rerunning a benchmark therefore triggers all dependent figures, even if the histories
+are numerically identical. To avoid this, the curves of each figure are stored together
+with a hash of the curves and the styling of the figure. The file is only rewritten if
+the hash changes, such that the figure task is skipped otherwise.
+
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+
+
+# Arrays of a line. The confidence band "lower" and "upper" is optional.
+LINE_KEYS = ("x", "y", "lower", "upper")
+
+
+def write_curves_if_changed(curves, path, styling):
+    """Write the curves of a figure, unless the stored curves are identical.
+
+    Args:
+        curves (dict): Keys are the names of the lines, values are dictionaries with
+            keys "x" and "y", and optionally the confidence band "lower" and "upper".
+        path (str or pathlib.Path): Path of the .npz file.
+        styling (dict): JSON serializable styling options of the figure.
+
+    Returns:
+        bool: True if the file was written.
+
+    """
+    path = Path(path)
+    content_hash = get_content_hash(curves, styling)
+    if path.exists() and _read_hash(path) == content_hash:
+        return False
+
+    arrays = {
+        "hash": np.array(content_hash),
+        "names": np.array(list(curves), dtype=str),
+    }
+    for i, line in enumerate(curves.values()):
+        for key in LINE_KEYS:
+            if key in line:
+                arrays[f"{key}_{i}"] = np.asarray(line[key])
+
+    # Write to a temporary file first, such that the file is never left half-written
+    tmp_path = path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return True
+
+
+def read_curves(path):
+    """Read the curves of a figure.
+
+    Args:
+        path (str or pathlib.Path): Path of the .npz file.
+
+    Returns:
+        dict: Keys are the names of the lines, values are dictionaries with keys "x"
+            and "y", and "lower" and "upper" if the line has a confidence band.
+
+    """
+    with np.load(path) as data:
+        return {
+            str(name): {
+                key: data[f"{key}_{i}"] for key in LINE_KEYS if f"{key}_{i}" in data
+            }
+            for i, name in enumerate(data["names"])
+        }
+
+
+def get_content_hash(curves, styling):
+    """Get a hash of the curves and the styling of a figure."""
+    hasher = hashlib.sha256()
+    hasher.update(json.dumps(styling, sort_keys=True).encode())
+    for name, line in curves.items():
+        hasher.update(name.encode())
+        for key in LINE_KEYS:
+            if key not in line:
+                continue
+            hasher.update(key.encode())
+            values = np.ascontiguousarray(line[key])
+            hasher.update(f"{values.dtype.str}{values.shape}".encode())
+            hasher.update(values.tobytes())
+    return hasher.hexdigest()
+
+
+def _read_hash(path):
+    try:
+        with np.load(path) as data:
+            return str(data["hash"])
+    except (OSError, ValueError, KeyError):
+        return None
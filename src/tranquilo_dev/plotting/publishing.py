@@ -0,0 +1,143 @@
+"""Publish build artifacts into the source tree without duplicating bytes.
+
+A file is skipped if the destination already has the same content. Otherwise, it is
+published with the cheapest method the file system supports:
+
+1. A reflink, i.e. a copy-on-write clone of the file (e.g. Btrfs, XFS). The published
+   file shares its blocks with the source but is an independent file.
+2. A copy.
+
+Hard links are not used. The figures in the build directory are rewritten in place,
+which would change a hard-linked published file before it is published again.
+
+"""
+import hashlib
+import os
+import shutil
+from pathlib import Path
+from typing import NamedTuple
+
+try:
+    import fcntl
+except ImportError:
+    # fcntl is not available on Windows
+    fcntl = None
+
+
+# ioctl request to clone a file on Linux, see ioctl_ficlone(2)
+FICLONE = 0x40049409
+
+
+class PublishReport(NamedTuple):
+    """Summary of a publishing run.
+
+    Attributes:
+        n_files (int): Number of published files.
+        n_unchanged (int): Number of files whose destination was already up to date.
+        n_reflinked (int): Number of files published as reflinks.
+        n_copied (int): Number of files that were copied.
+        bytes_saved (int): Bytes of the published files that share their storage with
+            the source, i.e. of reflinked files.
+
+    """
+
+    n_files: int = 0
+    n_unchanged: int = 0
+    n_reflinked: int = 0
+    n_copied: int = 0
+    bytes_saved: int = 0
+
+    def __str__(self):
+        return (
+            f"Published {self.n_files} files ({self.n_unchanged} unchanged, "
+            f"{self.n_reflinked} reflinked, {self.n_copied} copied). "
+            f"Saved {self.bytes_saved:,} bytes."
+        )
+
+
+def publish_files(sources, destinations):
+    """Publish files to their destinations.
+
+    Args:
+        sources (list): Paths of the source files.
+        destinations (list): Paths of the destinations, in the same order.
+
+    Returns:
+        PublishReport: Summary of the publishing run.
+
+    """
+    counts = {"unchanged": 0, "reflinked": 0, "copied": 0}
+    bytes_saved = 0
+    for source, destination in zip(sources, destinations):
+        source, destination = Path(source), Path(destination)
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        method = publish_file(source, destination)
+        counts[method] += 1
+        if method == "reflinked":
+            bytes_saved += source.stat().st_size
+
+    return PublishReport(
+        n_files=sum(counts.values()),
+        n_unchanged=counts["unchanged"],
+        n_reflinked=counts["reflinked"],
+        n_copied=counts["copied"],
+        bytes_saved=bytes_saved,
+    )
+
+
+def publish_file(source, destination):
+    """Publish a single file.
+
+    Args:
+        source (pathlib.Path): Path of the source file.
+        destination (pathlib.Path): Path of the destination.
+
+    Returns:
+        str: The method that was used. One of "unchanged", "reflinked" and "copied".
+
+    """
+    # A hard link of the source from an earlier version is replaced by a copy.
+    if (
+        destination.exists()
+        and not os.path.samefile(source, destination)
+        and _get_file_hash(source) == _get_file_hash(destination)
+    ):
+        return "unchanged"
+
+    # Create the new file next to the destination and move it into place afterwards,
+    # such that the destination is never left half-written.
+    tmp_path = destination.with_name(f".{destination.name}.tmp")
+    tmp_path.unlink(missing_ok=True)
+    try:
+        if _reflink(source, tmp_path):
+            method = "reflinked"
+        else:
+            shutil.copyfile(source, tmp_path)
+            method = "copied"
+        os.replace(tmp_path, destination)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return method
+
+
+def _reflink(source, destination):
+    if fcntl is None:
+        return False
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            success = False
+        else:
+            success = True
+    if not success:
+        destination.unlink()
+    return success
+
+
+def _get_file_hash(path):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            hasher.update(chunk)
+    return hasher.digest()
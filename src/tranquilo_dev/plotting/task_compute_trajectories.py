@@ -0,0 +1,61 @@
+import pytask
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set
+from tranquilo_dev.benchmarks.trajectory_store import compute_trajectories
+from tranquilo_dev.benchmarks.trajectory_store import get_trajectory_file_name
+from tranquilo_dev.benchmarks.trajectory_store import split_plot_kwargs
+from tranquilo_dev.benchmarks.trajectory_store import write_trajectories
+from tranquilo_dev.config import BLD
+from tranquilo_dev.config import OPTIONS
+from tranquilo_dev.config import PLOT_CONFIG
+
+
+TRAJECTORIES = BLD / "trajectories"
+
+# ======================================================================================
+# Collect the trajectories that are needed by the benchmark plots
+# ======================================================================================
+# The same trajectories are used by several plots, e.g. the publication and development
+# variant of a plot, or profile and convergence plots with the same precision.
+TRAJECTORY_CASES = {}
+
+for plot_type in OPTIONS.PLOT_TYPES:
+    for info in PLOT_CONFIG.values():
+        plot_kwargs = info.get(f"{plot_type}_options", {})
+        y_tol, runtime_measure, _ = split_plot_kwargs(plot_type, plot_kwargs)
+        for scenario in info["scenarios"]:
+            case = (info["problem_name"], scenario, y_tol, runtime_measure)
+            TRAJECTORY_CASES[case] = None
+
+# ======================================================================================
+# Compute trajectories
+# ======================================================================================
+for problem_name, scenario, y_tol, runtime_measure in TRAJECTORY_CASES:
+
+    name = f"{problem_name}_{scenario}"
+    file_name = get_trajectory_file_name(y_tol, runtime_measure)
+
+    @pytask.mark.task(
+        id=f"{name}-{file_name}",
+        kwargs={
+            "problem_name": problem_name,
+            "y_tol": y_tol,
+            "runtime_measure": runtime_measure,
+        },
+    )
+    @pytask.mark.depends_on(BLD / "benchmarks" / f"{name}.arrow")
+    @pytask.mark.produces(TRAJECTORIES / name / file_name)
+    def task_compute_trajectories(
+        depends_on, produces, problem_name, y_tol, runtime_measure
+    ):
+        from tranquilo_dev.benchmarks.result_store import LazyBenchmarkResults
+
+        results = LazyBenchmarkResults(
+            [depends_on], columns=["criterion", "walltime", "batch"]
+        )
+        trajectories = compute_trajectories(
+            problems=get_problem_set(problem_name),
+            results=results,
+            y_tol=y_tol,
+            runtime_measure=runtime_measure,
+        )
+        write_trajectories(trajectories, produces, runtime_measure=runtime_measure)
@@ -1,10 +1,9 @@
-import shutil
-
 import pytask
 from tranquilo_dev.config import BLD
 from tranquilo_dev.config import OPTIONS
 from tranquilo_dev.config import PLOT_CONFIG
 from tranquilo_dev.config import SRC
+from tranquilo_dev.plotting.publishing import publish_files
 from tranquilo_dev.plotting.task_create_presentation_illustrations import (
     ILLUSTRATION_PLOT_NAMES,
 )
@@ -31,12 +30,11 @@ for plot_name in ILLUSTRATION_PLOT_NAMES:
 
 
 # ======================================================================================
-# Copy files
+# Publish files
 # ======================================================================================
-for source_file, dest_file in zip(SOURC_FILES, DEST_FILES):
-
-    @pytask.mark.depends_on(source_file)
-    @pytask.mark.produces(dest_file)
-    @pytask.mark.task(id=str(source_file.relative_to(BLD)))
-    def task_copy_file(depends_on, produces):
-        shutil.copyfile(depends_on, produces)
+# The summary of the publishing run is written to a file in the build directory.
+@pytask.mark.depends_on(SOURC_FILES)
+@pytask.mark.produces({"files": DEST_FILES, "report": BLD / "publish_report.txt"})
+def task_publish_files(depends_on, produces):
+    report = publish_files(depends_on.values(), produces["files"].values())
+    produces["report"].write_text(f"{report}\n")
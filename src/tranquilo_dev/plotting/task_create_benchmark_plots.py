@@ -1,15 +1,16 @@
-import pandas as pd
+from functools import partial
+
 import pytask
-from estimagic import convergence_plot
-from estimagic import profile_plot
-from estimagic.visualization.deviation_plot import deviation_plot
-from tranquilo_dev.benchmarks.benchmark_problems import get_extended_benchmark_problems
+from tranquilo_dev.benchmarks.analytics import get_convergence_curves_from_histories
+from tranquilo_dev.benchmarks.analytics import get_curves_with_confidence_bands
+from tranquilo_dev.benchmarks.analytics import get_deviation_curves_from_histories
+from tranquilo_dev.benchmarks.analytics import get_profile_curves_from_histories
+from tranquilo_dev.benchmarks.trajectory_store import get_trajectory_file_name
+from tranquilo_dev.benchmarks.trajectory_store import split_plot_kwargs
 from tranquilo_dev.config import BLD
-from tranquilo_dev.config import get_benchmark_problem_info
 from tranquilo_dev.config import OPTIONS
 from tranquilo_dev.config import PLOT_CONFIG
-from tranquilo_dev.config import PROBLEM_SETS
-from tranquilo_dev.plotting.benchmark_plotting_functions import plot_benchmark
+from tranquilo_dev.config import SRC
 
 
 # We store all figures used in the paper in a specific folder that is then copied
@@ -17,50 +18,52 @@ from tranquilo_dev.plotting.benchmark_plotting_functions import plot_benchmark
 # presentation
 BLD_PAPER = BLD.joinpath("bld_paper")
 BLD_SLIDEV = BLD.joinpath("bld_slidev")
-
-ESTIMAGIC_PLOT_FUNCTIONS = {
-    "profile_plot": profile_plot,
-    "deviation_plot": deviation_plot,
-    "convergence_plot": convergence_plot,
+BLD_CURVES = BLD.joinpath("curves")
+
+# The styling and the plotting of the figures are defined in this module. The curves of
+# a figure are recomputed when it changes, but only rewritten if the styling of the
+# figure changed. The figures are rendered again since the module also draws them.
+# matplotlib and plotly are only imported in the bodies of the tasks.
+STYLING_MODULE = SRC / "plotting" / "benchmark_plotting_functions.py"
+
+# Profiles and deviation curves of noisy benchmarks with several noise replications get
+# confidence bands across the replications.
+CURVE_FUNCTIONS = {
+    "profile_plot": partial(
+        get_curves_with_confidence_bands, get_profile_curves_from_histories
+    ),
+    "deviation_plot": partial(
+        get_curves_with_confidence_bands, get_deviation_curves_from_histories
+    ),
+    "convergence_plot": get_convergence_curves_from_histories,
 }
 
 # ======================================================================================
-# Publication ready figures
+# Collect the figures
 # ======================================================================================
 
+FIGURES = {plot_type: {} for plot_type in OPTIONS.PLOT_TYPES}
+
 for plot_type in OPTIONS.PLOT_TYPES:
 
-    plot_func = ESTIMAGIC_PLOT_FUNCTIONS[plot_type]
+    curve_func = CURVE_FUNCTIONS[plot_type]
 
     for benchmark, info in PLOT_CONFIG.items():
 
         # Retrieve plotting info and function
         # ==============================================================================
         problem_name = info["problem_name"]
-        plot_kwargs = info.get(f"{plot_type}_options", {})
+        y_tol, runtime_measure, curve_kwargs = split_plot_kwargs(
+            plot_type, info.get(f"{plot_type}_options", {})
+        )
 
         # Retrieve plotting data
         # ==============================================================================
+        file_name = get_trajectory_file_name(y_tol, runtime_measure)
         dependencies = [
-            BLD.joinpath("benchmarks", f"{problem_name}_{scenario}.pkl")
+            BLD.joinpath("trajectories", f"{problem_name}_{scenario}", file_name)
             for scenario in info["scenarios"]
         ]
-        benchmark_info = get_benchmark_problem_info(problem_name)
-        problems = get_extended_benchmark_problems(
-            benchmark_kwargs=PROBLEM_SETS[problem_name], **benchmark_info
-        )
-
-        # Store variables in kwargs to pass to pytask
-        # ==============================================================================
-        kwargs = {
-            "plot_func": plot_func,
-            "plot_kwargs": plot_kwargs,
-            "problems": problems,
-            "plot_type": plot_type,
-            "benchmark": benchmark,
-        }
-
-        task_id = f"{plot_type}_{benchmark}"
 
         # We remove the prefix 'publication_' and 'development_' from the saved file
         # name. Products are either a list with one (figures are saved only in pdf
@@ -80,36 +83,127 @@ for plot_type in OPTIONS.PLOT_TYPES:
                 "or 'development_'",
             )
 
-        @pytask.mark.task(id=task_id, kwargs=kwargs)
-        @pytask.mark.depends_on(dependencies)
-        @pytask.mark.produces(produces)
-        def task_create_benchmark_plots(
+        FIGURES[plot_type][benchmark] = {
+            "trajectories": dependencies,
+            "curves": BLD_CURVES / f"{plot_type}s" / f"{benchmark}.npz",
+            "produces": produces,
+            "curve_kwargs": {
+                "curve_func": curve_func,
+                "curve_kwargs": curve_kwargs,
+                "runtime_measure": runtime_measure,
+                "plot_type": plot_type,
+                "benchmark": benchmark,
+            },
+        }
+
+
+# ======================================================================================
+# Curves of the figures
+# ======================================================================================
+
+for plot_type, figures in FIGURES.items():
+    for benchmark, spec in figures.items():
+
+        @pytask.mark.task(id=f"{plot_type}_{benchmark}", kwargs=spec["curve_kwargs"])
+        @pytask.mark.depends_on(
+            {"trajectories": spec["trajectories"], "styling": STYLING_MODULE}
+        )
+        @pytask.mark.produces(spec["curves"])
+        def task_compute_benchmark_curves(
             depends_on,
             produces,
-            plot_func,
-            plot_kwargs,
-            problems,
+            curve_func,
+            curve_kwargs,
+            runtime_measure,
             plot_type,
             benchmark,
         ):
-            results = {}
-            for path in depends_on.values():
-                results = {**results, **pd.read_pickle(path)}
+            from tranquilo_dev.benchmarks.trajectory_store import read_trajectories
+            from tranquilo_dev.plotting.benchmark_plotting_functions import get_styling
+            from tranquilo_dev.plotting.curve_store import write_curves_if_changed
 
-            plotly_fig = plot_func(problems=problems, results=results, **plot_kwargs)
-            plotting_data = _get_data_from_plotly_figure(plotly_fig)
-
-            fig = plot_benchmark(
-                plotting_data,
-                plot_type=plot_type,
-                benchmark=benchmark,
+            trajectories = read_trajectories(
+                depends_on["trajectories"].values(), runtime_measure=runtime_measure
+            )
+            curves = curve_func(trajectories, **curve_kwargs)
+            write_curves_if_changed(
+                curves, produces, styling=get_styling(plot_type, benchmark)
             )
 
-            # looping over potentially multiple file types
-            for path in list(produces.values()):
-                fig.savefig(path, bbox_inches="tight")
 
+# ======================================================================================
+# Publication ready figures
+# ======================================================================================
 
-def _get_data_from_plotly_figure(fig):
-    lines = fig.data
-    return {line.name: {"x": line.x, "y": line.y} for line in lines}
+# The figures depend on their curves, which are only rewritten if the curves or the
+# styling of the figure changed, and on the module that draws them.
+if OPTIONS.BATCH_RENDERING:
+
+    # One task per plot type renders all figures on a single matplotlib figure, such
+    # that matplotlib and the fonts are only loaded once.
+    for plot_type, figures in FIGURES.items():
+
+        @pytask.mark.task(id=plot_type, kwargs={"plot_type": plot_type})
+        @pytask.mark.depends_on(
+            {
+                "curves": {
+                    benchmark: spec["curves"] for benchmark, spec in figures.items()
+                },
+                "styling": STYLING_MODULE,
+            }
+        )
+        @pytask.mark.produces(
+            {benchmark: spec["produces"] for benchmark, spec in figures.items()}
+        )
+        def task_create_benchmark_plots_in_batch(depends_on, produces, plot_type):
+            import matplotlib.pyplot as plt
+
+            fig = None
+            for benchmark, path in depends_on["curves"].items():
+                fig = _create_figure(
+                    path,
+                    produces=produces[benchmark],
+                    plot_type=plot_type,
+                    benchmark=benchmark,
+                    fig=fig,
+                )
+            plt.close(fig)
+
+else:
+
+    for plot_type, figures in FIGURES.items():
+        for benchmark, spec in figures.items():
+
+            @pytask.mark.task(
+                id=f"{plot_type}_{benchmark}",
+                kwargs={"plot_type": plot_type, "benchmark": benchmark},
+            )
+            @pytask.mark.depends_on(
+                {"curves": spec["curves"], "styling": STYLING_MODULE}
+            )
+            @pytask.mark.produces(spec["produces"])
+            def task_create_benchmark_plots(depends_on, produces, plot_type, benchmark):
+                _create_figure(
+                    depends_on["curves"],
+                    produces=produces,
+                    plot_type=plot_type,
+                    benchmark=benchmark,
+                )
+
+
+def _create_figure(path, produces, plot_type, benchmark, fig=None):
+    from tranquilo_dev.plotting.benchmark_plotting_functions import plot_benchmark
+    from tranquilo_dev.plotting.curve_store import read_curves
+
+    fig = plot_benchmark(
+        read_curves(path),
+        plot_type=plot_type,
+        benchmark=benchmark,
+        fig=fig,
+    )
+
+    # looping over potentially multiple file types
+    for path in list(produces.values()):
+        fig.savefig(path, bbox_inches="tight")
+
+    return fig
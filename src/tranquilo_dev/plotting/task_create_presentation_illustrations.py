@@ -1,10 +1,5 @@
-import plotly.io as pio
 import pytask
 from tranquilo_dev.config import BLD
-from tranquilo_dev.plotting.illustrations import create_noise_plots
-from tranquilo_dev.plotting.illustrations import create_other_illustration_plots
-
-pio.kaleido.scope.mathjax = None
 
 
 BLD_SLIDEV = BLD.joinpath("bld_slidev")
@@ -20,6 +15,10 @@ for folder, suffix in ((BLD_SLIDEV, ".svg"), (BLD_PAPER / "illustrations", ".pdf
 
 @pytask.mark.produces(NOISE_PLOT_PRODUCES)
 def task_create_noise_plots(produces):
+    import plotly.io as pio
+    from tranquilo_dev.plotting.illustrations import create_noise_plots
+
+    pio.kaleido.scope.mathjax = None
     figures = create_noise_plots()
     # loop over (*figures, *figures) to write the same figure twice for svg and pdf
     for path, fig in zip(produces.values(), (*figures, *figures)):
@@ -42,6 +41,8 @@ OTHER_ILLUSTRATION_NAMES = [
 
 @pytask.mark.produces([BLD_SLIDEV.joinpath(name) for name in OTHER_ILLUSTRATION_NAMES])
 def task_create_other_illustration_plots(produces):
+    from tranquilo_dev.plotting.illustrations import create_other_illustration_plots
+
     figures = create_other_illustration_plots()
     for path in produces.values():
         figures[path.name].write_image(path)
@@ -1,10 +1,5 @@
-import matplotlib.pyplot as plt
 import numpy as np
 import pytask
-import seaborn as sns
-from tranquilo.bounds import Bounds
-from tranquilo.region import Region
-from tranquilo.sample_points import get_sampler
 from tranquilo_dev.config import BLD
 
 
@@ -26,6 +21,8 @@ PRODUCT = BLD / "bld_paper" / "illustrations" / "optimal_sphere_samples.pdf"
 
 @pytask.mark.produces(PRODUCT)
 def task_create_sphere_sample_plot(produces):
+    import matplotlib.pyplot as plt
+
     samples = create_sphere_samples()
     fig, axes = plt.subplots(2, 3, figsize=(12, 8))
     for ax, sample in zip(axes.flatten(), samples):
@@ -38,6 +35,9 @@ def task_create_sphere_sample_plot(produces):
 
 
 def create_sphere_samples():
+    from tranquilo.region import Region
+    from tranquilo.sample_points import get_sampler
+
     sampler_options = {
         "criterion": "distance",
         "algo_options": {"maxiter": 600, "ftol": 1e-5, "gtol": 1e-6},
@@ -71,6 +71,10 @@ def create_sphere_samples():
 
 
 def create_cube_samples():
+    from tranquilo.bounds import Bounds
+    from tranquilo.region import Region
+    from tranquilo.sample_points import get_sampler
+
     sampler_options = {
         # "criterion": "distance",
         # "algo_options": {"maxiter": 200},
@@ -103,11 +107,15 @@ def create_cube_samples():
 
 
 def plot_circle(center, radius, ax):
+    import matplotlib.pyplot as plt
+
     ax.add_artist(plt.Circle(center, radius, color=COLORS["gray"], fill=False))
     return ax
 
 
 def plot_rectangle(lb, ub, ax):
+    import matplotlib.pyplot as plt
+
     ax.add_artist(
         plt.Rectangle(
             lb, ub[0] - lb[0], ub[1] - lb[1], color=COLORS["gray"], fill=False
@@ -122,6 +130,8 @@ def plot_points(points, ax):
 
 
 def style_axis(ax):
+    import seaborn as sns
+
     ax.set_xlim([-1.05, 1.05])
     ax.set_ylim([-1.2, 1.05])
     ax.set_aspect("equal")
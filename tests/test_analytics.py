@@ -0,0 +1,143 @@
+import estimagic as em
+import numpy as np
+import pytest
+from estimagic import convergence_plot
+from estimagic import profile_plot
+from estimagic.visualization.deviation_plot import deviation_plot
+from tranquilo_dev.benchmarks.analytics import get_convergence_curves
+from tranquilo_dev.benchmarks.analytics import get_curves_with_confidence_bands
+from tranquilo_dev.benchmarks.analytics import get_deviation_curves
+from tranquilo_dev.benchmarks.analytics import get_deviation_curves_from_histories
+from tranquilo_dev.benchmarks.analytics import get_profile_curves
+from tranquilo_dev.benchmarks.analytics import get_profile_curves_from_histories
+
+
+@pytest.fixture(scope="module")
+def benchmark():
+    problems = em.get_benchmark_problems("more_wild")
+    problems = {name: problems[name] for name in list(problems)[:4]}
+    results = em.run_benchmark(
+        problems,
+        optimize_options={
+            "nelder_mead": {"algorithm": "scipy_neldermead"},
+            "powell": {"algorithm": "scipy_powell"},
+        },
+        max_criterion_evaluations=100,
+    )
+    return problems, results
+
+
+CASES = [
+    (profile_plot, get_profile_curves, {}),
+    (profile_plot, get_profile_curves, {"normalize_runtime": True}),
+    (profile_plot, get_profile_curves, {"runtime_measure": "n_batches"}),
+    (deviation_plot, get_deviation_curves, {}),
+    (deviation_plot, get_deviation_curves, {"monotone": False}),
+    (convergence_plot, get_convergence_curves, {}),
+    (convergence_plot, get_convergence_curves, {"runtime_measure": "n_batches"}),
+]
+
+
+@pytest.mark.parametrize("plot_func, curve_func, kwargs", CASES)
+def test_curves_match_estimagic_plots(benchmark, plot_func, curve_func, kwargs):
+    problems, results = benchmark
+
+    fig = plot_func(problems=problems, results=results, **kwargs)
+    # Later traces overwrite earlier ones, i.e. convergence plots show the last problem
+    expected = {line.name: line for line in fig.data}
+
+    got = curve_func(problems=problems, results=results, **kwargs)
+
+    assert list(got) == list(expected)
+    for name, line in got.items():
+        np.testing.assert_allclose(line["x"], np.asarray(expected[name].x, dtype=float))
+        np.testing.assert_allclose(line["y"], np.asarray(expected[name].y, dtype=float))
+
+
+def test_deviation_curves_with_walltime():
+    processed = {
+        ("a", "algo"): (
+            {
+                "walltime": np.array([0.0, 0.5, 1.0]),
+                "monotone_criterion_normalized": np.array([1.0, 0.5, 0.2]),
+            },
+            False,
+        ),
+        ("b", "algo"): (
+            {
+                "walltime": np.array([0.0, 2.0]),
+                "monotone_criterion_normalized": np.array([1.0, 0.0]),
+            },
+            True,
+        ),
+    }
+    got = get_deviation_curves_from_histories(processed, runtime_measure="walltime")
+
+    x, y = got["algo"]["x"], got["algo"]["y"]
+    assert x[0] == 0 and x[-1] == 2
+    # Problem a keeps its last value after it stopped, problem b is solved at the end
+    np.testing.assert_allclose(y[x == 0], 1)
+    np.testing.assert_allclose(y[(x >= 1) & (x < 2)], 0.6)
+    np.testing.assert_allclose(y[-1], 0.1)
+
+
+def test_deviation_curves_with_walltime_fill_each_problem_separately():
+    processed = {
+        ("a", "algo"): (
+            {
+                "walltime": np.array([0.0, 0.1]),
+                "monotone_criterion_normalized": np.array([1.0, 0.0]),
+            },
+            True,
+        ),
+        ("b", "algo"): (
+            {
+                "walltime": np.array([1.0, 2.0]),
+                "monotone_criterion_normalized": np.array([1.0, 0.5]),
+            },
+            False,
+        ),
+    }
+    got = get_deviation_curves_from_histories(processed, runtime_measure="walltime")
+
+    x, y = got["algo"]["x"], got["algo"]["y"]
+    # Before its first evaluation, problem b takes its start value instead of the
+    # last value of problem a
+    np.testing.assert_allclose(y[0], 1)
+    np.testing.assert_allclose(y[(x > 0.1) & (x < 1)], 0.5)
+    np.testing.assert_allclose(y[-1], 0.25)
+
+
+def _solved_after(n_evaluations):
+    history = {"n_evaluations": np.arange(1, n_evaluations + 1)}
+    return history, True
+
+
+def test_profile_curves_with_confidence_bands():
+    processed = {
+        ("a", "algo"): _solved_after(2),
+        ("b", "algo"): _solved_after(4),
+        ("a__rep_1", "algo"): _solved_after(2),
+        ("b__rep_1", "algo"): _solved_after(2),
+    }
+    got = get_curves_with_confidence_bands(
+        get_profile_curves_from_histories, processed
+    )["algo"]
+
+    pooled = get_profile_curves_from_histories(processed)["algo"]
+    np.testing.assert_array_equal(got["x"], pooled["x"])
+    np.testing.assert_array_equal(got["y"], pooled["y"])
+
+    # Both replications solve half of their problems after two evaluations, but only
+    # the first one needs four evaluations to solve all of them
+    width = got["upper"] - got["lower"]
+    assert np.all(width[got["x"] < 2] == 0)
+    assert np.all(width[(got["x"] >= 2) & (got["x"] < 4)] > 0)
+    assert np.all(width[got["x"] >= 4] == 0)
+    assert np.all(got["lower"] <= got["y"]) and np.all(got["y"] <= got["upper"])
+
+
+def test_curves_without_replications_have_no_bands():
+    processed = {("a", "algo"): _solved_after(2), ("b", "algo"): _solved_after(3)}
+    got = get_curves_with_confidence_bands(get_profile_curves_from_histories, processed)
+    assert set(got["algo"]) == {"x", "y"}
@@ -1,4 +1,8 @@
+import numpy as np
+import pytest
 from pybaum import tree_equal
+from tranquilo_dev.benchmarks.benchmark_problems import _calculate_radius
+from tranquilo_dev.benchmarks.benchmark_problems import _draw_new_start_vectors
 from tranquilo_dev.benchmarks.benchmark_problems import get_extended_benchmark_problems
 
 
@@ -32,3 +36,156 @@ def test_stochastic_property():
     v2 = {k: v["inputs"]["params"] for k, v in p2.items()}
 
     assert not tree_equal(v1, v2)
+
+
+def test_cache_returns_same_problems_without_sampling(tmp_path, monkeypatch):
+    """Test that a warm cache leads to the same problems without sampling again."""
+    kwargs = {
+        "n_additional_draws": 2,
+        "seed": 12345,
+        "benchmark_kwargs": {"name": "more_wild"},
+        "cache_dir": tmp_path,
+    }
+    p1 = get_extended_benchmark_problems(**kwargs)
+
+    def _raise(*args, **kwargs):  # noqa: U100
+        raise AssertionError("New start vectors are sampled despite a warm cache.")
+
+    monkeypatch.setattr(
+        "tranquilo_dev.benchmarks.benchmark_problems._sample_new_start_vectors", _raise
+    )
+    p2 = get_extended_benchmark_problems(**kwargs)
+
+    v1 = {k: v["inputs"]["params"] for k, v in p1.items()}
+    v2 = {k: v["inputs"]["params"] for k, v in p2.items()}
+
+    assert tree_equal(v1, v2)
+
+
+def test_start_vectors_do_not_depend_on_other_problems():
+    """Test that the new start values of a problem do not depend on the problem set."""
+    p1 = get_extended_benchmark_problems(
+        n_additional_draws=2, seed=12345, benchmark_kwargs={"name": "more_wild"}
+    )
+
+    p2 = get_extended_benchmark_problems(
+        n_additional_draws=2,
+        seed=12345,
+        benchmark_kwargs={"name": "more_wild", "exclude": ["rosenbrock_good_start"]},
+    )
+
+    v1 = {k: v["inputs"]["params"] for k, v in p1.items() if k in p2}
+    v2 = {k: v["inputs"]["params"] for k, v in p2.items()}
+
+    assert tree_equal(v1, v2)
+
+
+def test_start_vectors_do_not_depend_on_n_cores():
+    """Test that the newly drawn start values do not depend on the number of cores."""
+    p1 = get_extended_benchmark_problems(
+        n_additional_draws=2,
+        seed=12345,
+        benchmark_kwargs={"name": "more_wild"},
+        n_cores=1,
+    )
+
+    p2 = get_extended_benchmark_problems(
+        n_additional_draws=2,
+        seed=12345,
+        benchmark_kwargs={"name": "more_wild"},
+        n_cores=2,
+    )
+
+    v1 = {k: v["inputs"]["params"] for k, v in p1.items()}
+    v2 = {k: v["inputs"]["params"] for k, v in p2.items()}
+
+    assert tree_equal(v1, v2)
+
+
+@pytest.mark.parametrize("content", [b"", b"\x80\x04\x95", b"not a pickle"])
+def test_unreadable_cache_entry_is_a_miss(tmp_path, content):
+    kwargs = {
+        "n_additional_draws": 1,
+        "seed": 12345,
+        "benchmark_kwargs": {"name": "more_wild"},
+    }
+    expected = get_extended_benchmark_problems(**kwargs)
+    get_extended_benchmark_problems(**kwargs, cache_dir=tmp_path)
+
+    # Corrupt the cache entry that was just written
+    (cache_path,) = tmp_path.glob("*.pkl")
+    cache_path.write_bytes(content)
+    got = get_extended_benchmark_problems(**kwargs, cache_dir=tmp_path)
+
+    v1 = {k: v["inputs"]["params"] for k, v in expected.items()}
+    v2 = {k: v["inputs"]["params"] for k, v in got.items()}
+    assert tree_equal(v1, v2)
+
+
+def _criterion_with_invalid_region(x):
+    if x[1] > 2.1:
+        raise ValueError("Not defined.")
+    return np.log(x[0] - 0.95)
+
+
+def _draw_new_start_vectors_one_by_one(problem, n_draws, rng, **sample_kwargs):
+    x = problem["inputs"]["params"]
+    radius = _calculate_radius(
+        x,
+        percentage_deviation=sample_kwargs["percentage_deviation_radius"],
+        minimal_radius=sample_kwargs["minimal_radius"],
+    )
+    new_start_vectors = []
+    while len(new_start_vectors) < n_draws:
+        for _ in range(n_draws - len(new_start_vectors)):
+            candidate = rng.uniform(low=x - radius, high=x + radius)
+            try:
+                with np.errstate(all="ignore"):
+                    value = problem["inputs"]["criterion"](candidate)
+            except ValueError:
+                continue
+            if np.isfinite(value):
+                new_start_vectors.append(candidate)
+        radius = radius / 2
+    return new_start_vectors
+
+
+@pytest.mark.parametrize("n_cores", [1, 2])
+def test_block_sampling_equals_sampling_one_by_one(n_cores):
+    problem = {
+        "inputs": {
+            "params": np.array([1.0, 2.0]),
+            "criterion": _criterion_with_invalid_region,
+        }
+    }
+    sample_kwargs = {"minimal_radius": 0.05, "percentage_deviation_radius": 0.1}
+
+    got = _draw_new_start_vectors(
+        problem_name="problem",
+        problem=problem,
+        n_draws=20,
+        rng=np.random.default_rng(5471),
+        n_cores=n_cores,
+        **sample_kwargs,
+    )
+    expected = _draw_new_start_vectors_one_by_one(
+        problem, n_draws=20, rng=np.random.default_rng(5471), **sample_kwargs
+    )
+
+    np.testing.assert_array_equal(got, expected)
+
+
+def test_unexpected_errors_of_criterion_are_raised():
+    def _criterion(x):  # noqa: U100
+        raise KeyError("A bug.")
+
+    problem = {"inputs": {"params": np.array([1.0, 2.0]), "criterion": _criterion}}
+    with pytest.raises(KeyError):
+        _draw_new_start_vectors(
+            problem_name="problem",
+            problem=problem,
+            n_draws=2,
+            rng=np.random.default_rng(0),
+            minimal_radius=0.05,
+            percentage_deviation_radius=0.1,
+        )
@@ -0,0 +1,34 @@
+import numpy as np
+import tranquilo.tranquilo
+from tranquilo_dev.benchmarks.component_log import profile_tranquilo_components
+from tranquilo_dev.benchmarks.component_log import read_component_log
+
+
+def _process_arguments():
+    return {
+        "sample_points": lambda n: np.zeros(n),
+        "fit_model": lambda: "model",
+        "solve_subproblem": lambda model: model,
+        "x": np.zeros(2),
+    }
+
+
+def test_profile_tranquilo_components(tmp_path, monkeypatch):
+    monkeypatch.setattr(tranquilo.tranquilo, "process_arguments", _process_arguments)
+    path = tmp_path / "components.log"
+
+    with profile_tranquilo_components(path):
+        internal_kwargs = tranquilo.tranquilo.process_arguments()
+    assert tranquilo.tranquilo.process_arguments is _process_arguments
+
+    internal_kwargs["sample_points"](3)
+    internal_kwargs["sample_points"](3)
+    assert internal_kwargs["solve_subproblem"](model="model") == "model"
+
+    got = read_component_log(path)
+    assert [len(times["t_start"]) for times in got.values()] == [2, 0, 1]
+    assert np.all(got["sampling"]["t_end"] >= got["sampling"]["t_start"])
+
+
+def test_read_component_log_without_log(tmp_path):
+    assert read_component_log(tmp_path / "components.log") is None
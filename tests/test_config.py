@@ -0,0 +1,97 @@
+import subprocess
+import sys
+
+import pytest
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.config import _get_cgroup_cpu_quota
+from tranquilo_dev.config import _get_runs_of_cases
+from tranquilo_dev.config import BENCHMARK_ALIASES
+from tranquilo_dev.config import BENCHMARK_CASES
+from tranquilo_dev.config import get_available_cores
+from tranquilo_dev.config import get_benchmark_kwargs_hash
+from tranquilo_dev.config import ProjectOptions
+
+
+def test_get_available_cores_environment_override(monkeypatch):
+    monkeypatch.setenv("TRANQUILO_DEV_N_CORES", "3")
+    assert get_available_cores() == 3
+
+
+def test_get_available_cores_is_positive(monkeypatch):
+    monkeypatch.delenv("TRANQUILO_DEV_N_CORES", raising=False)
+    assert get_available_cores() >= 1
+
+
+@pytest.mark.parametrize(
+    "content, expected", [("max 100000", None), ("250000 100000", 2.5)]
+)
+def test_get_cgroup_cpu_quota_v2(tmp_path, content, expected):
+    tmp_path.joinpath("cpu.max").write_text(content)
+    assert _get_cgroup_cpu_quota(tmp_path) == expected
+
+
+@pytest.mark.parametrize("controller", ["cpu", "cpu,cpuacct"])
+@pytest.mark.parametrize("quota, expected", [("-1", None), ("400000", 4.0)])
+def test_get_cgroup_cpu_quota_v1(tmp_path, controller, quota, expected):
+    tmp_path.joinpath(controller).mkdir()
+    tmp_path.joinpath(controller, "cpu.cfs_quota_us").write_text(quota)
+    tmp_path.joinpath(controller, "cpu.cfs_period_us").write_text("100000")
+    assert _get_cgroup_cpu_quota(tmp_path) == expected
+
+
+def test_get_n_cores_accounts_for_cores_per_optimization():
+    options = ProjectOptions(N_CORES=16)
+    assert options.n_cores == 16
+    assert options.get_n_cores(cores_per_optimization=8) == 2
+    assert options.get_n_cores(cores_per_optimization=32) == 1
+
+
+def test_sampling_n_cores_defaults_to_n_cores():
+    assert ProjectOptions(N_CORES=16).sampling_n_cores == 16
+    assert ProjectOptions(N_CORES=16, SAMPLING_N_CORES=2).sampling_n_cores == 2
+
+
+def test_benchmark_kwargs_hash_ignores_scenario_name():
+    def _hash(scenario):
+        return get_benchmark_kwargs_hash(get_benchmark_kwargs("mw_noisy", scenario))
+
+    assert _hash("nag_bobyqa_noisy_3") == _hash("dfols_noisy_3")
+    assert _hash("dfols_noisy_3") != _hash("dfols_noisy_5")
+    assert _hash("dfols") != _hash("dfols_noisy_3")
+
+
+def test_identical_scenarios_are_run_once_per_problem_set():
+    cases = [
+        ("mw_noisy", "dfols_noisy_3"),
+        ("mw_noisy", "nag_bobyqa_noisy_3"),
+        ("mw_noisy", "dfols_noisy_5"),
+        ("cr_noisy", "nag_bobyqa_noisy_3"),
+    ]
+    got = _get_runs_of_cases(cases)
+    assert got == {
+        ("mw_noisy", "dfols_noisy_3"): ("mw_noisy", "dfols_noisy_3"),
+        ("mw_noisy", "nag_bobyqa_noisy_3"): ("mw_noisy", "dfols_noisy_3"),
+        ("mw_noisy", "dfols_noisy_5"): ("mw_noisy", "dfols_noisy_5"),
+        ("cr_noisy", "nag_bobyqa_noisy_3"): ("cr_noisy", "nag_bobyqa_noisy_3"),
+    }
+
+
+def test_aliases_point_to_cases_that_are_run():
+    assert len(BENCHMARK_CASES) == len(set(BENCHMARK_CASES))
+    for case, run in BENCHMARK_ALIASES.items():
+        assert case not in BENCHMARK_CASES
+        assert run in BENCHMARK_CASES
+
+
+def test_task_modules_do_not_import_heavy_packages_on_collection():
+    code = (
+        "import sys\n"
+        "import tranquilo_dev.benchmarks.task_run_benchmarks\n"
+        "import tranquilo_dev.plotting.task_create_benchmark_plots\n"
+        "heavy = ['estimagic', 'matplotlib', 'plotly', 'tranquilo']\n"
+        "print([name for name in heavy if name in sys.modules])\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert out.stdout.strip() == "[]"
@@ -0,0 +1,60 @@
+import numpy as np
+from tranquilo_dev.plotting.curve_store import read_curves
+from tranquilo_dev.plotting.curve_store import write_curves_if_changed
+
+
+CURVES = {
+    "dfols": {"x": np.arange(5), "y": np.linspace(1, 0, 5)},
+    "tranquilo_ls": {"x": np.arange(3), "y": np.array([1, 0.5, 0.1])},
+}
+
+
+def test_write_and_read_curves(tmp_path):
+    path = tmp_path / "curves.npz"
+    assert write_curves_if_changed(CURVES, path, styling={"colors": {}})
+
+    got = read_curves(path)
+
+    assert list(got) == list(CURVES)
+    for name, line in CURVES.items():
+        np.testing.assert_array_equal(got[name]["x"], line["x"])
+        np.testing.assert_array_equal(got[name]["y"], line["y"])
+
+
+def test_curves_are_only_rewritten_if_content_changes(tmp_path):
+    path = tmp_path / "curves.npz"
+    styling = {"colors": {"DFO-LS": "#6a9f58"}}
+    write_curves_if_changed(CURVES, path, styling=styling)
+    mtime = path.stat().st_mtime_ns
+
+    identical = {
+        name: {k: v.copy() for k, v in line.items()} for name, line in CURVES.items()
+    }
+    assert not write_curves_if_changed(identical, path, styling=dict(styling))
+    assert path.stat().st_mtime_ns == mtime
+
+    assert write_curves_if_changed(CURVES, path, styling={"colors": {}})
+
+    changed = {**CURVES, "dfols": {"x": np.arange(5), "y": np.zeros(5)}}
+    assert write_curves_if_changed(changed, path, styling={"colors": {}})
+
+
+def test_write_and_read_curves_with_confidence_bands(tmp_path):
+    path = tmp_path / "curves.npz"
+    curves = {
+        **CURVES,
+        "tranquilo_ls": {
+            **CURVES["tranquilo_ls"],
+            "lower": np.array([0.9, 0.4, 0.0]),
+            "upper": np.array([1.0, 0.6, 0.2]),
+        },
+    }
+    write_curves_if_changed(curves, path, styling={})
+
+    got = read_curves(path)
+
+    assert set(got["dfols"]) == {"x", "y"}
+    for key, values in curves["tranquilo_ls"].items():
+        np.testing.assert_array_equal(got["tranquilo_ls"][key], values)
+    assert not write_curves_if_changed(curves, path, styling={})
+    assert write_curves_if_changed(CURVES, path, styling={})
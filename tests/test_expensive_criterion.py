@@ -0,0 +1,63 @@
+import pickle
+import time
+
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.expensive_criterion import add_criterion_cost
+from tranquilo_dev.benchmarks.expensive_criterion import CriterionCost
+from tranquilo_dev.benchmarks.expensive_criterion import ExpensiveCriterion
+from tranquilo_dev.benchmarks.runner import get_cores_per_optimization
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.plotting.benchmark_plotting_functions import (
+    _split_benchmark_id_in_components,
+)
+
+
+def _sphere(x):
+    return x @ x
+
+
+@pytest.mark.parametrize("mode", ["sleep", "spin"])
+def test_expensive_criterion_takes_at_least_the_cost(mode):
+    criterion = ExpensiveCriterion(_sphere, CriterionCost(seconds=0.02, mode=mode))
+    criterion = pickle.loads(pickle.dumps(criterion))
+
+    start = time.perf_counter()
+    assert criterion(np.array([1.0, 2.0])) == 5
+    assert time.perf_counter() - start >= 0.02
+
+
+def test_expensive_criterion_invalid_mode():
+    with pytest.raises(ValueError):
+        ExpensiveCriterion(_sphere, CriterionCost(mode="wait"))
+
+
+def test_add_criterion_cost_keeps_noise_free_criterion():
+    problems = em.get_benchmark_problems("example")
+    got = add_criterion_cost(problems, {"seconds": 0.0, "mode": "sleep"})
+
+    assert list(got) == list(problems)
+    for name, problem in got.items():
+        assert isinstance(problem["inputs"]["criterion"], ExpensiveCriterion)
+        assert problem["noise_free_criterion"] is problems[name]["noise_free_criterion"]
+        params = problem["inputs"]["params"]
+        expected = problems[name]["inputs"]["criterion"](params)
+        assert problem["inputs"]["criterion"](params)["value"] == expected["value"]
+
+
+def test_multicore_scenario_evaluates_batches_on_batch_size_cores():
+    kwargs = get_benchmark_kwargs("mw_expensive", "tranquilo_ls_multicore_parallel_4")
+    algo_options = kwargs["optimize_options"]["tranquilo_ls_multicore_parallel_4"][
+        "algo_options"
+    ]
+    assert algo_options["batch_size"] == 4
+    assert algo_options["n_cores"] == 4
+    assert get_cores_per_optimization(kwargs["optimize_options"]) == 4
+
+
+def test_split_benchmark_id_of_expensive_benchmark():
+    got = _split_benchmark_id_in_components(
+        "development_expensive_benchmark_mw_expensive"
+    )
+    assert got == ("development", "mw", "expensive_benchmark")
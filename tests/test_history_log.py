@@ -0,0 +1,97 @@
+import pickle
+
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.history_log import assemble_benchmark_result
+from tranquilo_dev.benchmarks.history_log import LoggingCriterion
+from tranquilo_dev.benchmarks.history_log import read_history_log
+from tranquilo_dev.benchmarks.result_store import read_benchmark_results
+from tranquilo_dev.benchmarks.runner import get_history_log_path
+from tranquilo_dev.benchmarks.runner import run_single_problem
+
+
+def _sphere(x):
+    return x @ x
+
+
+def test_logging_criterion_appends_fixed_width_records(tmp_path):
+    path = tmp_path / "history.log"
+    criterion = LoggingCriterion(_sphere, path)
+
+    criterion(np.array([1.0, 2.0]))
+    # The unpickled copy appends to the same log, like a worker process would
+    pickle.loads(pickle.dumps(criterion))(np.array([3.0, 4.0]))
+
+    log = read_history_log(path, n_params=2)
+    np.testing.assert_array_equal(log["value"], [5.0, 25.0])
+    np.testing.assert_array_equal(log["params"], [[1.0, 2.0], [3.0, 4.0]])
+    assert np.all(log["t_end"] >= log["t_start"])
+
+
+@pytest.mark.parametrize("noisy", [False, True])
+def test_run_single_problem_assembles_result_from_log(tmp_path, noisy):
+    kwargs = {"additive_noise": True, "seed": 0} if noisy else {}
+    problems = em.get_benchmark_problems("more_wild", **kwargs)
+    name = "linear_full_rank_good_start"
+    optimize_options = {"nelder_mead": {"algorithm": "scipy_neldermead"}}
+
+    path = tmp_path / f"{name}.arrow"
+    run_single_problem(
+        name,
+        problems[name],
+        optimize_options=optimize_options,
+        path=path,
+        max_criterion_evaluations=50,
+    )
+    got = read_benchmark_results(path)[(name, "nelder_mead")]
+
+    # The noise is drawn from the same seed, so the optimizer takes the same path
+    problems = em.get_benchmark_problems("more_wild", **kwargs)
+    expected = em.run_benchmark(
+        {name: problems[name]}, optimize_options, max_criterion_evaluations=50
+    )[(name, "nelder_mead")]
+
+    assert get_history_log_path(path, "nelder_mead").exists()
+    for key in ["params_history", "criterion_history", "batches_history"]:
+        np.testing.assert_allclose(got[key], np.asarray(expected[key]))
+    assert got["time_history"][0] == 0
+    assert np.all(np.diff(got["time_history"]) >= 0)
+
+
+def _get_log(params):
+    params = np.array(params, dtype=float)
+    t_start = np.arange(len(params), dtype=float)
+    return {
+        "t_start": t_start,
+        "t_end": t_start + 0.5,
+        "value": np.array([_sphere(x) for x in params]),
+        "params": params,
+    }
+
+
+_PROBLEM = {"noisy": False, "solution": {"value": 0.0}}
+
+
+def test_assemble_benchmark_result_skips_start_evaluation_and_allows_batch_order():
+    # The start params are evaluated before the optimizer runs, and the evaluations
+    # of the second batch are logged in another order than in the history.
+    log = _get_log([[1, 1], [1, 1], [2, 0], [0, 2]])
+    history = {
+        "params": [np.array([1.0, 1]), np.array([0.0, 2]), np.array([2.0, 0])],
+        "batches": [0, 1, 1],
+    }
+
+    got = assemble_benchmark_result(log, problem=_PROBLEM, history=history)
+
+    np.testing.assert_array_equal(got["params_history"], log["params"][1:])
+    np.testing.assert_array_equal(got["time_history"], [0, 1, 2])
+
+
+def test_assemble_benchmark_result_raises_if_params_do_not_line_up():
+    # The extra evaluation is at the end of the log
+    log = _get_log([[1, 1], [2, 0], [0, 2]])
+    history = {"params": [np.array([1.0, 1]), np.array([2.0, 0])], "batches": [0, 1]}
+
+    with pytest.raises(ValueError, match="do not line up"):
+        assemble_benchmark_result(log, problem=_PROBLEM, history=history)
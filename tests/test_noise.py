@@ -0,0 +1,126 @@
+import copy
+import pickle
+
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.benchmark_problems import get_extended_benchmark_problems
+from tranquilo_dev.benchmarks.noise import CommonRandomNoiseCriterion
+from tranquilo_dev.benchmarks.noise import draw_standard_normal
+from tranquilo_dev.benchmarks.noise import get_problem_key
+from tranquilo_dev.benchmarks.noise import hash_params
+from tranquilo_dev.benchmarks.noise import splitmix64
+
+
+def _zero(x):
+    return np.zeros(3)
+
+
+def test_splitmix64_known_values():
+    # First outputs of the SplitMix64 generator with state 0
+    got = splitmix64(np.array([0, 0x9E3779B97F4A7C15], dtype=np.uint64))
+    assert got.tolist() == [0xE220A8397B1DCDAF, 0x6E789E6AA1B965F4]
+
+
+def test_hash_params_is_vectorized_and_ignores_sign_of_zero():
+    key = get_problem_key("problem", seed=0)
+    params = np.array([[0.0, 1.0], [-0.0, 1.0], [1.0, 0.0]])
+    batch = hash_params(params, key=key)
+    single = [hash_params(x, key=key)[0] for x in params]
+    assert batch.tolist() == single
+    assert batch[0] == batch[1] != batch[2]
+
+
+def test_standard_normal_draws_have_standard_moments():
+    hashes = hash_params(np.arange(20_000.0)[:, None], key=np.uint64(1))
+    draws = draw_standard_normal(hashes, np.zeros(len(hashes)), size=5)
+    assert draws.shape == (20_000, 5)
+    assert abs(draws.mean()) < 0.02
+    assert abs(draws.std() - 1) < 0.02
+    # Different replicates of the same evaluations are independent
+    other = draw_standard_normal(hashes, np.ones(len(hashes)), size=5)
+    assert abs(np.corrcoef(draws.ravel(), other.ravel())[0, 1]) < 0.02
+
+
+def test_common_random_noise_criterion():
+    criterion = CommonRandomNoiseCriterion(_zero, key=np.uint64(3), std=2.0)
+    x, y = np.ones(2), np.zeros(2)
+
+    first = criterion(x)["root_contributions"]
+    second = criterion(x)["root_contributions"]
+    assert not np.allclose(first, second)
+
+    # A copy, e.g. in another scenario, sees the same noise in the same order
+    other = pickle.loads(pickle.dumps(criterion))
+    np.testing.assert_array_equal(other(x)["root_contributions"], first)
+    np.testing.assert_array_equal(other(x)["root_contributions"], second)
+
+    batch = copy.deepcopy(criterion).evaluate_batch(np.array([x, y, x]))
+    np.testing.assert_array_equal(batch[0]["root_contributions"], first)
+    np.testing.assert_array_equal(batch[2]["root_contributions"], second)
+    assert batch[0]["value"] == pytest.approx(first @ first)
+
+
+def test_extended_problems_with_common_random_numbers():
+    benchmark_kwargs = {
+        "name": "more_wild",
+        "additive_noise": True,
+        "additive_noise_options": {"distribution": "normal", "std": 1.2},
+        "seed": 925408,
+    }
+    problems = get_extended_benchmark_problems(
+        benchmark_kwargs, common_random_numbers=True
+    )
+    noise_free = em.get_benchmark_problems("more_wild")
+
+    assert list(problems) == list(noise_free)
+    for name, problem in problems.items():
+        assert problem["noisy"]
+        params = problem["inputs"]["params"]
+        value = problem["inputs"]["criterion"](params)
+        expected = problem["noise_free_criterion"](params)
+        assert np.std(value["root_contributions"] - expected) > 0
+
+
+def test_common_random_numbers_only_for_normal_noise():
+    benchmark_kwargs = {
+        "name": "more_wild",
+        "additive_noise": True,
+        "additive_noise_options": {"distribution": "gumbel"},
+    }
+    with pytest.raises(ValueError, match="uncorrelated normal noise"):
+        get_extended_benchmark_problems(benchmark_kwargs, common_random_numbers=True)
+
+
+@pytest.mark.parametrize("common_random_numbers", [True, False])
+def test_replications_of_noisy_problems_have_independent_noise(common_random_numbers):
+    benchmark_kwargs = {
+        "name": "more_wild",
+        "additive_noise": True,
+        "additive_noise_options": {"distribution": "normal", "std": 1.2},
+        "seed": 925408,
+    }
+    problems = get_extended_benchmark_problems(
+        benchmark_kwargs,
+        common_random_numbers=common_random_numbers,
+        n_replications=3,
+    )
+    names = list(em.get_benchmark_problems("more_wild"))
+
+    assert len(problems) == 3 * len(names)
+    name = names[0]
+    params = problems[name]["inputs"]["params"]
+    values = [
+        problems[n]["inputs"]["criterion"](params)["root_contributions"]
+        for n in (name, f"{name}__rep_1", f"{name}__rep_2")
+    ]
+    assert not np.allclose(values[0], values[1])
+    assert not np.allclose(values[1], values[2])
+    np.testing.assert_array_equal(
+        problems[f"{name}__rep_2"]["inputs"]["params"], params
+    )
+
+
+def test_noise_free_problems_are_not_replicated():
+    problems = get_extended_benchmark_problems({"name": "example"}, n_replications=3)
+    assert list(problems) == list(em.get_benchmark_problems("example"))
@@ -0,0 +1,88 @@
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.overhead import COMPONENT_COLUMNS
+from tranquilo_dev.benchmarks.overhead import compute_overhead
+from tranquilo_dev.benchmarks.overhead import get_overhead_table
+from tranquilo_dev.benchmarks.overhead import OVERHEAD_COLUMNS
+from tranquilo_dev.benchmarks.overhead import summarize_overhead_tables
+from tranquilo_dev.benchmarks.result_store import read_benchmark_results
+from tranquilo_dev.benchmarks.runner import run_single_problem
+
+
+def test_compute_overhead_serial_evaluations():
+    log = {"t_start": np.array([0.0, 2.0, 5.0]), "t_end": np.array([1.0, 3.0, 6.0])}
+    got = compute_overhead(log)
+    assert got["wall_time"] == 6
+    assert got["criterion_time"] == 3
+    assert got["overhead_time"] == 3
+    assert got["overhead_share"] == 0.5
+    assert got["overhead_per_evaluation"] == 1
+
+
+def test_compute_overhead_counts_parallel_evaluations_once():
+    # A batch of three evaluations that overlap between 0 and 2, then one evaluation
+    log = {
+        "t_start": np.array([0.0, 0.5, 1.0, 3.0]),
+        "t_end": np.array([1.5, 1.0, 2.0, 4.0]),
+    }
+    got = compute_overhead(log)
+    assert got["criterion_time"] == pytest.approx(3)
+    assert got["overhead_time"] == pytest.approx(1)
+
+
+def test_compute_overhead_splits_overhead_into_components():
+    log = {"t_start": np.array([0.0, 2.0, 5.0]), "t_end": np.array([1.0, 3.0, 6.0])}
+    components = {
+        "sampling": {"t_start": np.array([1.0]), "t_end": np.array([1.5])},
+        "model_fit": {"t_start": np.array([1.5]), "t_end": np.array([2.0])},
+        # The last call is after the last evaluation and is not counted
+        "subsolver": {"t_start": np.array([3.0, 6.0]), "t_end": np.array([4.0, 7.0])},
+    }
+    got = compute_overhead(log, components=components)
+    assert got["sampling_time"] == 0.5
+    assert got["model_fit_time"] == 0.5
+    assert got["subsolver_time"] == 1
+    assert got["other_overhead_time"] == 1
+
+
+def test_compute_overhead_empty_log():
+    got = compute_overhead({"t_start": np.array([]), "t_end": np.array([])})
+    assert got["n_evaluations"] == 0
+    assert got["overhead_time"] == 0
+    assert np.isnan(got["overhead_share"])
+
+
+def test_overhead_table_from_history_logs(tmp_path):
+    problems = em.get_benchmark_problems("example")
+    problems = {name: problems[name] for name in list(problems)[:2]}
+
+    paths = {}
+    for name, problem in problems.items():
+        paths[name] = tmp_path / f"{name}.arrow"
+        run_single_problem(
+            name,
+            problem,
+            optimize_options={"nelder_mead": {"algorithm": "scipy_neldermead"}},
+            path=paths[name],
+            max_criterion_evaluations=20,
+        )
+
+    table = get_overhead_table(paths, problems=problems, name="nelder_mead")
+    assert list(table.columns) == OVERHEAD_COLUMNS
+    assert list(table.index) == list(problems)
+    assert (table["overhead_time"] >= 0).all()
+    # The evaluation at the start params before the optimizer runs is not counted
+    for name, path in paths.items():
+        result = read_benchmark_results(path)[(name, "nelder_mead")]
+        assert table.loc[name, "n_evaluations"] == len(result["criterion_history"])
+    # Only the components of tranquilo are timed
+    assert table[COMPONENT_COLUMNS].isna().all().all()
+    np.testing.assert_allclose(
+        table["wall_time"], table["criterion_time"] + table["overhead_time"]
+    )
+
+    summary = summarize_overhead_tables({"a": table, "b": table})
+    assert list(summary.index) == ["a", "b"]
+    assert summary.loc["a", "n_evaluations"] == table["n_evaluations"].sum()
+    assert 0 <= summary.loc["a", "overhead_share"] <= 1
@@ -0,0 +1,34 @@
+import pickle
+from copy import deepcopy
+
+import pytest
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set
+from tranquilo_dev.benchmarks.problem_registry import get_problem_set_fingerprint
+from tranquilo_dev.config import PROBLEM_SETS
+
+
+def test_problem_set_is_built_once():
+    assert get_problem_set("mw") is get_problem_set("mw")
+
+
+def test_problem_set_is_read_only():
+    problems = get_problem_set("mw")
+    with pytest.raises(TypeError):
+        problems["new_problem"] = {}
+
+
+def test_copies_of_problem_set_do_not_copy_problems():
+    problems = get_problem_set("mw")
+    assert deepcopy(problems) is problems
+    assert pickle.loads(pickle.dumps(problems)) is problems
+
+
+def test_fingerprint_changes_with_noise_of_problem_set(monkeypatch):
+    # Bypass the cache, such that the changed problem set is not cached
+    get_fingerprint = get_problem_set_fingerprint.__wrapped__
+    before = get_fingerprint("mw_noisy")
+    noise_options = {"distribution": "normal", "std": 0.5}
+    monkeypatch.setitem(
+        PROBLEM_SETS["mw_noisy"], "additive_noise_options", noise_options
+    )
+    assert get_fingerprint("mw_noisy") != before
@@ -0,0 +1,157 @@
+import pickle
+
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.progress import format_summary
+from tranquilo_dev.benchmarks.progress import ProgressLog
+from tranquilo_dev.benchmarks.progress import read_progress
+from tranquilo_dev.benchmarks.progress import summarize_progress
+from tranquilo_dev.benchmarks.runner import run_benchmark_with_checkpoints
+from tranquilo_dev.benchmarks.runner import run_single_problem
+
+
+def test_progress_log_is_picklable_and_appends_events(tmp_path):
+    path = tmp_path / "progress.jsonl"
+    progress = ProgressLog(path, case="case")
+    progress.emit("plan", n_problems=2, n_completed=0, n_workers=1)
+    pickle.loads(pickle.dumps(progress)).emit("finish", problem="a", n_evals=3)
+
+    # A partially written line of a running worker is ignored
+    with open(path, "a") as f:
+        f.write('{"event": "sta')
+
+    events = read_progress(path)
+    assert [event["event"] for event in events] == ["plan", "finish"]
+    assert events[1]["case"] == "case"
+
+
+def test_read_progress_missing_file(tmp_path):
+    assert read_progress(tmp_path / "progress.jsonl") == []
+
+
+def test_summarize_progress(tmp_path):
+    # A running problem with two parameters has logged four evaluations
+    log = tmp_path / "running.log"
+    np.zeros((4, 5)).tofile(log)
+
+    events = [
+        {
+            "event": "plan",
+            "case": "a",
+            "time": 0,
+            "pid": 1,
+            "n_problems": 4,
+            "n_completed": 1,
+            "n_workers": 2,
+        },
+        {
+            "event": "start",
+            "case": "a",
+            "time": 0,
+            "pid": 1,
+            "problem": "p1",
+            "logs": [],
+            "n_params": 2,
+        },
+        {
+            "event": "start",
+            "case": "a",
+            "time": 0,
+            "pid": 2,
+            "problem": "p2",
+            "logs": [str(log)],
+            "n_params": 2,
+        },
+        {
+            "event": "finish",
+            "case": "a",
+            "time": 10,
+            "pid": 1,
+            "problem": "p1",
+            "n_evals": 16,
+        },
+    ]
+    summary = summarize_progress(events, now=20)
+
+    assert summary["cases"]["a"] == {
+        "n_problems": 4,
+        "n_completed": 2,
+        "n_failed": 0,
+        "n_running": 1,
+        "n_workers": 2,
+    }
+    assert summary["n_evals"] == 20
+    assert summary["evals_per_second"] == 1
+    assert summary["utilization"] == {1: 0.5, 2: 1}
+    assert summary["workers"][2]["problem"] == "p2"
+    # Two remaining problems with an average duration of 10 seconds on two workers
+    assert summary["eta"] == 10
+    assert "a" in format_summary(summary)
+
+
+def test_run_benchmark_with_checkpoints_emits_progress(tmp_path):
+    problems = em.get_benchmark_problems("example")
+    problems = {name: problems[name] for name in list(problems)[:2]}
+    path = tmp_path / "progress.jsonl"
+
+    run_benchmark_with_checkpoints(
+        problems=problems,
+        optimize_options={"nelder_mead": {"algorithm": "scipy_neldermead"}},
+        checkpoint_dir=tmp_path / "checkpoints",
+        progress=ProgressLog(path, case="example"),
+        max_criterion_evaluations=20,
+    )
+
+    summary = summarize_progress(read_progress(path))
+    assert summary["cases"]["example"]["n_completed"] == 2
+    assert summary["n_running"] == 0
+    assert summary["n_evals"] > 0
+    assert summary["eta"] == 0
+
+
+def test_summarize_progress_only_uses_last_run_of_case():
+    def _event(event, time, **fields):
+        return {"event": event, "case": "a", "time": time, "pid": 1, **fields}
+
+    plan = {"n_problems": 2, "n_completed": 0, "n_workers": 1}
+    start = {"problem": "p1", "logs": [], "n_params": 2}
+    events = [
+        # An earlier run that crashed while p1 was running
+        _event("plan", 0, **plan),
+        _event("start", 0, **start),
+        # A new run in which p1 fails
+        _event("plan", 10, **plan),
+        _event("start", 10, **start),
+        _event("error", 12, problem="p1", error="RuntimeError()"),
+    ]
+    summary = summarize_progress(events, now=20)
+
+    assert summary["n_running"] == 0
+    assert summary["cases"]["a"]["n_failed"] == 1
+    # The worker was busy with p1 for two of the ten seconds of the last run
+    assert summary["utilization"] == {1: 0.2}
+
+
+def test_run_single_problem_emits_error(tmp_path, monkeypatch):
+    problems = em.get_benchmark_problems("example")
+    problem_name = list(problems)[0]
+    path = tmp_path / "progress.jsonl"
+
+    def _raise(*args, **kwargs):  # noqa: U100
+        raise RuntimeError("The optimization crashed.")
+
+    monkeypatch.setattr(em, "minimize", _raise)
+    with pytest.raises(RuntimeError):
+        run_single_problem(
+            problem_name=problem_name,
+            problem=problems[problem_name],
+            optimize_options={"nelder_mead": {"algorithm": "scipy_neldermead"}},
+            path=tmp_path / "result.arrow",
+            progress=ProgressLog(path, case="example"),
+            error_handling="raise",
+        )
+
+    events = read_progress(path)
+    assert [event["event"] for event in events] == ["start", "error"]
+    assert summarize_progress(events)["n_running"] == 0
@@ -0,0 +1,65 @@
+import os
+
+from tranquilo_dev.plotting.publishing import publish_files
+
+
+def test_publish_files(tmp_path):
+    sources = [tmp_path / "bld" / f"plot_{k}.svg" for k in range(3)]
+    destinations = [tmp_path / "public" / "plots" / f"plot_{k}.svg" for k in range(3)]
+    for k, source in enumerate(sources):
+        source.parent.mkdir(parents=True, exist_ok=True)
+        source.write_text(f"<svg>{k}</svg>")
+
+    first = publish_files(sources, destinations)
+    assert first.n_files == 3
+    assert first.n_unchanged == 0
+    assert first.n_reflinked + first.n_copied == 3
+    for source, destination in zip(sources, destinations):
+        assert destination.read_text() == source.read_text()
+
+    second = publish_files(sources, destinations)
+    assert second.n_unchanged == 3
+    assert second.bytes_saved == 0
+
+
+def test_published_files_do_not_change_with_source(tmp_path):
+    source = tmp_path / "plot.svg"
+    destination = tmp_path / "public" / "plot.svg"
+    destination.parent.mkdir()
+    source.write_text("<svg>old</svg>")
+    # A hard link from an earlier publishing run is replaced by an independent file
+    os.link(source, destination)
+
+    report = publish_files([source], [destination])
+    assert report.n_unchanged == 0
+
+    # Rewriting the source in place, like savefig does, leaves the published file as is
+    with open(source, "w") as f:
+        f.write("<svg>new</svg>")
+    assert destination.read_text() == "<svg>old</svg>"
+
+
+def test_publish_files_replaces_changed_files(tmp_path):
+    source = tmp_path / "plot.svg"
+    destination = tmp_path / "public" / "plot.svg"
+    destination.parent.mkdir()
+    source.write_text("<svg>new</svg>")
+    destination.write_text("<svg>old</svg>")
+
+    report = publish_files([source], [destination])
+
+    assert report.n_unchanged == 0
+    assert destination.read_text() == "<svg>new</svg>"
+
+
+def test_unchanged_copies_do_not_save_bytes(tmp_path):
+    source = tmp_path / "plot.svg"
+    destination = tmp_path / "public" / "plot.svg"
+    destination.parent.mkdir()
+    source.write_text("<svg>plot</svg>")
+    destination.write_text("<svg>plot</svg>")
+
+    report = publish_files([source], [destination])
+
+    assert report.n_unchanged == 1
+    assert report.bytes_saved == 0
@@ -0,0 +1,6 @@
+from tranquilo_dev.benchmarks.replications import get_replication
+
+
+def test_get_replication():
+    assert get_replication("linear_full_rank_good_start") == 0
+    assert get_replication("rosenbrock__draw_1__rep_3") == 3
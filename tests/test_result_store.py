@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from pyarrow import feather
+from tranquilo_dev.benchmarks.result_store import LazyBenchmarkResults
+from tranquilo_dev.benchmarks.result_store import read_benchmark_results
+from tranquilo_dev.benchmarks.result_store import rename_algorithms
+from tranquilo_dev.benchmarks.result_store import SCHEMA
+from tranquilo_dev.benchmarks.result_store import write_benchmark_results
+
+
+@pytest.fixture()
+def results():
+    return {
+        ("problem_a", "algo_1"): {
+            "params_history": [np.array([1.0, 2.0]), np.array([0.5, 1.0])],
+            "criterion_history": np.array([5.0, 1.25]),
+            "time_history": [0.0, 0.1],
+            "batches_history": [0, 1],
+            "solution": None,
+        },
+        ("problem_b", "algo_1"): {
+            "params_history": [np.array([3.0]), np.array([2.0]), np.array([1.0])],
+            "criterion_history": np.array([9.0, 4.0, 1.0]),
+            "time_history": [0.0, 0.1, 0.3],
+            "batches_history": [0, 1, 1],
+            "solution": None,
+        },
+    }
+
+
+def test_read_and_write_benchmark_results(results, tmp_path):
+    write_benchmark_results(results, tmp_path / "results.arrow")
+    got = read_benchmark_results(tmp_path / "results.arrow")
+
+    assert list(got) == list(results)
+    for key, result in results.items():
+        np.testing.assert_array_equal(
+            got[key]["params_history"], np.array(result["params_history"])
+        )
+        np.testing.assert_array_equal(
+            got[key]["criterion_history"], result["criterion_history"]
+        )
+        np.testing.assert_array_equal(got[key]["time_history"], result["time_history"])
+        np.testing.assert_array_equal(
+            got[key]["batches_history"], result["batches_history"]
+        )
+
+
+def test_read_subset_of_columns(results, tmp_path):
+    write_benchmark_results(results, tmp_path / "results.arrow")
+    got = read_benchmark_results(tmp_path / "results.arrow", columns=["criterion"])
+    assert all(list(result) == ["criterion_history"] for result in got.values())
+
+
+def test_lazy_benchmark_results(results, tmp_path):
+    paths = []
+    for k, (key, result) in enumerate(results.items()):
+        paths.append(tmp_path / f"results_{k}.arrow")
+        write_benchmark_results({key: result}, paths[-1])
+
+    got = LazyBenchmarkResults(paths)
+
+    assert list(got) == list(results)
+    for key, result in results.items():
+        np.testing.assert_array_equal(
+            got[key]["criterion_history"], result["criterion_history"]
+        )
+
+
+def test_rename_algorithms(results, tmp_path):
+    write_benchmark_results(results, tmp_path / "results.arrow")
+    rename_algorithms(
+        tmp_path / "results.arrow", tmp_path / "renamed.arrow", {"algo_1": "algo_2"}
+    )
+    got = read_benchmark_results(tmp_path / "renamed.arrow")
+
+    assert list(got) == [("problem_a", "algo_2"), ("problem_b", "algo_2")]
+    for (problem, _), result in got.items():
+        np.testing.assert_array_equal(
+            result["criterion_history"],
+            results[(problem, "algo_1")]["criterion_history"],
+        )
+
+
+def test_write_empty_benchmark_results(tmp_path):
+    write_benchmark_results({}, tmp_path / "results.arrow")
+
+    table = feather.read_table(tmp_path / "results.arrow")
+    assert table.num_rows == 0
+    assert table.schema.remove_metadata() == SCHEMA
+    assert read_benchmark_results(tmp_path / "results.arrow") == {}
+
+
+def test_history_without_evaluations_keeps_n_params(results, tmp_path):
+    results[("problem_c", "algo_1")] = {
+        "params_history": np.empty((0, 3)),
+        "criterion_history": np.array([]),
+        "time_history": [],
+        "batches_history": [],
+    }
+    write_benchmark_results(results, tmp_path / "results.arrow")
+    got = read_benchmark_results(tmp_path / "results.arrow")
+
+    assert got[("problem_c", "algo_1")]["params_history"].shape == (0, 3)
+    assert got[("problem_b", "algo_1")]["params_history"].shape == (3, 1)
@@ -0,0 +1,77 @@
+import estimagic as em
+import numpy as np
+from tranquilo_dev.benchmarks.result_store import read_benchmark_results
+from tranquilo_dev.benchmarks.runner import get_checkpoint_paths
+from tranquilo_dev.benchmarks.runner import get_cores_per_optimization
+from tranquilo_dev.benchmarks.runner import run_benchmark_with_checkpoints
+from tranquilo_dev.benchmarks.runner import run_single_problem
+
+
+def test_run_benchmark_with_checkpoints_resumes(tmp_path, monkeypatch):
+    problems = em.get_benchmark_problems("more_wild")
+    problems = {name: problems[name] for name in list(problems)[:2]}
+
+    kwargs = {
+        "optimize_options": {"nelder_mead": {"algorithm": "scipy_neldermead"}},
+        "checkpoint_dir": tmp_path,
+        "max_criterion_evaluations": 20,
+    }
+
+    first = run_benchmark_with_checkpoints(problems=problems, **kwargs)
+
+    def _raise(*args, **kwargs):  # noqa: U100
+        raise AssertionError("Problems are run again despite existing checkpoints.")
+
+    monkeypatch.setattr(em, "minimize", _raise)
+    second = run_benchmark_with_checkpoints(problems=problems, **kwargs)
+
+    assert list(first) == list(second)
+    for key in first:
+        np.testing.assert_array_equal(
+            first[key]["criterion_history"], second[key]["criterion_history"]
+        )
+
+
+def test_get_cores_per_optimization():
+    optimize_options = {
+        "nelder_mead": "scipy_neldermead",
+        "tranquilo_parallel": {"algo_options": {"batch_size": 8, "n_cores": 8}},
+    }
+    assert get_cores_per_optimization(optimize_options) == 8
+
+
+def test_checkpoint_paths_depend_on_problems_fingerprint(tmp_path):
+    kwargs = {
+        "problems": {"rosenbrock": {}},
+        "optimize_options": {"nelder_mead": {"algorithm": "scipy_neldermead"}},
+        "checkpoint_dir": tmp_path,
+        "benchmark_kwargs": {"max_criterion_evaluations": 20},
+    }
+    first = get_checkpoint_paths(**kwargs, problems_fingerprint="a")
+    second = get_checkpoint_paths(**kwargs, problems_fingerprint="b")
+    assert first["rosenbrock"] != second["rosenbrock"]
+
+
+def test_run_single_problem_replaces_failed_optimization_by_start_values(
+    tmp_path, monkeypatch
+):
+    problems = em.get_benchmark_problems("example")
+    name = list(problems)[0]
+
+    def _raise(*args, **kwargs):  # noqa: U100
+        raise RuntimeError("The optimization crashed.")
+
+    monkeypatch.setattr(em, "minimize", _raise)
+    path = tmp_path / "result.arrow"
+    run_single_problem(
+        name,
+        problems[name],
+        optimize_options={"nelder_mead": {"algorithm": "scipy_neldermead"}},
+        path=path,
+    )
+
+    got = read_benchmark_results(path)[(name, "nelder_mead")]
+    np.testing.assert_array_equal(
+        got["params_history"], [problems[name]["inputs"]["params"]]
+    )
+    assert got["time_history"][0] == np.inf
@@ -0,0 +1,36 @@
+import pytest
+from tranquilo_dev.benchmarks.scenarios import get_benchmark_kwargs
+from tranquilo_dev.config import TRANQUILO_BATCH_SIZES
+from tranquilo_dev.config import TRANQUILO_VARIANTS
+
+
+def _get_algo_options(problem_name, scenario_name):
+    kwargs = get_benchmark_kwargs(problem_name, scenario_name)
+    return kwargs["optimize_options"][scenario_name]["algo_options"]
+
+
+@pytest.mark.parametrize("variant", list(TRANQUILO_VARIANTS))
+def test_all_variants_have_benchmark_kwargs(variant):
+    for algorithm in ["tranquilo", "tranquilo_ls"]:
+        scenario_name = f"{algorithm}_{variant}"
+        kwargs = get_benchmark_kwargs("mw", scenario_name)
+        optimize_options = kwargs["optimize_options"][scenario_name]
+        assert optimize_options["algorithm"] == algorithm
+        assert (
+            TRANQUILO_VARIANTS[variant].items()
+            <= optimize_options["algo_options"].items()
+        )
+
+
+def test_parallel_variants_ignore_noise():
+    assert _get_algo_options("mw_noisy", "tranquilo_ls_default")["noisy"]
+    for batch_size in TRANQUILO_BATCH_SIZES:
+        scenario_name = f"tranquilo_ls_parallel_{batch_size}"
+        algo_options = _get_algo_options("mw_noisy", scenario_name)
+        assert "noisy" not in algo_options
+        assert algo_options == _get_algo_options("mw", scenario_name)
+
+
+def test_unknown_variant():
+    with pytest.raises(ValueError):
+        get_benchmark_kwargs("mw", "tranquilo_ls_parallel_3")
@@ -0,0 +1,57 @@
+import json
+
+import estimagic as em
+import pytest
+from tranquilo_dev.benchmarks import scheduler
+from tranquilo_dev.benchmarks.result_store import read_benchmark_results
+from tranquilo_dev.config import ProjectOptions
+
+
+def test_run_benchmark_cases(tmp_path, monkeypatch):
+    problems = em.get_benchmark_problems("more_wild")
+    problems = {name: problems[name] for name in list(problems)[:3]}
+    monkeypatch.setattr(scheduler, "get_problem_set", lambda problem_name: problems)
+    monkeypatch.setattr(scheduler, "OPTIONS", ProjectOptions(N_CORES=2))
+
+    cases = [("mw", "scipy_neldermead"), ("cr", "scipy_neldermead")]
+    paths = {f"{p}_{s}": tmp_path / f"{p}_{s}.arrow" for p, s in cases}
+
+    scheduler.run_benchmark_cases(
+        cases=cases,
+        paths=paths,
+        checkpoint_dir=tmp_path / "checkpoints",
+        runtimes_path=tmp_path / "runtimes.json",
+    )
+
+    results = read_benchmark_results(paths["mw_scipy_neldermead"])
+    assert set(results) == {(name, "scipy_neldermead") for name in problems}
+
+    runtimes = json.loads((tmp_path / "runtimes.json").read_text())
+    assert len(runtimes) == len(cases) * len(problems)
+
+
+def test_run_benchmark_cases_cancels_queued_jobs_after_failure(tmp_path, monkeypatch):
+    problems = em.get_benchmark_problems("more_wild")
+    problems = {name: problems[name] for name in list(problems)[:6]}
+    failing = list(problems)[0]
+    monkeypatch.setattr(scheduler, "get_problem_set", lambda problem_name: problems)
+    monkeypatch.setattr(scheduler, "OPTIONS", ProjectOptions(N_CORES=1))
+
+    def _run_single_problem(problem_name, **kwargs):  # noqa: U100
+        if problem_name == failing:
+            raise RuntimeError("The problem failed.")
+
+    monkeypatch.setattr(scheduler, "run_single_problem", _run_single_problem)
+
+    with pytest.raises(RuntimeError, match="The problem failed."):
+        scheduler.run_benchmark_cases(
+            cases=[("mw", "scipy_neldermead")],
+            paths={"mw_scipy_neldermead": tmp_path / "mw_scipy_neldermead.arrow"},
+            checkpoint_dir=tmp_path / "checkpoints",
+            runtimes_path=tmp_path / "runtimes.json",
+        )
+
+    # The jobs that ran are recorded, and the queued jobs were not started
+    runtimes = json.loads((tmp_path / "runtimes.json").read_text())
+    assert f"mw_scipy_neldermead/{failing}" not in runtimes
+    assert len(runtimes) < len(problems) - 1
@@ -0,0 +1,79 @@
+import estimagic as em
+import numpy as np
+import pytest
+from tranquilo_dev.benchmarks.analytics import get_convergence_curves
+from tranquilo_dev.benchmarks.analytics import get_convergence_curves_from_histories
+from tranquilo_dev.benchmarks.analytics import get_deviation_curves
+from tranquilo_dev.benchmarks.analytics import get_deviation_curves_from_histories
+from tranquilo_dev.benchmarks.analytics import get_profile_curves
+from tranquilo_dev.benchmarks.analytics import get_profile_curves_from_histories
+from tranquilo_dev.benchmarks.trajectory_store import compute_trajectories
+from tranquilo_dev.benchmarks.trajectory_store import read_trajectories
+from tranquilo_dev.benchmarks.trajectory_store import split_plot_kwargs
+from tranquilo_dev.benchmarks.trajectory_store import write_trajectories
+
+
+@pytest.fixture(scope="module")
+def benchmark():
+    problems = em.get_benchmark_problems("more_wild")
+    problems = {name: problems[name] for name in list(problems)[:4]}
+    results = em.run_benchmark(
+        problems,
+        optimize_options={
+            "nelder_mead": {"algorithm": "scipy_neldermead"},
+            "powell": {"algorithm": "scipy_powell"},
+        },
+        max_criterion_evaluations=100,
+    )
+    return problems, results
+
+
+CASES = [
+    (
+        "profile_plot",
+        get_profile_curves,
+        get_profile_curves_from_histories,
+        {"y_precision": 1e-3, "normalize_runtime": True},
+    ),
+    (
+        "deviation_plot",
+        get_deviation_curves,
+        get_deviation_curves_from_histories,
+        {"runtime_measure": "n_batches"},
+    ),
+    (
+        "convergence_plot",
+        get_convergence_curves,
+        get_convergence_curves_from_histories,
+        {},
+    ),
+]
+
+
+@pytest.mark.parametrize("plot_type, curve_func, from_histories, kwargs", CASES)
+def test_curves_from_stored_trajectories(
+    benchmark, tmp_path, plot_type, curve_func, from_histories, kwargs
+):
+    problems, results = benchmark
+    y_tol, runtime_measure, curve_kwargs = split_plot_kwargs(plot_type, kwargs)
+
+    # One file per algorithm, as for the scenarios of the benchmarks
+    paths = []
+    for algo in ["nelder_mead", "powell"]:
+        trajectories = compute_trajectories(
+            problems,
+            {key: value for key, value in results.items() if key[1] == algo},
+            y_tol=y_tol,
+            runtime_measure=runtime_measure,
+        )
+        paths.append(tmp_path / f"{algo}.npz")
+        write_trajectories(trajectories, paths[-1], runtime_measure=runtime_measure)
+
+    trajectories = read_trajectories(paths, runtime_measure=runtime_measure)
+    got = from_histories(trajectories, **curve_kwargs)
+    expected = curve_func(problems=problems, results=results, **kwargs)
+
+    assert list(got) == list(expected)
+    for name, line in got.items():
+        np.testing.assert_allclose(line["x"], expected[name]["x"])
+        np.testing.assert_allclose(line["y"], expected[name]["y"])